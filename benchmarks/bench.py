@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting benchmarks
+        Times the corpus loading, result conversion, result serialisation and
+        site rendering against synthetic corpora at multiples of the real
+        corpus size, reporting throughput and peak memory.
+
+        python benchmarks/bench.py --scales 10,100,1000 --json bench.json
+        python benchmarks/bench.py --scales 10 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+import synthetic
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+# Number of items sampled for the per item benchmarks
+SAMPLE: int = 2000
+TRACE_MEMORY: bool = True
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    # The tools resolve the corpus, results, templates and site relative to the working directory
+    previous: str = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _measure(name: str, scale: float, items: int, func: Callable[[], object]) -> Dict:
+    # tracemalloc slows allocation heavy code, so times are comparable only between traced runs
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    start: float = time.perf_counter()
+    start_cpu: float = time.process_time()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+        func()
+    wall: float = time.perf_counter() - start
+    cpu: float = time.process_time() - start_cpu
+    peak: int = 0
+    if TRACE_MEMORY:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        'benchmark': name,
+        'scale': scale,
+        'items': items,
+        'wall': wall,
+        'cpu': cpu,
+        'items_per_second': items / wall if wall else 0.0,
+        'us_per_item': wall / items * 1_000_000 if items else 0.0,
+        'peak_mib': peak / 1024 / 1024,
+    }
+
+def run_scale(scale: float, seed: int, keep: bool) -> List[Dict]:
+    """Generate a corpus at a scale and run every benchmark against it."""
+    from eark_validator.specifications.specification import EarkSpecification, SpecificationType, SpecificationVersion
+    from eark_corpora import loader
+    from eark_corpora.cli import app
+    from eark_corpora.model.corpora import Corpus, CorpusTestCase, CorpusTestResult
+    from eark_corpora.model.runners import ProcessResult, RunnerDetails
+
+    root: Path = Path(tempfile.mkdtemp(prefix=f'eark-bench-{scale}-'))
+    rows: List[Dict] = []
+    try:
+        start: float = time.perf_counter()
+        totals: Dict[str, int] = synthetic.generate(root, scale, seed)
+        print(f"Generated {totals} at {scale}x in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        (root / 'templates').symlink_to(REPO_ROOT / 'templates')
+        specifications = { spec_type: EarkSpecification(spec_type, SpecificationVersion.V2_1_0).specification
+                           for spec_type in SpecificationType }
+        with _working_directory(root):
+            corpora: Dict = {}
+            def load_corpora():
+                for spec_type, specification in specifications.items():
+                    corpora[spec_type] = Corpus.from_directory(specification, loader.corpus_root / specification.id)
+            rows.append(_measure('Corpus.from_directory', scale, totals['test_cases'], load_corpora))
+
+            case_paths: List[Path] = sorted(loader.corpus_root.glob('*/*'))[:SAMPLE]
+            rows.append(_measure('CorpusTestCase.from_test_case', scale, len(case_paths),
+                                 lambda: [CorpusTestCase.from_test_case(path) for path in case_paths]))
+
+            result_paths: List[Path] = _sample(sorted(loader.results_root.rglob('*.json')), seed)
+            loaded: List[ProcessResult] = []
+            rows.append(_measure('ProcessResult.from_file', scale, len(result_paths),
+                                 lambda: loaded.extend(ProcessResult.from_file(path) for path in result_paths)))
+            rows.append(_measure('CorpusTestResult.from_process_result', scale, len(loaded),
+                                 lambda: [CorpusTestResult.from_process_result(result, 'CSIP1') for result in loaded]))
+            # The tester serialises results whose stdout is the validator's raw JSON text
+            raw: List[ProcessResult] = [
+                ProcessResult(RunnerDetails(**data['runner_details']), data['retcode'], json.dumps(data['stdout']),
+                              data['stderr'], data['duration'])
+                for data in (synthetic.process_result(f"CSIP{index}", index % 2 == 0, synthetic.RUNNERS[index % 2],
+                                                      random.Random(index))
+                             for index in range(len(result_paths)))]
+            rows.append(_measure('ProcessResult.toJson', scale, len(raw), lambda: [result.toJson() for result in raw]))
+
+            loader.get_corpora.cache_clear()
+            rows.append(_measure('site rendering', scale, totals['packages'],
+                                 lambda: (app.setup_reports(), app._iterate_corpora(loader.get_corpora()))))
+    finally:
+        if keep:
+            print(f"Kept synthetic corpus at {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return rows
+
+def _sample(paths: List[Path], seed: int) -> List[Path]:
+    return paths if len(paths) <= SAMPLE else random.Random(seed).sample(paths, SAMPLE)
+
+def _check(rows: List[Dict], baseline_path: Path, tolerance: float) -> List[str]:
+    """Compare per item times against a baseline run, returning the regressions."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline: Dict = { (row['benchmark'], row['scale']): row for row in json.load(f) }
+    regressions: List[str] = []
+    for row in rows:
+        previous: Dict = baseline.get((row['benchmark'], row['scale']))
+        if previous and row['us_per_item'] > previous['us_per_item'] * tolerance:
+            regressions.append(f"{row['benchmark']} at {row['scale']}x: {row['us_per_item']:.1f}us/item "
+                               f"against {previous['us_per_item']:.1f}us/item")
+    return regressions
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(prog='bench', description='Benchmark corpus loading, results and rendering.')
+    parser.add_argument('--scales', default='10',
+                        help='Comma separated multiples of the real corpus size, e.g. 10,100,1000.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic corpus.')
+    parser.add_argument('--json', type=Path, dest='json_path', default=None, help='Write the results as JSON.')
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Fail if any per item time is slower than this earlier --json output.')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Allowed slow down factor against the baseline.')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated corpora.')
+    parser.add_argument('--no-memory', action='store_false', dest='memory',
+                        help='Skip tracing peak memory, for untraced timings.')
+    args = parser.parse_args()
+    global TRACE_MEMORY
+    TRACE_MEMORY = args.memory
+
+    rows: List[Dict] = []
+    for scale in [float(scale) for scale in args.scales.split(',')]:
+        rows.extend(run_scale(scale, args.seed, args.keep))
+    print(f"{'Benchmark':<40} {'Scale':>7} {'Items':>9} {'Wall (s)':>9} {'Items/s':>10} {'us/item':>9} {'Peak MiB':>9}")
+    for row in rows:
+        print(f"{row['benchmark']:<40} {row['scale']:>7g} {row['items']:>9} {row['wall']:>9.2f} "
+              f"{row['items_per_second']:>10.1f} {row['us_per_item']:>9.1f} {row['peak_mib']:>9.1f}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    if args.baseline:
+        regressions: List[str] = _check(rows, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
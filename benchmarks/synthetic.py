@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Synthetic corpus generator
+        Writes E-ARK style test case trees and result files at a multiple of
+        the real corpus size, laid out as the tools expect to find them.
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Approximate size of the real corpus, test cases per specification
+BASE_CASES: Dict[str, int] = { 'CSIP': 120, 'SIP': 40, 'DIP': 10 }
+RULES_PER_CASE: int = 2
+PACKAGES_PER_RULE: int = 2
+# (runner id, name, version, commons-ip style output)
+RUNNERS: List[Tuple[str, str, str, bool]] = [
+    ('eark-validator', 'E-ARK Python Validator', '1.1.3', False),
+    ('commons-ip', 'Commons IP Validator', '2.10.0', True),
+]
+
+TEST_CASE_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified">
+  <xs:simpleType name="boolString">
+    <xs:restriction base="xs:string">
+      <xs:enumeration value="TRUE"/>
+      <xs:enumeration value="FALSE"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:complexType name="refType">
+    <xs:simpleContent>
+      <xs:extension base="xs:string">
+        <xs:attribute name="requirementId" type="xs:string" use="required"/>
+        <xs:attribute name="URL" type="xs:anyURI" use="required"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:element name="testCase">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="id">
+          <xs:complexType>
+            <xs:attribute name="requirementId" type="xs:string" use="required"/>
+            <xs:attribute name="specification" type="xs:string" use="required"/>
+            <xs:attribute name="version" type="xs:string" use="required"/>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="references">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="reference" type="refType" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="requirementText">
+          <xs:complexType mixed="true">
+            <xs:sequence>
+              <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="description" type="xs:string"/>
+        <xs:element name="dependencies">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="dependency" type="refType" minOccurs="0" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="rules" minOccurs="0">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="rule" minOccurs="0" maxOccurs="unbounded">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="description" type="xs:string"/>
+                    <xs:element name="error">
+                      <xs:complexType>
+                        <xs:sequence>
+                          <xs:element name="message" type="xs:string"/>
+                        </xs:sequence>
+                        <xs:attribute name="level" use="required">
+                          <xs:simpleType>
+                            <xs:restriction base="xs:string">
+                              <xs:enumeration value="ERROR"/>
+                              <xs:enumeration value="WARNING"/>
+                              <xs:enumeration value="INFO"/>
+                            </xs:restriction>
+                          </xs:simpleType>
+                        </xs:attribute>
+                      </xs:complexType>
+                    </xs:element>
+                    <xs:element name="corpusPackages">
+                      <xs:complexType>
+                        <xs:sequence>
+                          <xs:element name="package" maxOccurs="unbounded">
+                            <xs:complexType>
+                              <xs:sequence>
+                                <xs:element name="path" type="xs:string"/>
+                                <xs:element name="description" type="xs:string"/>
+                              </xs:sequence>
+                              <xs:attribute name="name" type="xs:string" use="required"/>
+                              <xs:attribute name="isValid" type="boolString" use="required"/>
+                              <xs:attribute name="isImplemented" type="boolString"/>
+                            </xs:complexType>
+                          </xs:element>
+                        </xs:sequence>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                  <xs:attribute name="id" type="xs:positiveInteger" use="required"/>
+                </xs:complexType>
+              </xs:element>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+      <xs:attribute name="testable" use="required">
+        <xs:simpleType>
+          <xs:restriction base="xs:string">
+            <xs:enumeration value="TRUE"/>
+            <xs:enumeration value="FALSE"/>
+            <xs:enumeration value="PARTIAL"/>
+            <xs:enumeration value="UNKNOWN"/>
+          </xs:restriction>
+        </xs:simpleType>
+      </xs:attribute>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+'''
+
+METS_STUB = '''<?xml version="1.0" encoding="UTF-8"?>
+<mets:mets xmlns:mets="http://www.loc.gov/METS/" OBJID="{name}" TYPE="Mixed"
+  PROFILE="https://earkcsip.dilcis.eu/profile/E-ARK-CSIP.xml">
+  <mets:metsHdr CREATEDATE="2025-01-01T00:00:00" RECORDSTATUS="NEW"/>
+  <mets:fileSec/>
+  <mets:structMap TYPE="PHYSICAL" LABEL="CSIP"/>
+</mets:mets>
+'''
+
+def case_counts(scale: float) -> Dict[str, int]:
+    """Get the number of test cases per specification for a scale."""
+    return { spec_id: max(1, round(count * scale)) for spec_id, count in BASE_CASES.items() }
+
+def generate(root: Path, scale: float = 1.0, seed: int = 0, results: bool = True) -> Dict[str, int]:
+    """Generate a synthetic corpus, and optionally its results, under root.
+
+    Returns the number of test cases, packages and result files written."""
+    rnd: random.Random = random.Random(seed)
+    totals: Dict[str, int] = { 'test_cases': 0, 'packages': 0, 'results': 0 }
+    for spec_id, count in case_counts(scale).items():
+        for number in range(1, count + 1):
+            case_id: str = f"{spec_id}{number}"
+            case_dir: Path = root / 'eark-ip-test-corpus' / 'corpus' / spec_id / case_id
+            case_dir.mkdir(parents=True, exist_ok=True)
+            (case_dir / 'testCase.xsd').write_text(TEST_CASE_XSD, encoding='utf-8')
+            packages: List[Tuple[str, bool]] = []
+            rules: List[str] = []
+            for rule_id in range(1, RULES_PER_CASE + 1):
+                rule_packages: List[str] = []
+                for package_no in range(1, PACKAGES_PER_RULE + 1):
+                    is_valid: bool = package_no == 1
+                    name: str = f"{case_id}-rule{rule_id}-{'valid' if is_valid else 'invalid'}{package_no}"
+                    packages.append((name, is_valid))
+                    rule_packages.append(_package_xml(name, is_valid))
+                    package_dir: Path = case_dir / name
+                    package_dir.mkdir(exist_ok=True)
+                    (package_dir / 'METS.xml').write_text(METS_STUB.format(name=name), encoding='utf-8')
+                rules.append(_rule_xml(rule_id, ''.join(rule_packages), rnd))
+            (case_dir / 'testCase.xml').write_text(_test_case_xml(spec_id, case_id, ''.join(rules), rnd), encoding='utf-8')
+            totals['test_cases'] += 1
+            totals['packages'] += len(packages)
+            if results:
+                for name, is_valid in packages:
+                    totals['results'] += _write_results(root / 'results' / spec_id / case_id / name, case_id, is_valid, rnd)
+    return totals
+
+def process_result(case_id: str, is_valid: bool, runner: Tuple[str, str, str, bool], rnd: random.Random) -> Dict:
+    """Build a ProcessResult dictionary, as written by the tester, for a runner."""
+    runner_id, name, version, commons_ip = runner
+    fails: bool = not is_valid and rnd.random() < 0.9
+    messages: List[Dict] = []
+    if fails:
+        messages.append(_message(case_id, 'ERROR', commons_ip))
+    for _ in range(rnd.randint(0, 3)):
+        # Validators report warnings as WARN, the testCase.xml rule levels below spell them WARNING
+        messages.append(_message(f"{case_id[:-1]}{rnd.randint(1, 99)}", rnd.choice(['WARN', 'INFO']), commons_ip))
+    status: str = 'status' if commons_ip else 'level'
+    stdout: Dict = {
+        'structuralResults': { status: 'WellFormed', 'messages': [] },
+        'metadata': {
+            ('schemaResults' if commons_ip else 'schema_results'): { status: 'Valid', 'messages': [] },
+            ('schematronResults' if commons_ip else 'schematron_results'): {
+                status: 'NotValid' if fails else 'Valid', 'messages': messages },
+        },
+    }
+    user_time: float = rnd.uniform(0.2, 4.0) if commons_ip else rnd.uniform(0.1, 1.0)
+    return {
+        'runner_details': { 'id': runner_id, 'name': name, 'version': version, 'URL': 'https://example.org/' },
+        'timestamp': '2025-01-01 00:00:00',
+        'retcode': 0,
+        'stdout': stdout,
+        'stderr': '',
+        'duration': user_time * rnd.uniform(1.05, 1.5),
+        'exception': None,
+        'resources': {
+            'user_time': user_time,
+            'system_time': user_time * 0.1,
+            'max_rss': rnd.randint(300_000, 900_000) if commons_ip else rnd.randint(60_000, 120_000),
+            'read_blocks': rnd.randint(0, 200),
+            'write_blocks': rnd.randint(0, 50),
+        },
+    }
+
+def _write_results(output_dir: Path, case_id: str, is_valid: bool, rnd: random.Random) -> int:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for runner in RUNNERS:
+        with open(output_dir / f"{runner[0]}{runner[2]}.json", 'w', encoding='utf-8') as f:
+            json.dump(process_result(case_id, is_valid, runner, rnd), f)
+    return len(RUNNERS)
+
+def _message(rule_id: str, level: str, commons_ip: bool) -> Dict:
+    return {
+        ('ruleId' if commons_ip else 'rule_id'): rule_id,
+        'level': level,
+        'message': f"Synthetic {level.lower()} message for {rule_id}",
+    }
+
+def _package_xml(name: str, is_valid: bool) -> str:
+    return (f'<package name="{name}" isValid="{"TRUE" if is_valid else "FALSE"}" isImplemented="TRUE">'
+            f'<path>{name}</path><description>Synthetic package {name}.</description></package>')
+
+def _rule_xml(rule_id: int, packages: str, rnd: random.Random) -> str:
+    level: str = rnd.choice(['ERROR', 'ERROR', 'WARNING', 'INFO'])
+    return (f'<rule id="{rule_id}"><description>Synthetic rule {rule_id}.</description>'
+            f'<error level="{level}"><message>Synthetic rule {rule_id} message.</message></error>'
+            f'<corpusPackages>{packages}</corpusPackages></rule>')
+
+def _test_case_xml(spec_id: str, case_id: str, rules: str, rnd: random.Random) -> str:
+    testable: str = rnd.choice(['TRUE', 'TRUE', 'TRUE', 'FALSE', 'PARTIAL', 'UNKNOWN'])
+    url: str = f"https://earkcsip.dilcis.eu/#{case_id}"
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<testCase testable="{testable}">
+  <id requirementId="{case_id}" specification="E-ARK-{spec_id}" version="2.1.0"/>
+  <references><reference requirementId="{case_id}" URL="{url}">{case_id}</reference></references>
+  <requirementText>Synthetic requirement text for {case_id}.</requirementText>
+  <description>Synthetic test case {case_id}.</description>
+  <dependencies/>
+  <rules>{rules}</rules>
+</testCase>
+'''
+
+def main():
+    """Generate a synthetic corpus from the command line."""
+    parser = argparse.ArgumentParser(prog='synthetic',
+                                     description='Generate a synthetic E-ARK test corpus and results.')
+    parser.add_argument('root', type=Path, help='Directory to generate the corpus and results in.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiple of the real corpus size.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--no-results', action='store_false', dest='results', help='Only generate the corpus.')
+    args = parser.parse_args()
+    print(json.dumps(generate(args.root, args.scale, args.seed, args.results)))
+
+if __name__ == '__main__':
+    main()
@@ -26,27 +26,54 @@
 E-ARK : Corpora Reporting
         Command line corpora reporting tool
 """
+from __future__ import annotations
+
 import datetime
 import json
 import shutil
 import sys
-import importlib.metadata
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Set
+
+from eark_corpora import profiling, selection
+from eark_corpora.loader import get_corpora, get_package_results, corpus_root
+from eark_corpora.profiling import phase
+from eark_corpora.selection import Selection
 
-from jinja2 import Environment, FileSystemLoader, Template
+# The template engine, validator and models are heavy to import and are only
+# needed once reports are generated, so they are imported on first use.
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from eark_corpora.cli.compress import Compressor
+    from eark_validator.specifications.specification import SpecificationType
+    from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusTestCase, CorpusTestResult, Level
+    from eark_corpora.model.export import ResultExport
+    from eark_corpora.model.index import RuleIndex
+    from eark_corpora.model.matrix import ConformanceMatrix, MatrixBuilder
+    from eark_corpora.model.runners import ProcessResult
 
-from eark_validator.specifications.specification import SpecificationType
+@lru_cache(maxsize=1)
+def get_version() -> str:
+    """Get the installed package version, looked up on first use."""
+    import importlib.metadata
+    return importlib.metadata.version('eark_corpora')
 
-from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusTestCase, CorpusTestResult, Level
-from eark_corpora.loader import get_corpora, corpus_root
-from eark_corpora.tester.app import results_root
-from eark_corpora.tester.processrunner import ProcessResult
+def __getattr__(name: str):
+    if name == '__version__':
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__version__ = importlib.metadata.version('eark_corpora')
-environment: Environment = Environment(loader=FileSystemLoader('templates/'))
 reports_root = Path('./site')
+rules_index_path = reports_root / 'rules' / 'index.json'
+# Render the large corpus and test case tables as shells that page through JSON data shards
+shard_tables: bool = False
+# Minifies the pages and writes their compressed siblings, None unless asked for
+compressor: Optional[Compressor] = None
+compressed_root = reports_root / '.compressed'
+# The names of the model.corpora.Level members, listed here so that the parser doesn't import the model
+LEVELS: List[str] = ['ERROR', 'INFO', 'WARNING']
 defaults = {
     'description': """E-ARK Corpusra Reporting Tool
 is a command-line tool to test validators against the E-ARK corpus.""",
@@ -67,47 +94,249 @@ def parse_command_line():
     """Parse command line arguments."""
     PARSER.add_argument('--version',
                         action='version',
-                        version=__version__)
+                        version=get_version())
+    PARSER.add_argument('--export-matrix',
+                        type=Path,
+                        dest='matrix_path',
+                        default=None,
+                        help='Export the conformance matrix to a compressed NumPy (.npz) file.')
+    add_export_arguments(PARSER)
+    add_render_arguments(PARSER)
+    PARSER.add_argument('--query',
+                        dest='query',
+                        default=None,
+                        help='Query the rule index from the last report run for a rule ID or glob pattern, e.g. CSIP1*.')
+    PARSER.add_argument('--level',
+                        dest='level',
+                        default=None,
+                        choices=LEVELS,
+                        help='Limit a rule index query to a message level.')
+    selection.add_arguments(PARSER)
+    profiling.add_arguments(PARSER)
     # Parse arguments
     args = PARSER.parse_args()
     return args
 
-def _iterate_corpora(corpora: dict[SpecificationType, Corpus] = None):
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the result export options to a command line parser."""
+    parser.add_argument('--export-results',
+                        type=Path,
+                        dest='export_path',
+                        default=None,
+                        metavar='DIR',
+                        help='Export a row per test result to a directory, as compressed text and NumPy columns.')
+    parser.add_argument('--export-format',
+                        choices=['csv', 'jsonl'],
+                        default='csv',
+                        help='Text format of the exported results, gzipped CSV or JSON Lines, defaults to csv.')
+
+def add_render_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the page rendering options to a command line parser."""
+    parser.add_argument('--shard-tables',
+                        action='store_true',
+                        default=False,
+                        help='Write the corpus and test case tables as JSON data shards that the pages load and page through.')
+    parser.add_argument('--compress',
+                        action='store_true',
+                        default=False,
+                        help='Minify the pages and write precompressed .gz and, with brotli installed, .br siblings.')
+
+def configure_rendering(args: argparse.Namespace) -> None:
+    """Set the page rendering options given on the command line."""
+    global shard_tables, compressor # pylint: disable=global-statement
+    shard_tables = args.shard_tables
+    if args.compress:
+        from eark_corpora.cli.compress import Compressor
+        compressor = Compressor(compressed_root)
+
+def finish_rendering(prune: bool = False) -> None:
+    """Wait for the compressed siblings, pruning the compressed store after a full run."""
+    global compressor # pylint: disable=global-statement
+    if compressor is None:
+        return
+    try:
+        compressor.close(prune)
+        print(f"Compressed {compressor.compressed} files, reused {compressor.reused} unchanged ones.")
+    finally:
+        compressor = None
+
+def open_export(args: argparse.Namespace) -> Optional[ResultExport]:
+    """Open the result export asked for on the command line, if any."""
+    if args.export_path is None:
+        return None
+    from eark_corpora.model.export import ResultExport
+    return ResultExport(args.export_path, args.export_format)
+
+def _iterate_corpora(corpora: dict[SpecificationType, Corpus] = None, matrix_path: Path = None,
+                     export: Optional[ResultExport] = None):
     """Iterate over all specifications."""
-    # Render the home overview report
-    _render_template(reports_root, 'home.html.jinja', { 'corpora': corpora.values(), 'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S') })
-    # iterate over each corpus and output the reports
+    from eark_corpora.model.index import RuleIndex
+    from eark_corpora.model.matrix import MatrixBuilder
+    # Iterate over each corpus and output the test case reports, collecting the result
+    # matrix rows and the rule index as the results are streamed and released case by case
+    builder: MatrixBuilder = MatrixBuilder()
+    rule_index: RuleIndex = RuleIndex()
+    for corpus in corpora.values():
+        _output_cases(corpus, builder, rule_index, export=export)
+    output_summaries(corpora, builder, rule_index, matrix_path)
+
+def output_summaries(corpora: dict[SpecificationType, Corpus], builder: MatrixBuilder, rule_index: RuleIndex,
+                     matrix_path: Path = None):
+    """Render the corpus, rules, performance and home pages once every result has been collected."""
+    matrix: ConformanceMatrix = builder.build()
+    if matrix_path:
+        matrix.save(matrix_path)
     for corpus in corpora.values():
-        _output_corpus(corpus)
+        output_corpus(corpus, matrix)
+    _output_rules(rule_index)
+    _output_performance(matrix)
+    # Render the home overview report last, once all of the results are known
+    output_home(corpora, matrix)
 
-def _output_corpus(corpus: Corpus):
-    # Render the top level corpus report
-    _render_template(reports_root / corpus.specification.id, 'corpus.html.jinja', _get_corpus_context(corpus))
-    # Render the test cases
-    _output_cases(corpus)
+def output_home(corpora: dict[SpecificationType, Corpus], matrix: ConformanceMatrix):
+    """Render the home overview page from the matrix of every result."""
+    _render_template(reports_root, 'home.html.jinja', {
+        'corpora': corpora.values(),
+        # Every corpus has counts, including one left without packages after its test cases were removed
+        'counts': { corpus.specification.id: matrix.counts(corpus.specification.id) for corpus in corpora.values() },
+        'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+
+def output_corpus(corpus: Corpus, matrix: ConformanceMatrix):
+    """Render the top level corpus page from the matrix of every result."""
+    context: Dict = _get_corpus_context(corpus)
+    context['counts'] = matrix.counts(corpus.specification.id)
+    context['rule_hits'] = matrix.rule_hits(corpus.specification.id)
+    context['version_differences'] = matrix.version_differences(corpus.specification.id)
+    context['sharded'] = shard_tables
+    if shard_tables:
+        _write_shard(reports_root / corpus.specification.id, 'test-cases.json', [{
+            'id': test_case.id,
+            'xml_valid': test_case.is_xml_valid,
+            'testable': test_case.testable.value,
+            'rules': len(test_case.rules),
+            'implemented': len(test_case.implemented_packages),
+            'packages': len(test_case.packages),
+        } for test_case in corpus.test_cases])
+        _write_shard(reports_root / corpus.specification.id, 'rule-hits.json',
+                     [{ 'rule': rule_id, 'hits': hits } for rule_id, hits in sorted(context['rule_hits'].items())])
+    _render_template(reports_root / corpus.specification.id, 'corpus.html.jinja', context)
+
+def _output_selected(corpora: dict[SpecificationType, Corpus], selected: Selection,
+                     export: Optional[ResultExport] = None):
+    """Render only the selected test case and package pages over an existing site."""
+    from eark_corpora.model.index import RuleIndex
+    from eark_corpora.model.matrix import MatrixBuilder
+    # The summary pages need every result, so they are left as the last full run rendered them
+    builder: MatrixBuilder = MatrixBuilder()
+    rule_index: RuleIndex = RuleIndex()
+    for corpus in corpora.values():
+        _output_cases(corpus, builder, rule_index, selected, export)
+    print(f"Rendered {len(builder.packages)} packages, the home, corpus, rules and performance pages are unchanged.")
 
-def _output_cases(corpus: Corpus):
+def _output_cases(corpus: Corpus, builder: MatrixBuilder, rule_index: RuleIndex, selected: Selection = None,
+                  export: Optional[ResultExport] = None):
     # Iterate the corpus test cases and output the test case reports
     for test_case in corpus.test_cases:
-        for rule in test_case.rules:
-            for package in rule.packages:
-                results: List[CorpusTestResult] = _get_package_results(package, test_case.id, corpus.specification.id)
-                package.test_results = results
-        # Render the rule report
-        _render_template(reports_root / corpus.specification.id / test_case.id,
-            'case.html.jinja',
-            {
-               'test_case': test_case,
-                'corpus': corpus
+        _output_case(test_case, corpus, builder, rule_index, selected, export)
+
+def _output_case(test_case: CorpusTestCase, corpus: Corpus, builder: MatrixBuilder, rule_index: RuleIndex,
+                 selected: Selection = None, export: Optional[ResultExport] = None):
+    """Load, render and release the results for a single test case."""
+    try:
+        # Filter the packages by name before any results are read, only the disagree filter needs them
+        packages: List[CorpusPackage] = [package for package in test_case.packages
+                                         if not selected or selected.package(package.name)]
+        if selected and selected.disagree:
+            for package in packages:
+                package.test_results = get_package_results(package, test_case.id, corpus.specification.id)
+            packages = [package for package in packages if selection.disagrees(package, package.test_results)]
+        if not packages and selected:
+            return
+        # The case page lists the results of every package, so they are only read for a case that is rendered
+        for package in test_case.packages:
+            if not package.test_results:
+                package.test_results = get_package_results(package, test_case.id, corpus.specification.id)
+        output_case_results(test_case, corpus, builder, rule_index, packages, export)
+    finally:
+        # Release the results so that only one test case is held in memory
+        for package in test_case.packages:
+            package.test_results = []
+
+def output_case_results(test_case: CorpusTestCase, corpus: Corpus, builder: MatrixBuilder, rule_index: RuleIndex,
+                        packages: List[CorpusPackage], export: Optional[ResultExport] = None):
+    """Collect the loaded results of a test case's packages and render the case and package pages."""
+    for package in packages:
+        builder.add(corpus.specification.id, test_case.id, package, package.test_results)
+        rule_index.add(corpus.specification.id, test_case.id, package, package.test_results)
+    if export:
+        export.add(corpus.specification.id, test_case, packages)
+    if shard_tables:
+        _write_case_shards(test_case, corpus)
+    # Render the rule report
+    _render_template(reports_root / corpus.specification.id / test_case.id,
+        'case.html.jinja',
+        {
+           'test_case': test_case,
+            'corpus': corpus,
+            'sharded': shard_tables,
+        }
+    )
+    # Now output the packages for each test case
+    _output_packages(test_case, corpus, packages)
+
+def _write_case_shards(test_case: CorpusTestCase, corpus: Corpus):
+    """Write a test case's rules and a row per package result as the case page's data shards."""
+    coverage = get_environment().globals['coverage']
+    spec_id: str = corpus.specification.id
+    results: List[Dict] = []
+    for rule in test_case.rules:
+        for package in rule.packages:
+            row: Dict = {
+                'rule': rule.id,
+                'package': package.name,
+                'expected': package.is_valid,
+                'not_sampled': bool(coverage and package.has_directory
+                                    and not coverage.is_sampled(spec_id, test_case.id, package.path)),
             }
-        )
-        # Now output the packages for each test case
-        _output_packages(test_case, corpus)
+            # Packages without results still get a row, so that every package is listed
+            results.extend([{
+                **row,
+                'validator': result.details.name,
+                'version': result.details.version,
+                'ret_code': result.ret_code,
+                'timed_out': result.timed_out,
+                'valid': result.is_valid,
+                'duration': round(result.duration, 3),
+                'cpu': round(result.resources.cpu_time, 3),
+                'rss': round(result.resources.max_rss / 1024, 1),
+                'contains_code': result.contains_code,
+            } for result in package.test_results] or [row])
+    output_dir: Path = reports_root / spec_id / test_case.id
+    _write_shard(output_dir, 'rules.json', [{
+        'id': rule.id,
+        'description': rule.description,
+        'level': rule.level.name,
+        'message': rule.message,
+        'packages': len(rule.packages),
+    } for rule in test_case.rules])
+    _write_shard(output_dir, 'results.json', results)
+
+def _write_shard(output_dir: Path, name: str, rows: List[Dict]):
+    """Write the rows of a paged table as compact JSON."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    data: bytes = json.dumps(rows, separators=(',', ':')).encode('utf-8')
+    with phase('shard write'):
+        (output_dir / name).write_bytes(data)
+    _compress(output_dir / name, data)
 
-def _output_packages(test_case: CorpusTestCase, corpus: Corpus):
-    """Output packages for a test case."""
+def _output_packages(test_case: CorpusTestCase, corpus: Corpus, packages: List[CorpusPackage]):
+    """Output the package pages for a test case."""
+    rendered: Set[int] = { id(package) for package in packages }
     for rule in test_case.rules:
         for package in rule.packages:
+            if id(package) not in rendered:
+                continue
             _render_template(reports_root / corpus.specification.id / test_case.id / package.name,
                 'package.html.jinja',
                 {
@@ -115,29 +344,44 @@ def _output_packages(test_case: CorpusTestCase, corpus: Corpus):
                     'case': test_case,
                     'rule': rule,
                     'corpus': corpus,
+                    'results': package.test_results,
                 }
             )
 
-def _get_package_results(package: CorpusPackage, test_case_id: str, corpus_id: str) -> List[CorpusTestResult]:
-    results_dir = results_root / corpus_id/ test_case_id / package.path
-    results: List[CorpusTestResult] = []
-    if not results_dir.exists():
-        return results
-    for filename in results_dir.iterdir():
-        if filename.is_file():
-            print(f"Found test result file: { filename }")
-            result: ProcessResult = ProcessResult.from_file(filename)
-            _result_validity(result)
-            results.append(CorpusTestResult.from_process_result(result, test_case_id))
-    return results
-
-def _result_validity(result: ProcessResult) -> Level:
-    stdout_json: dict = result.stdout
-    pass
+def _output_rules(rule_index: RuleIndex):
+    """Output the rule cross reference pages and persist the index for queries."""
+    rule_index.save(rules_index_path)
+    _render_template(reports_root / 'rules', 'rules.html.jinja', { 'rules': rule_index.summary() })
+    for rule_id, levels in rule_index.rules.items():
+        _render_template(reports_root / 'rules' / rule_id, 'rule.html.jinja', { 'rule_id': rule_id, 'levels': levels })
+
+def _output_performance(matrix: ConformanceMatrix):
+    """Output the validator performance page from the matrix durations."""
+    from eark_corpora.model.performance import runner_performance, version_comparisons
+    performance = runner_performance(matrix)
+    comparisons = [comparison for comparison in version_comparisons(matrix, performance) if len(comparison.versions) > 1]
+    _render_template(reports_root / 'performance', 'performance.html.jinja', {
+        'performance': performance,
+        'comparisons': comparisons,
+    })
+
+def _query_rules(pattern: str, level: str = None) -> int:
+    """Print the packages and runners that reported a rule, from the persisted index."""
+    from eark_corpora.model.corpora import Level
+    from eark_corpora.model.index import RuleIndex
+    if not rules_index_path.is_file():
+        print(f"No rule index found at {rules_index_path}, run eark-corpora to generate it.")
+        return 1
+    matches = RuleIndex.load(rules_index_path).lookup(pattern, Level[level] if level else None)
+    for rule_id, levels in matches.items():
+        for rule_level, hits in levels.items():
+            for hit in hits:
+                print(f"{rule_id}\t{rule_level.name}\t{hit.spec}/{hit.test_case}/{hit.package}\t{hit.runner} v{hit.version}")
+    return 0 if matches else 1
 
 def _get_corpus_context(corpus: Corpus) -> Dict:
     """Get the corpus context."""
-    spec_requirements: set[str] = _get_specification_requirements(corpus)
+    spec_requirements: FrozenSet[str] = _get_specification_requirements(corpus)
     corpus_requirements: set[str] = _get_corpus_requirements(corpus)
     return {
         'corpus': corpus,
@@ -145,17 +389,9 @@ def _get_corpus_context(corpus: Corpus) -> Dict:
         'missing_spec': corpus_requirements.difference(spec_requirements),
     }
 
-def _get_specification_requirements(corpus: Corpus) -> set[str]:
-    spec_requirements: Set[str] = set()
-    # Populate the specification requirements set
-    for requirements in corpus.specification.requirements.values():
-        for requirement in requirements:
-            assert requirement.id not in spec_requirements, f"Duplicate requirement ID: {requirement.id}"
-            spec_requirements.add(requirement.id)
-    for requirement in corpus.specification.structural_requirements:
-        assert requirement.id not in spec_requirements, f"Duplicate requirement ID: {requirement.id}"
-        spec_requirements.add(requirement.id)
-    return spec_requirements
+def _get_specification_requirements(corpus: Corpus) -> FrozenSet[str]:
+    from eark_corpora.model.specifications import requirement_ids
+    return requirement_ids(corpus.specification)
 
 def _get_corpus_requirements(corpus: Corpus) -> Set[str]:
     corpus_dir: Path = corpus_root / corpus.specification.id
@@ -165,36 +401,80 @@ def _get_corpus_requirements(corpus: Corpus) -> Set[str]:
             corpus_requirements.add(filename.name)
     return corpus_requirements
 
-def _setup():
-    # If the reports root exists, clear out the old reports
+def setup_reports():
+    """Clear the reports of an earlier run from the reports root, creating it if it doesn't exist."""
     if reports_root.exists():
         for filename in reports_root.iterdir():
-            # Remove index.html files and directories that are not 'static'
-            if filename.is_file() and filename.name == 'index.html':
+            # Remove index.html files, their compressed siblings, and directories that are not 'static'
+            if filename.is_file() and filename.name.startswith('index.html'):
                 filename.unlink()
-            elif filename.is_dir() and filename.name != 'static':
+            elif filename.is_dir() and filename.name not in ('static', compressed_root.name):
                 shutil.rmtree(filename)
     else:
         # Create the reports root directory if it does not exist
         reports_root.mkdir(parents=True, exist_ok=True)
 
+@lru_cache(maxsize=1)
+def get_environment() -> Environment:
+    """Get the template environment, created on first use."""
+    from jinja2 import Environment, FileSystemLoader
+    from eark_corpora.cli.fragments import FragmentCache
+    from eark_corpora.model.coverage import Coverage
+    # Templates are compiled once per process, rather than checked for changes on every page,
+    # and the snippets they mark with the cache tag are rendered once per distinct arguments
+    environment = Environment(loader=FileSystemLoader('templates/'), extensions=[FragmentCache], auto_reload=False)
+    # Every page marks a sampled results set, coverage is None for complete results
+    environment.globals['coverage'] = Coverage.load()
+    return environment
+
 def _render_template(output_dir: Path, template_name: str, context: Dict, output_file: str = 'index.html'):
     # Make sure the output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     # load the template and render it with the context
-    template: Template = environment.get_template(template_name)
-    with open(output_dir / output_file, 'w', encoding='utf-8') as f:
-        f.write(template.render(context))
+    with phase(f'render {template_name}'):
+        template = get_environment().get_template(template_name)
+        page: str = template.render(context)
+        if compressor:
+            from eark_corpora.cli.compress import minify
+            page = minify(page)
+        data: bytes = page.encode('utf-8')
+        (output_dir / output_file).write_bytes(data)
+    _compress(output_dir / output_file, data)
+
+def _compress(path: Path, data: bytes):
+    """Queue a written file's compressed siblings, or remove any left by an earlier run."""
+    if compressor:
+        compressor.submit(path, data)
+    else:
+        for suffix in ('.gz', '.br'):
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
 
 def main():
     """Main command line application."""
     _exit: int = 0
     # Get input from command line
-    _ = parse_command_line()
-    # Set up the reports root directory
-    _setup()
-    # Iterate over the corpora and output the reports
-    _iterate_corpora(get_corpora())
+    args = parse_command_line()
+    if args.query:
+        sys.exit(_query_rules(args.query, args.level))
+    profiling.start(args)
+    configure_rendering(args)
+    export: Optional[ResultExport] = None
+    try:
+        selected: Selection = Selection.from_args(args)
+        export = open_export(args)
+        if selected.everything:
+            # Set up the reports root directory
+            setup_reports()
+            # Iterate over the corpora and output the reports
+            _iterate_corpora(get_corpora(), args.matrix_path, export)
+        else:
+            _output_selected(get_corpora(selected), selected, export)
+        finish_rendering(prune=selected.everything)
+    finally:
+        if export:
+            export.close()
+        finish_rendering()
+        profiling.finish(args)
     sys.exit(_exit)
 
 # def _test_case_schema_checks():
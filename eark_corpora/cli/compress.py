@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Minified pages with precompressed gzip and brotli siblings.
+
+        Pages are minified as they are rendered and their .gz and .br
+        siblings are compressed on a thread pool while rendering carries on.
+        Compressed files are kept in a store keyed by the digest of their
+        content, so a page that is unchanged since the last run is linked
+        from the store rather than compressed again. Brotli siblings are
+        only written when the brotli package is installed.
+"""
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Set, Tuple
+
+from eark_corpora.profiling import phase
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Blocks whose whitespace is significant, left as they are
+_PRESERVED = re.compile(r'(<pre\b.*?</pre>|<textarea\b.*?</textarea>)', re.S | re.I)
+# Comments, other than conditional comments
+_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+def minify(html: str) -> str:
+    """Strip comments, indentation and blank lines from a page, keeping a line
+    break wherever there was whitespace so that text and scripts read the same."""
+    parts: List[str] = _PRESERVED.split(html)
+    for index in range(0, len(parts), 2):
+        text: str = _COMMENT.sub('', parts[index])
+        lines: str = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+        # Whitespace next to a preserved block still separates it from the text
+        if index > 0 and text[:1].isspace():
+            lines = '\n' + lines
+        if index < len(parts) - 1 and text[-1:].isspace() and lines:
+            lines += '\n'
+        parts[index] = lines
+    return ''.join(parts)
+
+def _gzip(data: bytes) -> bytes:
+    # A fixed timestamp, so that the same page always compresses to the same file
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def formats() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    """The sibling suffixes written and their compressors."""
+    compressors: List[Tuple[str, Callable[[bytes], bytes]]] = [('.gz', _gzip)]
+    if brotli is not None:
+        compressors.append(('.br', brotli.compress))
+    return compressors
+
+class Compressor:
+    """Writes the compressed siblings of files on a thread pool, reusing stored
+    compressed files for content that has been compressed before."""
+    def __init__(self, store: Path, workers: int = 0):
+        self.store: Path = store
+        self.compressed: int = 0
+        self.reused: int = 0
+        self._used: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                                                thread_name_prefix='compress')
+
+    def submit(self, path: Path, data: bytes) -> None:
+        """Queue writing the compressed siblings of a file with the given contents."""
+        self._executor.submit(self._compress, path, data).add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        if not future.cancelled() and future.exception():
+            with self._lock:
+                self._errors.append(future.exception())
+
+    def _compress(self, path: Path, data: bytes) -> None:
+        digest: str = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._used.add(digest)
+        for suffix, compress in formats():
+            stored: Path = self.store / digest[:2] / (digest + suffix)
+            if stored.is_file():
+                with self._lock:
+                    self.reused += 1
+            else:
+                with phase(f'compress {suffix}'):
+                    _write_bytes(stored, compress(data))
+                with self._lock:
+                    self.compressed += 1
+            _link(stored, path.with_name(path.name + suffix))
+
+    def close(self, prune: bool = False) -> None:
+        """Wait for the queued files, then remove stored files that no file used if pruning."""
+        self._executor.shutdown(wait=True)
+        if self._errors:
+            raise self._errors[0]
+        if prune and self.store.is_dir():
+            # After a full run the store only needs to hold the current site
+            for stored in self.store.glob('*/*'):
+                if stored.name.split('.', 1)[0] not in self._used:
+                    stored.unlink(missing_ok=True)
+            for directory in self.store.iterdir():
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write a file atomically, concurrent writers of the same content both succeed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+def _link(source: Path, target: Path) -> None:
+    """Hard link a stored file into the site, copying it where links aren't supported."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
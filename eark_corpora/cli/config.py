@@ -27,4 +27,5 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class AppConfig(BaseSettings):
     corpus_config: str = "./config/corpora.json"
     testing_config: str = "./config/runners.json"
+    specification_cache: str = "~/.cache/eark-corpora/specifications"
     model_config = SettingsConfigDict(env_prefix="eark_", env_file=".env")
\ No newline at end of file
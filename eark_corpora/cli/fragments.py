@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Fragment cache for template snippets rendered many times over.
+
+        The badges, navigation bar and similar snippets render the same few
+        outputs thousands of times in a full site. Wrapping one in
+        {% cache arg, ... %} ... {% endcache %} renders it once per distinct
+        arguments and location in the process, and reuses the output after
+        that. Only cache snippets whose output depends on nothing but their
+        arguments, and whose arguments are hashable and take few values.
+"""
+from typing import Dict, Hashable, List, Tuple
+
+from jinja2 import nodes
+from jinja2.environment import Environment
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+
+# Fragments are no longer added once the cache holds this many
+MAX_FRAGMENTS: int = 4096
+
+class FragmentCache(Extension):
+    """Adds the cache tag, memoising the rendered body by its location and arguments.
+
+    The tag compiles to a lookup in the cache, so that a hit costs no more
+    than building the key, and the body is only rendered on a miss."""
+    tags = { 'cache' }
+
+    def __init__(self, environment: Environment):
+        super().__init__(environment)
+        self.fragments: Dict[Hashable, str] = {}
+
+    def parse(self, parser: Parser) -> List[nodes.Node]:
+        lineno: int = next(parser.stream).lineno
+        args: List[nodes.Expr] = []
+        while parser.stream.current.type != 'block_end':
+            if args:
+                parser.stream.expect('comma')
+            args.append(parser.parse_expression())
+        body: List[nodes.Node] = parser.parse_statements(('name:endcache',), drop_needle=True)
+        # The template, line and an identifier unique within the template tell apart
+        # fragments with the same arguments, even several tags on one line. Names
+        # starting with an underscore aren't exported from templates
+        tag: str = parser.free_identifier(lineno).name
+        location: nodes.Const = nodes.Const(f"{parser.name}:{lineno}:{tag}")
+        key: str = f"_fragment_key_{tag}"
+        rendered: str = f"_fragment_{tag}"
+        fragments: nodes.ExtensionAttribute = self.attr('fragments', lineno=lineno)
+        return [
+            nodes.Assign(nodes.Name(key, 'store'), nodes.Tuple([location, nodes.Tuple(args, 'load')], 'load'),
+                         lineno=lineno),
+            nodes.If(nodes.Compare(nodes.Name(key, 'load'), [nodes.Operand('in', fragments)]),
+                     [nodes.Output([nodes.Getitem(fragments, nodes.Name(key, 'load'), 'load')])],
+                     [],
+                     [nodes.AssignBlock(nodes.Name(rendered, 'store'), None, body),
+                      nodes.Output([self.call_method('_store', [nodes.Name(key, 'load'),
+                                                                nodes.Name(rendered, 'load')])])],
+                     lineno=lineno),
+        ]
+
+    def _store(self, key: Tuple, fragment: str) -> str:
+        if len(self.fragments) < MAX_FRAGMENTS:
+            self.fragments[key] = fragment
+        return fragment
@@ -25,25 +25,75 @@
 """
 E-ARK : Corpus Reporting
 """
+from __future__ import annotations
+
 from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from eark_corpora.profiling import phase
+from eark_corpora.selection import Selection
 
-from eark_validator.specifications.specification import EarkSpecification, SpecificationType, SpecificationVersion
-from eark_corpora.model.corpora import Corpus
-from eark_corpora.cli.config import AppConfig
+if TYPE_CHECKING:
+    from eark_validator.specifications.specification import SpecificationType
+    from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusTestResult
+    from eark_corpora.cli.config import AppConfig
 
 
 corpus_root = Path('./eark-ip-test-corpus/corpus')
+results_root = Path('./results')
+SUMMARY_SUFFIX = '.summary.json' # Normalised summaries stored next to the raw results
 
 @lru_cache(maxsize=1)
 def get_config() -> AppConfig:
     """Get the application configuration."""
+    from eark_corpora.cli.config import AppConfig
     return AppConfig()
 
 @lru_cache(maxsize=1)
-def get_corpora() -> dict[SpecificationType, Corpus]:
+def get_corpora(selection: Selection = Selection()) -> dict[SpecificationType, Corpus]:
+    # The validator specifications and corpus model are only imported when a corpus is loaded
+    from eark_validator.specifications.specification import SpecificationType, SpecificationVersion
+    from eark_corpora.model.corpora import Corpus
+    from eark_corpora.model.specifications import load_specification
     corpora: dict[SpecificationType, Corpus] = {}
     for spec_type in SpecificationType:
-        specification = EarkSpecification(spec_type, SpecificationVersion.V2_1_0).specification
-        corpora[spec_type] = Corpus.from_directory(specification, corpus_root / specification.id)
+        # Unselected specifications and test cases are skipped before they are parsed
+        if not selection.spec(spec_type.name):
+            continue
+        with phase('specification load'):
+            specification = load_specification(spec_type, SpecificationVersion.V2_1_0)
+        with phase('corpus load'):
+            corpora[spec_type] = Corpus.from_directory(specification, corpus_root / specification.id,
+                                                       selection.test_case)
     return corpora
+
+def get_package_results(package: CorpusPackage, test_case_id: str, corpus_id: str,
+                        verbose: bool = True) -> List[CorpusTestResult]:
+    """Load the last results recorded for a package."""
+    from eark_corpora.model.adapters import load_summary
+    from eark_corpora.model.corpora import CorpusTestResult
+    from eark_corpora.model.runners import ProcessResult
+    results_dir = results_root / corpus_id/ test_case_id / package.path
+    results: List[CorpusTestResult] = []
+    if not results_dir.exists():
+        return results
+    for filename in results_dir.iterdir():
+        # Skip anything but committed results, e.g. temporary files from an interrupted write
+        if not filename.is_file() or filename.suffix != '.json' or filename.name.endswith(SUMMARY_SUFFIX):
+            continue
+        if verbose:
+            print(f"Found test result file: { filename }")
+        summary: Path = filename.with_name(filename.stem + SUMMARY_SUFFIX)
+        with phase('result load'):
+            # The summary written at ingest, unless the result was written without one since
+            # or the summary was written by an older version of the adapters
+            test_result: Optional[CorpusTestResult] = None
+            if summary.is_file() and summary.stat().st_mtime_ns >= filename.stat().st_mtime_ns:
+                test_result = load_summary(summary.read_bytes())
+            if test_result is not None:
+                results.append(test_result)
+            else:
+                result: ProcessResult = ProcessResult.from_file(filename)
+                results.append(CorpusTestResult.from_process_result(result, test_case_id))
+    return results
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Result adapters that normalise each kind of runner's report.
+
+        Every validator reports in its own shape. An adapter, registered for
+        a runner kind, reads that shape once when a result is ingested and
+        returns the normalised CorpusTestResult. The tester stores it as a
+        summary next to the raw report and the reporter reads the summaries,
+        so a new validator only needs a new adapter.
+"""
+import json
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from eark_corpora.model.corpora import CorpusTestResult, Level
+from eark_corpora.model.runners import ProcessResult
+
+# The adapter used for runners with no registered adapter of their own
+DEFAULT_KIND: str = 'eark-validator'
+# Version of the stored summaries. Bump it when an adapter or CorpusTestResult changes what a
+# summary holds, so that the summaries written before are read from their raw reports again
+SUMMARY_VERSION: int = 1
+
+ADAPTERS: Dict[str, 'ResultAdapter'] = {}
+
+def register(kind: str) -> Callable[[Type['ResultAdapter']], Type['ResultAdapter']]:
+    """Class decorator registering an adapter for a runner kind."""
+    def _register(cls: Type['ResultAdapter']) -> Type['ResultAdapter']:
+        ADAPTERS[kind] = cls()
+        return cls
+    return _register
+
+def adapter_for(kind: str) -> 'ResultAdapter':
+    """The adapter for a runner kind, the default adapter for unknown kinds."""
+    return ADAPTERS.get(kind, ADAPTERS[DEFAULT_KIND])
+
+def summarise(result: ProcessResult, test_case_id: str) -> CorpusTestResult:
+    """Normalise a runner's result for a test case with the adapter for its kind."""
+    report = result.stdout
+    if isinstance(report, str) and report.startswith('{'):
+        # Results straight from a run hold the undecoded JSON output
+        try:
+            report = json.loads(report)
+        except json.JSONDecodeError:
+            pass
+    if result.retcode != 0 or not isinstance(report, dict):
+        return CorpusTestResult(
+            details=result.runner_details,
+            requirement_id=test_case_id,
+            ret_code=result.retcode,
+            error_msg=str(result.stderr) if result.stderr else report,
+            duration=result.duration,
+            resources=result.resources,
+            timed_out=result.timed_out,
+        )
+    return adapter_for(result.runner_details.report_kind).summarise(result, report, test_case_id)
+
+def dump_summary(result: CorpusTestResult) -> str:
+    """Serialise a normalised result as a summary of the current version."""
+    return json.dumps({ 'version': SUMMARY_VERSION, 'result': result.model_dump(mode='json') })
+
+def load_summary(data: bytes) -> Optional[CorpusTestResult]:
+    """Read a serialised summary, None if it isn't one of the current version."""
+    try:
+        summary = json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(summary, dict) or summary.get('version') != SUMMARY_VERSION:
+        return None
+    return CorpusTestResult.model_validate(summary['result'])
+
+@register('eark-validator')
+class ResultAdapter:
+    """Adapter for reports in the E-ARK Python validator's shape, other shapes override the key names."""
+    structural_key: str = 'structuralResults'
+    schema_key: str = 'schema_results'
+    schematron_key: str = 'schematron_results'
+    status_key: str = 'level'
+    rule_key: str = 'rule_id'
+
+    def summarise(self, result: ProcessResult, report: Dict, test_case_id: str) -> CorpusTestResult:
+        """Normalise a successful run's decoded report."""
+        error_ids: Dict[str, Level] = {}
+        struct_status, ids = self._get_results(report.get(self.structural_key, {}), 'level', 'rule_id')
+        error_ids.update(ids)
+        schema_status: str = 'Unknown'
+        schematron_status: str = 'Unknown'
+        metadata: Dict = report.get('metadata', {})
+        if metadata:
+            schema_status, ids = self._get_results(metadata.get(self.schema_key, {}))
+            error_ids.update(ids)
+            schematron_status, ids = self._get_results(metadata.get(self.schematron_key, {}))
+            error_ids.update(ids)
+        return CorpusTestResult(
+            details=result.runner_details,
+            requirement_id=test_case_id,
+            ret_code=result.retcode,
+            struct_status=struct_status,
+            schema_status=schema_status,
+            schematron_status=schematron_status,
+            duration=result.duration,
+            error_ids=error_ids,
+            resources=result.resources,
+        )
+
+    def _get_results(self, results: Dict, status_key: str = None, rule_key: str = None
+                     ) -> Tuple[str, Dict[str, Level]]:
+        """The status and message rule IDs and levels of a section of the report."""
+        error_ids: Dict[str, Level] = {}
+        status: str = 'Unknown'
+        if results:
+            status = results.get(status_key or self.status_key, 'Unknown')
+            for message in results.get('messages', []):
+                error_ids.update({ message.get(rule_key or self.rule_key, 'Unknown'):
+                                   Level.from_str(message.get('level', 'ERROR')) })
+        return status, error_ids
+
+@register('commons-ip')
+class CommonsIpAdapter(ResultAdapter):
+    """Adapter for the commons-ip validator's reports."""
+    schema_key: str = 'schemaResults'
+    schematron_key: str = 'schematronResults'
+    status_key: str = 'status'
+    rule_key: str = 'ruleId'
@@ -24,7 +24,7 @@
 #
 from enum import Enum, unique
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional
 
 from lxml import etree
 from xsdata.formats.dataclass.parsers import XmlParser
@@ -34,7 +34,8 @@ from eark_validator.model.specifications import Specification
 from eark_validator.specifications.specification import SpecificationType, SpecificationVersion
 
 from eark_corpora.model.casexml import TestCase, Rule, Package
-from eark_corpora.model.runners import ProcessResult, RunnerDetails
+from eark_corpora.model.runners import ProcessResult, ResourceUsage, RunnerDetails
+from eark_corpora.profiling import phase
 
 
 @unique
@@ -85,6 +86,8 @@ class CorpusTestResult(BaseModel):
     schematron_status: str = 'Unknown'
     error_ids: Dict[str, Level] = {}
     error_msg: str = ''
+    resources: ResourceUsage = ResourceUsage()
+    timed_out: bool = False
 
     @property
     def is_valid(self) -> bool:
@@ -98,51 +101,9 @@ class CorpusTestResult(BaseModel):
     
     @classmethod
     def from_process_result(cls, process_result: ProcessResult, test_case_id: str) -> 'CorpusTestResult':
-        """Create a CorpusTestResult from a ProcessResult."""
-        if process_result.retcode != 0 or not isinstance(process_result.stdout, dict):
-            error_msg = str(process_result.stderr) if process_result.stderr else process_result.stdout
-            return CorpusTestResult(
-                details=process_result.runner_details,
-                requirement_id=test_case_id,
-                ret_code=process_result.retcode,
-                error_msg=error_msg,
-                duration=process_result.duration, 
-            )
-        error_ids: Dict[str, Level] = {}
-        struct_status, ids = cls._get_results(process_result.stdout.get('structuralResults', {}))
-        error_ids.update(ids)
-        schema_status = 'Unknown'
-        schematron_status = 'Unknown'
-        metadata = process_result.stdout.get('metadata', {})
-        if metadata:
-            schema_name = 'schemaResults' if process_result.runner_details.id == 'commons-ip' else 'schema_results'
-            schema_status, ids = cls._get_results(metadata.get(schema_name, {}), process_result.runner_details.id == 'commons-ip')
-            error_ids.update(ids)
-            schematron_name = 'schematronResults' if process_result.runner_details.id == 'commons-ip' else 'schematron_results'
-            schematron_status, ids = cls._get_results(metadata.get(schematron_name, {}), process_result.runner_details.id == 'commons-ip')
-            error_ids.update(ids)
-        return CorpusTestResult(
-            details=process_result.runner_details,
-            requirement_id=test_case_id,
-            ret_code=process_result.retcode,
-            struct_status=struct_status,
-            schema_status=schema_status,
-            schematron_status=schematron_status,
-            duration=process_result.duration,
-            error_ids=error_ids,
-        )
-    
-    @classmethod
-    def _get_results(cls, result_dict: Dict, is_commons_ip: bool = False) -> Tuple[str, Dict[str, Level]]:
-        error_ids: Dict[str, Level] = {}
-        status: str = 'Unknown'
-        status_name: str = 'status' if is_commons_ip else 'level'
-        rule_name: str = 'ruleId' if is_commons_ip else 'rule_id'
-        if result_dict:
-            status = result_dict.get(status_name, 'Unknown')
-            for message in result_dict.get('messages', []):
-                error_ids.update({ message.get(rule_name, 'Unknown') : Level.from_str(message.get('level', 'ERROR')) })
-        return status, error_ids
+        """Create a CorpusTestResult from a ProcessResult, with the adapter for the runner's kind."""
+        from eark_corpora.model.adapters import summarise
+        return summarise(process_result, test_case_id)
 
 
 class CorpusPackage(BaseModel):
@@ -156,6 +117,32 @@ class CorpusPackage(BaseModel):
     has_mets: bool
     test_results: List[CorpusTestResult] = []
 
+class ResultCounts(BaseModel):
+    """Summary counts of test results, as reduced from the conformance matrix.
+
+    A false positive is a result that reports a package expected to be valid
+    as invalid, a false negative is one that reports an invalid package as valid.
+    Durations and CPU times are totals in seconds, max_rss is the largest peak
+    resident set size of any validator process in KiB."""
+    packages: int = 0
+    tested_packages: int = 0
+    results: int = 0
+    valid: int = 0
+    agreed: int = 0
+    false_positives: int = 0
+    false_negatives: int = 0
+    contains_code: int = 0
+    timed_out: int = 0
+    duration: float = 0.0
+    cpu_time: float = 0.0
+    max_rss: int = 0
+    runners: Dict[str, 'ResultCounts'] = {}
+
+    @property
+    def agreement(self) -> float:
+        """The proportion of results that agree with the expected validity."""
+        return self.agreed / self.results if self.results else 0.0
+
 class CorpusRule(BaseModel):
     """Rule class for testing purposes."""
     id: int
@@ -227,9 +214,11 @@ class CorpusTestCase(BaseModel):
 
     @classmethod
     def from_test_case(cls, test_case_path: Path) -> 'CorpusTestCase':
-        test_case_schema: etree.XMLSchema = etree.XMLSchema(etree.parse(test_case_path / 'testCase.xsd'))
-        is_xml_valid: bool = test_case_schema.validate(etree.parse(test_case_path / 'testCase.xml'))
-        test_case: TestCase = XmlParser().from_path(test_case_path / 'testCase.xml' , TestCase)
+        with phase('test case xsd validation'):
+            test_case_schema: etree.XMLSchema = etree.XMLSchema(etree.parse(test_case_path / 'testCase.xsd'))
+            is_xml_valid: bool = test_case_schema.validate(etree.parse(test_case_path / 'testCase.xml'))
+        with phase('test case parse'):
+            test_case: TestCase = XmlParser().from_path(test_case_path / 'testCase.xml' , TestCase)
         return CorpusTestCase(
             id=test_case.id.requirement_id,
             description=test_case.description.value,
@@ -272,10 +261,13 @@ class Corpus(BaseModel):
         return list(set(implemented_packages))  # Remove duplicates
 
     @classmethod
-    def from_directory(cls, specification:Specification, corpus_path: Path) -> 'Corpus':
-        """Create a Corpus from a directory."""
+    def from_directory(cls, specification:Specification, corpus_path: Path,
+                       test_case_filter: Callable[[str], bool] = None) -> 'Corpus':
+        """Create a Corpus from a directory, optionally only the test cases whose ID passes a filter."""
         test_cases: list[CorpusTestCase] = []
         for test_case_path in corpus_path.iterdir():
+            if test_case_filter and not test_case_filter(test_case_path.name):
+                continue
             if test_case_path.is_dir() and test_case_path.name.startswith(specification.id):
                 test_cases.append(CorpusTestCase.from_test_case(test_case_path))
 
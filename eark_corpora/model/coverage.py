@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting coverage of a sampled results set
+"""
+from pathlib import Path
+from typing import Any, List, Optional, Set
+
+from pydantic import BaseModel, PrivateAttr
+
+from eark_corpora.loader import results_root
+
+coverage_path: Path = results_root / 'coverage.json'
+
+class Stratum(BaseModel):
+    """A sampling stratum and the number of its packages sampled."""
+    spec: str
+    testable: str
+    valid: bool
+    level: str
+    population: int
+    sampled: int
+
+class Coverage(BaseModel):
+    """The packages a sampled run validated, written next to its partial results."""
+    seed: int
+    budget: float # Time budget in seconds
+    estimate: float # Estimated seconds per package and runner
+    timestamp: str
+    population: int
+    packages: List[str] # Sampled package paths, relative to the results root
+    strata: List[Stratum]
+    _sampled_paths: Set[str] = PrivateAttr(default_factory=set)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._sampled_paths = set(self.packages)
+
+    @property
+    def sampled(self) -> int:
+        """The number of packages sampled."""
+        return len(self.packages)
+
+    def spec_counts(self, spec_id: str) -> Stratum:
+        """Sum the strata of a specification."""
+        strata: List[Stratum] = [stratum for stratum in self.strata if stratum.spec == spec_id]
+        return Stratum(spec=spec_id, testable='', valid=False, level='',
+                       population=sum(stratum.population for stratum in strata),
+                       sampled=sum(stratum.sampled for stratum in strata))
+
+    def is_sampled(self, spec_id: str, test_case_id: str, package_path: Path) -> bool:
+        """Was a package in the sample."""
+        return (Path(spec_id) / test_case_id / package_path).as_posix() in self._sampled_paths
+
+    def save(self, path: Path = coverage_path) -> None:
+        """Save the coverage as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: Path = coverage_path) -> Optional['Coverage']:
+        """Load the coverage of the results set, None if the results are not sampled."""
+        if not path.is_file():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.model_validate_json(f.read())
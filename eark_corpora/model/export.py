@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Columnar export of every test result for analysis outside the site.
+
+        Each result is a row, keyed by specification, test case, rule,
+        package, runner and version. Rows are streamed to a gzipped CSV or
+        JSON Lines file as the test cases are reported, while typed columns
+        are collected in compact buffers and written as NumPy .npy files,
+        which load memory mapped into NumPy or pandas without parsing.
+"""
+import csv
+import gzip
+import json
+from array import array
+from pathlib import Path
+from typing import IO, Dict, List, Tuple
+
+import numpy as np
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestCase, CorpusTestResult, Level
+
+FORMATS: Tuple[str, ...] = ('csv', 'jsonl')
+LEVELS: List[str] = [level.value for level in Level]
+
+# Dictionary encoded string columns, stored as int32 codes into their categories
+CATEGORICAL: Tuple[str, ...] = ('spec', 'test_case', 'package', 'runner', 'version',
+                                'struct_status', 'schema_status', 'schematron_status')
+# The other row columns and their array typecode and NumPy dtype
+TYPED: Dict[str, Tuple[str, str]] = {
+    'rule': ('i', 'int32'),
+    'expected_valid': ('b', 'bool'),
+    'valid': ('b', 'bool'),
+    'contains_code': ('b', 'bool'),
+    'timed_out': ('b', 'bool'),
+    'ret_code': ('i', 'int32'),
+    'duration': ('d', 'float64'),
+    'user_time': ('d', 'float64'),
+    'system_time': ('d', 'float64'),
+    'max_rss': ('q', 'int64'),
+    'read_blocks': ('q', 'int64'),
+    'write_blocks': ('q', 'int64'),
+}
+COLUMNS: List[str] = list(CATEGORICAL[:3]) + ['rule'] + list(CATEGORICAL[3:]) + list(TYPED)[1:] + ['reported']
+
+class ResultExport:
+    """Streams result rows to a compressed text file and collects them as typed columns."""
+    def __init__(self, root: Path, export_format: str = 'csv'):
+        if export_format not in FORMATS:
+            raise ValueError(f"Unknown export format {export_format}, expected one of {', '.join(FORMATS)}")
+        self.root: Path = root
+        self.format: str = export_format
+        self.rows: int = 0
+        self._categories: Dict[str, Dict[str, int]] = { name: {} for name in CATEGORICAL }
+        self._codes: Dict[str, array] = { name: array('i') for name in CATEGORICAL }
+        self._typed: Dict[str, array] = { name: array(code) for name, (code, _) in TYPED.items() }
+        # The reported rule IDs as a ragged column, row offsets into the rule ID codes and levels
+        self._rule_ids: Dict[str, int] = {}
+        self._offsets: array = array('q', [0])
+        self._reported: array = array('i')
+        self._levels: array = array('b')
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = gzip.open(self.root / f"results.{export_format}.gz", 'wt', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file) if export_format == 'csv' else None
+        if self._writer:
+            self._writer.writerow(COLUMNS)
+
+    def __enter__(self) -> 'ResultExport':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add(self, spec_id: str, test_case: CorpusTestCase, packages: List[CorpusPackage]) -> None:
+        """Add a row for every test result of a test case's packages."""
+        exported = { id(package) for package in packages }
+        for rule in test_case.rules:
+            for package in rule.packages:
+                if id(package) not in exported:
+                    continue
+                for result in package.test_results:
+                    self._add_row(spec_id, str(test_case.id), rule.id, package, result)
+
+    def _add_row(self, spec_id: str, test_case_id: str, rule_id: int, package: CorpusPackage,
+                 result: CorpusTestResult) -> None:
+        row: Dict = {
+            'spec': spec_id,
+            'test_case': test_case_id,
+            'package': package.name,
+            'rule': rule_id,
+            'runner': result.details.id,
+            'version': result.details.version,
+            'struct_status': result.struct_status,
+            'schema_status': result.schema_status,
+            'schematron_status': result.schematron_status,
+            'expected_valid': package.is_valid,
+            'valid': result.is_valid,
+            'contains_code': result.contains_code,
+            'timed_out': result.timed_out,
+            'ret_code': result.ret_code,
+            'duration': result.duration,
+            'user_time': result.resources.user_time,
+            'system_time': result.resources.system_time,
+            'max_rss': result.resources.max_rss,
+            'read_blocks': result.resources.read_blocks,
+            'write_blocks': result.resources.write_blocks,
+        }
+        for name in CATEGORICAL:
+            categories: Dict[str, int] = self._categories[name]
+            self._codes[name].append(categories.setdefault(row[name], len(categories)))
+        for name, column in self._typed.items():
+            column.append(row[name])
+        for reported, level in result.error_ids.items():
+            self._reported.append(self._rule_ids.setdefault(reported, len(self._rule_ids)))
+            self._levels.append(LEVELS.index(level.value))
+        self._offsets.append(len(self._reported))
+        self.rows += 1
+        if self._writer:
+            row['reported'] = ' '.join(f"{reported}:{level.value}" for reported, level in result.error_ids.items())
+            self._writer.writerow(row[name] for name in COLUMNS)
+        else:
+            row['reported'] = { reported: level.value for reported, level in result.error_ids.items() }
+            self._file.write(json.dumps(row) + '\n')
+
+    def close(self) -> None:
+        """Finish the text file and write the columns and their schema."""
+        if self._file.closed:
+            return
+        self._file.close()
+        columns: Path = self.root / 'columns'
+        columns.mkdir(exist_ok=True)
+        schema: Dict = { 'rows': self.rows, 'columns': {} }
+        for name in CATEGORICAL:
+            np.save(columns / f"{name}.npy", np.frombuffer(self._codes[name], dtype=np.int32))
+            schema['columns'][name] = { 'dtype': 'int32', 'categories': list(self._categories[name]) }
+        for name, (_, dtype) in TYPED.items():
+            values: np.ndarray = np.frombuffer(self._typed[name], dtype=np.dtype(self._typed[name].typecode))
+            np.save(columns / f"{name}.npy", values.astype(dtype, copy=False))
+            schema['columns'][name] = { 'dtype': dtype }
+        np.save(columns / 'reported_offsets.npy', np.frombuffer(self._offsets, dtype=np.int64))
+        np.save(columns / 'reported_rule_ids.npy', np.frombuffer(self._reported, dtype=np.int32))
+        np.save(columns / 'reported_levels.npy', np.frombuffer(self._levels, dtype=np.int8))
+        schema['columns']['reported_offsets'] = { 'dtype': 'int64' }
+        schema['columns']['reported_rule_ids'] = { 'dtype': 'int32', 'categories': list(self._rule_ids) }
+        schema['columns']['reported_levels'] = { 'dtype': 'int8', 'categories': LEVELS }
+        with open(columns / 'schema.json', 'w', encoding='utf-8') as f:
+            json.dump(schema, f, indent=2)
+
+def load_columns(root: Path) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """Memory map the columns of an export, returning them with their schema."""
+    columns: Path = root / 'columns'
+    with open(columns / 'schema.json', 'r', encoding='utf-8') as f:
+        schema: Dict = json.load(f)
+    return { name: np.load(columns / f"{name}.npy", mmap_mode='r') for name in schema['columns'] }, schema
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting inverted rule index
+"""
+import json
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult, Level
+
+class RuleHit(NamedTuple):
+    """A single package result that reported a rule."""
+    spec: str
+    test_case: str
+    package: str
+    runner: str
+    version: str
+
+class RuleIndex:
+    """Inverted index from reported rule ID and level to the results that reported them."""
+    def __init__(self, rules: Optional[Dict[str, Dict[Level, List[RuleHit]]]] = None):
+        self.rules: Dict[str, Dict[Level, List[RuleHit]]] = rules if rules is not None else {}
+
+    def add(self, spec_id: str, test_case_id: str, package: CorpusPackage, results: List[CorpusTestResult]) -> None:
+        """Add the rules reported by a package's test results to the index."""
+        for result in results:
+            hit: RuleHit = RuleHit(spec_id, test_case_id, package.name, result.details.id, result.details.version)
+            for rule_id, level in result.error_ids.items():
+                self.rules.setdefault(rule_id, {}).setdefault(level, []).append(hit)
+
+    def lookup(self, pattern: str, level: Optional[Level] = None) -> Dict[str, Dict[Level, List[RuleHit]]]:
+        """Look up the hits for a rule ID or glob pattern, optionally limited to a level."""
+        if any(char in pattern for char in '*?['):
+            rule_ids: List[str] = [rule_id for rule_id in self.rules if fnmatchcase(rule_id, pattern)]
+        else:
+            rule_ids = [pattern] if pattern in self.rules else []
+        matches: Dict[str, Dict[Level, List[RuleHit]]] = {}
+        for rule_id in sorted(rule_ids):
+            levels: Dict[Level, List[RuleHit]] = {
+                rule_level: hits for rule_level, hits in self.rules[rule_id].items() if level is None or rule_level == level
+            }
+            if levels:
+                matches[rule_id] = levels
+        return matches
+
+    def summary(self) -> List[Dict]:
+        """Get a per rule summary of hit counts by level, distinct packages and runners."""
+        summary: List[Dict] = []
+        for rule_id in sorted(self.rules):
+            levels: Dict[Level, List[RuleHit]] = self.rules[rule_id]
+            hits: List[RuleHit] = [hit for level_hits in levels.values() for hit in level_hits]
+            summary.append({
+                'id': rule_id,
+                'levels': { level.name: len(level_hits) for level, level_hits in levels.items() },
+                'packages': len({ (hit.spec, hit.test_case, hit.package) for hit in hits }),
+                'runners': sorted({ f"{hit.runner} v{hit.version}" for hit in hits }),
+            })
+        return summary
+
+    def save(self, path: Path) -> None:
+        """Save the index as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({ rule_id: { level.value: hits for level, hits in levels.items() }
+                        for rule_id, levels in self.rules.items() }, f)
+
+    @classmethod
+    def load(cls, path: Path) -> 'RuleIndex':
+        """Load an index saved with save."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data: Dict = json.load(f)
+        return cls({ rule_id: { Level(level): [RuleHit(*hit) for hit in hits] for level, hits in levels.items() }
+                     for rule_id, levels in data.items() })
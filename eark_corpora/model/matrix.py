@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting conformance matrix
+"""
+import re
+from array import array
+from enum import IntEnum, unique
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult, Level, ResultCounts
+
+LEVEL_CODES: Dict[Level, int] = { Level.ERROR: 1, Level.WARNING: 2, Level.INFO: 3 }
+
+@unique
+class Outcome(IntEnum):
+    """The outcome axis of the conformance matrix."""
+    TESTED = 0
+    VALID = 1
+    CONTAINS_CODE = 2
+    FAILED = 3
+    TIMED_OUT = 4
+
+@unique
+class Metric(IntEnum):
+    """The measurement axis of the conformance matrix metrics."""
+    DURATION = 0
+    CPU_TIME = 1
+    MAX_RSS = 2
+
+class VersionDifferences(BaseModel):
+    """The packages that the versions of one runner disagree on."""
+    name: str
+    versions: List[str] # Oldest first
+    counts: List[ResultCounts] # Per version, in the same order
+    # Package label, expected validity and each version's validity, None where untested
+    packages: List[Tuple[str, bool, List[Optional[bool]]]]
+
+class MatrixBuilder:
+    """Collects compact result rows while results are streamed."""
+    def __init__(self):
+        self.packages: List[str] = []
+        self.specifications: List[str] = []
+        self._spec_index: Dict[str, int] = {}
+        self.runners: List[str] = []
+        self._runner_index: Dict[str, int] = {}
+        self.rule_ids: List[str] = []
+        self._rule_index: Dict[str, int] = {}
+        self._package_spec: array = array('i')
+        self._expected: array = array('b')
+        # Flattened (package, runner, outcome bits) triples
+        self._results: array = array('i')
+        # Flattened metrics in the same order as the results
+        self._metrics: array = array('d')
+        # Flattened (package, runner, rule, level) quads
+        self._hits: array = array('i')
+
+    def add(self, spec_id: str, test_case_id: str, package: CorpusPackage, results: List[CorpusTestResult]) -> None:
+        """Add a package and its test results as a row of the matrix."""
+        row: int = len(self.packages)
+        self.packages.append(f"{spec_id}/{test_case_id}/{package.name}")
+        self._package_spec.append(self._index(self._spec_index, self.specifications, spec_id))
+        self._expected.append(package.is_valid)
+        for result in results:
+            runner: int = self._index(self._runner_index, self.runners, runner_label(result))
+            bits: int = 1 << Outcome.TESTED
+            bits |= result.is_valid << Outcome.VALID
+            bits |= result.contains_code << Outcome.CONTAINS_CODE
+            bits |= (result.ret_code != 0) << Outcome.FAILED
+            bits |= result.timed_out << Outcome.TIMED_OUT
+            self._results.extend((row, runner, bits))
+            self._metrics.extend((result.duration, result.resources.cpu_time, result.resources.max_rss))
+            for rule_id, level in result.error_ids.items():
+                rule: int = self._index(self._rule_index, self.rule_ids, rule_id)
+                self._hits.extend((row, runner, rule, LEVEL_CODES.get(level, 1)))
+
+    def build(self) -> 'ConformanceMatrix':
+        """Build the dense conformance matrix from the rows collected so far."""
+        results: np.ndarray = np.frombuffer(self._results, dtype=np.int32).reshape(-1, 3)
+        outcomes: np.ndarray = np.zeros((len(self.packages), len(self.runners), len(Outcome)), dtype=bool)
+        bits: np.ndarray = (results[:, 2:3] >> np.arange(len(Outcome))) & 1
+        outcomes[results[:, 0], results[:, 1]] = bits.astype(bool)
+        metrics: np.ndarray = np.full((len(self.packages), len(self.runners), len(Metric)), np.nan)
+        metrics[results[:, 0], results[:, 1]] = np.frombuffer(self._metrics, dtype=np.float64).reshape(-1, len(Metric))
+        hits: np.ndarray = np.frombuffer(self._hits, dtype=np.int32).reshape(-1, 4)
+        return ConformanceMatrix(
+            packages=np.array(self.packages, dtype=str),
+            specifications=np.array(self.specifications, dtype=str),
+            package_spec=np.frombuffer(self._package_spec, dtype=np.int32).copy(),
+            runners=np.array(self.runners, dtype=str),
+            rule_ids=np.array(self.rule_ids, dtype=str),
+            expected=np.frombuffer(self._expected, dtype=np.int8).astype(bool),
+            outcomes=outcomes,
+            metrics=metrics,
+            hits=hits.copy(),
+        )
+
+    @staticmethod
+    def _index(index: Dict[str, int], labels: List[str], label: str) -> int:
+        if label not in index:
+            index[label] = len(labels)
+            labels.append(label)
+        return index[label]
+
+class ConformanceMatrix:
+    """Packages x runners x outcome matrix of test results, with a matching
+    packages x runners x metric matrix, NaN where untested, and a sparse
+    packages x rule ID hit matrix stored as (package, runner, rule, level)
+    coordinates."""
+    def __init__(self, packages: np.ndarray, specifications: np.ndarray, package_spec: np.ndarray,
+                 runners: np.ndarray, rule_ids: np.ndarray, expected: np.ndarray,
+                 outcomes: np.ndarray, metrics: np.ndarray, hits: np.ndarray):
+        self.packages: np.ndarray = packages
+        self.specifications: np.ndarray = specifications
+        self.package_spec: np.ndarray = package_spec
+        self.runners: np.ndarray = runners
+        self.rule_ids: np.ndarray = rule_ids
+        self.expected: np.ndarray = expected
+        self.outcomes: np.ndarray = outcomes
+        self.metrics: np.ndarray = metrics
+        self.hits: np.ndarray = hits
+
+    def spec_mask(self, spec_id: Optional[str] = None) -> np.ndarray:
+        """Get a boolean mask of the package rows for a specification, or all rows."""
+        if spec_id is None:
+            return np.ones(len(self.packages), dtype=bool)
+        matches: np.ndarray = np.flatnonzero(self.specifications == spec_id)
+        return np.isin(self.package_spec, matches)
+
+    def counts(self, spec_id: Optional[str] = None) -> ResultCounts:
+        """Summarise the matrix, or the rows for a specification, as result counts."""
+        mask: np.ndarray = self.spec_mask(spec_id)
+        tested: np.ndarray = self.outcomes[mask, :, Outcome.TESTED]
+        valid: np.ndarray = self.outcomes[mask, :, Outcome.VALID] & tested
+        expected: np.ndarray = self.expected[mask, np.newaxis]
+        per_runner: Dict[str, np.ndarray] = {
+            'results': tested.sum(axis=0),
+            'valid': valid.sum(axis=0),
+            'agreed': (tested & (valid == expected)).sum(axis=0),
+            'false_positives': (tested & expected & ~valid).sum(axis=0),
+            'false_negatives': (tested & ~expected & valid).sum(axis=0),
+            'contains_code': (self.outcomes[mask, :, Outcome.CONTAINS_CODE] & tested).sum(axis=0),
+            'timed_out': (self._outcome(Outcome.TIMED_OUT)[mask] & tested).sum(axis=0),
+        }
+        metrics: np.ndarray = self.metrics[mask]
+        per_runner_metrics: Dict[str, np.ndarray] = {
+            'duration': np.nansum(metrics[:, :, Metric.DURATION], axis=0),
+            'cpu_time': np.nansum(metrics[:, :, Metric.CPU_TIME], axis=0),
+            'max_rss': np.nanmax(metrics[:, :, Metric.MAX_RSS], axis=0, initial=0),
+        }
+        runners: Dict[str, ResultCounts] = {}
+        for index, runner in enumerate(self.runners):
+            if per_runner['results'][index] > 0:
+                runners[str(runner)] = ResultCounts(
+                    packages=int(mask.sum()),
+                    tested_packages=int(tested[:, index].sum()),
+                    max_rss=int(per_runner_metrics['max_rss'][index]),
+                    duration=float(per_runner_metrics['duration'][index]),
+                    cpu_time=float(per_runner_metrics['cpu_time'][index]),
+                    **{ name: int(values[index]) for name, values in per_runner.items() })
+        return ResultCounts(
+            packages=int(mask.sum()),
+            tested_packages=int(tested.any(axis=1).sum()),
+            runners=runners,
+            duration=float(per_runner_metrics['duration'].sum()),
+            cpu_time=float(per_runner_metrics['cpu_time'].sum()),
+            max_rss=int(per_runner_metrics['max_rss'].max(initial=0)),
+            **{ name: int(values.sum()) for name, values in per_runner.items() })
+
+    def _outcome(self, outcome: Outcome) -> np.ndarray:
+        """A packages x runners slice of the outcomes, all False for an outcome an older export lacks."""
+        if outcome < self.outcomes.shape[2]:
+            return self.outcomes[:, :, outcome]
+        return np.zeros(self.outcomes.shape[:2], dtype=bool)
+
+    def version_differences(self, spec_id: Optional[str] = None) -> List[VersionDifferences]:
+        """Compare the versions of every runner tested in more than one version,
+        listing the packages where the versions that tested it disagree on validity."""
+        columns: Dict[str, List[int]] = {}
+        for index, runner in enumerate(self.runners):
+            columns.setdefault(split_runner_label(str(runner))[0], []).append(index)
+        mask: np.ndarray = self.spec_mask(spec_id)
+        rows: np.ndarray = np.flatnonzero(mask)
+        counts: ResultCounts = self.counts(spec_id)
+        differences: List[VersionDifferences] = []
+        for name, indexes in sorted(columns.items()):
+            if len(indexes) < 2:
+                continue
+            indexes = sorted(indexes, key=lambda index: version_key(split_runner_label(str(self.runners[index]))[1]))
+            tested: np.ndarray = self.outcomes[mask][:, indexes, Outcome.TESTED]
+            valid: np.ndarray = self.outcomes[mask][:, indexes, Outcome.VALID]
+            disagree: np.ndarray = (tested & valid).any(axis=1) & (tested & ~valid).any(axis=1)
+            differences.append(VersionDifferences(
+                name=name,
+                versions=[split_runner_label(str(self.runners[index]))[1] for index in indexes],
+                counts=[counts.runners.get(str(self.runners[index]), ResultCounts()) for index in indexes],
+                packages=[(str(self.packages[rows[row]]), bool(self.expected[rows[row]]),
+                           [bool(valid[row, column]) if tested[row, column] else None
+                            for column in range(len(indexes))])
+                          for row in np.flatnonzero(disagree)],
+            ))
+        return differences
+
+    def rule_hits(self, spec_id: Optional[str] = None) -> Dict[str, int]:
+        """Count the number of distinct packages that reported each rule ID."""
+        hits: np.ndarray = self.hits[self.spec_mask(spec_id)[self.hits[:, 0]]]
+        pairs: np.ndarray = np.unique(hits[:, 0].astype(np.int64) * len(self.rule_ids) + hits[:, 2])
+        counts: np.ndarray = np.bincount(pairs % max(len(self.rule_ids), 1), minlength=len(self.rule_ids))
+        return { str(rule_id): int(count) for rule_id, count in zip(self.rule_ids, counts) if count > 0 }
+
+    def hit_matrix(self) -> np.ndarray:
+        """Get a dense packages x rule IDs matrix of the highest level hit, 0 for no hit."""
+        matrix: np.ndarray = np.zeros((len(self.packages), len(self.rule_ids)), dtype=np.int8)
+        # Levels are coded with ERROR lowest so the minimum non-zero code wins
+        codes: np.ndarray = np.where(self.hits[:, 3] > 0, 4 - self.hits[:, 3], 0).astype(np.int8)
+        np.maximum.at(matrix, (self.hits[:, 0], self.hits[:, 2]), codes)
+        return np.where(matrix > 0, 4 - matrix, 0).astype(np.int8)
+
+    def save(self, path: Path) -> None:
+        """Export the matrix as a compressed NumPy archive."""
+        np.savez_compressed(path, **self.__dict__)
+
+    @classmethod
+    def load(cls, path: Path) -> 'ConformanceMatrix':
+        """Load a matrix exported with save."""
+        with np.load(path) as data:
+            return cls(**{ name: data[name] for name in data.files })
+
+def runner_label(result: CorpusTestResult) -> str:
+    """Get the matrix label for the runner that produced a result."""
+    return f"{result.details.name} v{result.details.version}"
+
+def split_runner_label(label: str) -> Tuple[str, str]:
+    """Split a runner label back into the runner name and version."""
+    name, _, version = label.rpartition(' v')
+    return (name, version) if name else (label, '')
+
+def version_key(version: str) -> Tuple:
+    """Sort key that orders versions numerically, so that 2.10.0 follows 2.8.1."""
+    return tuple((0, int(part), '') if part.isdigit() else (1, 0, part)
+                 for part in re.split(r'[.\-+]', version))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting validator performance summaries
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from eark_corpora.model.matrix import ConformanceMatrix, Metric, split_runner_label, version_key
+
+HISTOGRAM_BINS: int = 12
+SLOWEST_PACKAGES: int = 10
+
+class DurationStats(BaseModel):
+    """Summary statistics for a set of validation durations, in seconds."""
+    count: int = 0
+    total: float = 0.0
+    mean: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    cpu_time: float = 0.0
+    max_rss: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Packages validated per second of validator run time."""
+        return self.count / self.total if self.total else 0.0
+
+    @classmethod
+    def from_metrics(cls, metrics: np.ndarray) -> 'DurationStats':
+        """Summarise a metrics array of shape (n, len(Metric)), ignoring untested NaN rows."""
+        metrics = metrics[~np.isnan(metrics[:, Metric.DURATION])]
+        if len(metrics) == 0:
+            return cls()
+        durations: np.ndarray = metrics[:, Metric.DURATION]
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+        return cls(count=len(durations), total=float(durations.sum()), mean=float(durations.mean()),
+                   p50=float(p50), p95=float(p95), p99=float(p99), max=float(durations.max()),
+                   cpu_time=float(metrics[:, Metric.CPU_TIME].sum()),
+                   max_rss=int(metrics[:, Metric.MAX_RSS].max()))
+
+class HistogramBin(BaseModel):
+    """A single duration histogram bin."""
+    low: float
+    high: float
+    count: int
+    fraction: float
+
+class RunnerPerformance(BaseModel):
+    """Duration profile of one runner version across the corpora."""
+    runner: str
+    name: str
+    version: str
+    overall: DurationStats
+    specifications: Dict[str, DurationStats]
+    histogram: List[HistogramBin]
+    slowest: List[Tuple[str, float]]
+
+class VersionComparison(BaseModel):
+    """Comparison of the versions of one runner, against the oldest version."""
+    name: str
+    versions: List[RunnerPerformance]
+    # Median per package duration ratio against the oldest version, for packages both tested
+    ratios: Dict[str, Optional[float]]
+
+def runner_performance(matrix: ConformanceMatrix) -> List[RunnerPerformance]:
+    """Get the duration profile of every runner in the matrix."""
+    durations: np.ndarray = matrix.metrics[:, :, Metric.DURATION]
+    tested: np.ndarray = durations[~np.isnan(durations)]
+    edges: np.ndarray = _bin_edges(tested)
+    performance: List[RunnerPerformance] = []
+    for index, runner in enumerate(matrix.runners):
+        runner_durations: np.ndarray = durations[:, index]
+        counts, _ = np.histogram(runner_durations[~np.isnan(runner_durations)], bins=edges)
+        total: int = max(int(counts.sum()), 1)
+        # NaN sorts last, so the untested packages fall off the end
+        order: np.ndarray = np.argsort(-np.nan_to_num(runner_durations, nan=-1.0))[:SLOWEST_PACKAGES]
+        name, version = split_runner_label(str(runner))
+        performance.append(RunnerPerformance(
+            runner=str(runner),
+            name=name,
+            version=version,
+            overall=DurationStats.from_metrics(matrix.metrics[:, index]),
+            specifications={
+                str(spec_id): DurationStats.from_metrics(matrix.metrics[matrix.spec_mask(str(spec_id)), index])
+                for spec_id in matrix.specifications
+            },
+            histogram=[HistogramBin(low=float(low), high=float(high), count=int(count), fraction=count / total)
+                       for low, high, count in zip(edges[:-1], edges[1:], counts)],
+            slowest=[(str(matrix.packages[row]), float(runner_durations[row]))
+                     for row in order if not np.isnan(runner_durations[row])],
+        ))
+    return performance
+
+def version_comparisons(matrix: ConformanceMatrix, performance: List[RunnerPerformance]) -> List[VersionComparison]:
+    """Group the runner profiles by runner name and compare the versions of each."""
+    by_name: Dict[str, List[int]] = {}
+    for index, runner in enumerate(performance):
+        by_name.setdefault(runner.name, []).append(index)
+    comparisons: List[VersionComparison] = []
+    for name, indexes in by_name.items():
+        # The matrix columns follow the order results were seen, so put the oldest version first
+        indexes = sorted(indexes, key=lambda index: version_key(performance[index].version))
+        durations: np.ndarray = matrix.metrics[:, indexes, Metric.DURATION]
+        ratios: Dict[str, Optional[float]] = {}
+        for column, index in enumerate(indexes):
+            both: np.ndarray = ~np.isnan(durations[:, 0]) & ~np.isnan(durations[:, column]) & (durations[:, 0] > 0)
+            ratios[performance[index].version] = (
+                float(np.median(durations[both, column] / durations[both, 0])) if both.any() else None)
+        comparisons.append(VersionComparison(name=name, versions=[performance[index] for index in indexes], ratios=ratios))
+    return comparisons
+
+def _bin_edges(durations: np.ndarray) -> np.ndarray:
+    """Shared logarithmic bin edges so that runner histograms are comparable."""
+    if len(durations) == 0:
+        return np.linspace(0.0, 1.0, HISTOGRAM_BINS + 1)
+    low: float = max(float(durations.min()), 0.001)
+    high: float = max(float(durations.max()), low * 2)
+    edges: np.ndarray = np.geomspace(low, high, HISTOGRAM_BINS + 1)
+    edges[0] = min(edges[0], float(durations.min()))
+    return edges
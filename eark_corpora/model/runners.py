@@ -25,7 +25,7 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -35,28 +35,67 @@ class RunnerDetails(BaseModel):
     name: str # Name of the runner
     version: str # Version of the runner
     URL: str # URL for the runner documentation or homepage
+    kind: Optional[str] = None # Output format of the runner, e.g. commons-ip, defaults to the id
+
+    @property
+    def report_kind(self) -> str:
+        """The output format of the runner."""
+        return self.kind or self.id
+
+class RunnerResources(BaseModel):
+    """Resources a runner's process is expected to use, for admission control."""
+    memory: int = 0 # Expected peak resident set size in MiB, 0 if unknown
+    threads: int = 1 # Cores the process keeps busy
+    memory_limit: Optional[int] = None # Address space limit for the process in MiB, none if unset
 
 class Runner(BaseModel):
     """Package class for testing purposes."""
     details: RunnerDetails
     commands: Dict[str, List[str]] = {}
+    resources: RunnerResources = RunnerResources()
+    timeout: float = 60 # Seconds a validation may run before its process group is stopped
+
+class ResourceUsage(BaseModel):
+    """Resources used by a runner's child process, from the child's rusage."""
+    user_time: float = 0.0 # User CPU time in seconds
+    system_time: float = 0.0 # System CPU time in seconds
+    max_rss: int = 0 # Peak resident set size in KiB
+    read_blocks: int = 0 # Block input operations
+    write_blocks: int = 0 # Block output operations
+
+    @property
+    def cpu_time(self) -> float:
+        """Total CPU time, user and system, in seconds."""
+        return self.user_time + self.system_time
 
 class ProcessResult:
     """Package result class."""
-    def __init__(self, runner_details: RunnerDetails, retcode: int, stdout: str, stderr: str, duration:float, exception: Exception = None, timestamp: str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')):
+    def __init__(self, runner_details: RunnerDetails, retcode: int, stdout: str, stderr: str, duration:float, exception: Exception = None, timestamp: str = None, resources: ResourceUsage = None, timed_out: bool = False):
         self.runner_details: RunnerDetails = runner_details
-        self.timestamp: str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.timestamp: str = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.retcode: int = retcode
         self.stdout: str = stdout
         self.stderr: str = stderr
         self.duration: float = duration
         self.exception: Exception = exception
+        self.resources: ResourceUsage = resources or ResourceUsage()
+        self.timed_out: bool = timed_out # Killed at the runner's timeout, the output is partial
 
     def __repr__(self):
         return f"PackageResult(package_name={self.package_name}, test_case_id={self.test_case_id}, retcode={self.retcode})"
 
     def toJson(self):
-        return json.dumps(self, default=lambda o: o.__dict__).replace('\\n', '').replace('\\"', '"').replace('\\\\"', "'").replace('"{', '{').replace('}"', '}')
+        """Serialise the result, embedding the runner's output as a JSON object when it
+        is one, and as a string otherwise, e.g. the partial output of a timed out run."""
+        data: Dict = dict(self.__dict__)
+        if isinstance(self.stdout, str):
+            try:
+                report = json.loads(self.stdout)
+                if isinstance(report, dict):
+                    data['stdout'] = report
+            except json.JSONDecodeError:
+                pass
+        return json.dumps(data, default=lambda o: o.__dict__)
     
     @classmethod
     def from_file(cls, file_path: Path):
@@ -66,6 +105,8 @@ class ProcessResult:
                 data = json.load(f)
                 runner_details: RunnerDetails = RunnerDetails(**data['runner_details'])
                 data['runner_details'] = runner_details
+                if isinstance(data.get('resources'), dict):
+                    data['resources'] = ResourceUsage(**data['resources'])
                 return cls(**data)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading ProcessResult from {file_path}: {e}")
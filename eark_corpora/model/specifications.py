@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting cache of the parsed E-ARK specifications
+
+Parsing a specification profile validates its XML against the METS profile
+schema, so the parsed model is cached on disk, keyed by the eark-validator
+version and the digest of the profile, with the set of its requirement IDs.
+"""
+import hashlib
+import importlib.metadata
+import os
+import tempfile
+from functools import lru_cache
+from importlib.resources import files
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from eark_validator.model.specifications import Specification
+from eark_validator.specifications.specification import EarkSpecification, SpecificationType, SpecificationVersion
+
+from eark_corpora.loader import get_config
+
+class CachedSpecification(BaseModel):
+    """A parsed specification and its requirement IDs, as cached on disk."""
+    validator_version: str
+    digest: str # SHA-256 digest of the specification profile
+    specification: Specification
+    requirement_ids: List[str]
+
+# Requirement IDs by specification ID, for the specifications loaded so far
+_requirement_ids: Dict[str, FrozenSet[str]] = {}
+
+@lru_cache(maxsize=None)
+def load_specification(spec_type: SpecificationType, version: SpecificationVersion) -> Specification:
+    """Load a specification from the cache, parsing its profile if it isn't cached."""
+    profile: Path = Path(str(files('eark_validator.ipxml.resources.profiles') / version / (spec_type + '.xml')))
+    validator_version: str = importlib.metadata.version('eark-validator')
+    digest: str = hashlib.sha256(profile.read_bytes()).hexdigest()
+    cache_path: Path = (Path(get_config().specification_cache).expanduser() /
+                        f"{spec_type.name}-{version}-{validator_version}-{digest[:16]}.json")
+    cached: Optional[CachedSpecification] = _read(cache_path)
+    if cached is None or cached.digest != digest or cached.validator_version != validator_version:
+        specification: Specification = EarkSpecification(spec_type, version).specification
+        cached = CachedSpecification(validator_version=validator_version, digest=digest,
+                                     specification=specification,
+                                     requirement_ids=sorted(_collect_requirement_ids(specification)))
+        _write(cache_path, cached)
+    _requirement_ids[cached.specification.id] = frozenset(cached.requirement_ids)
+    return cached.specification
+
+def requirement_ids(specification: Specification) -> FrozenSet[str]:
+    """The IDs of a specification's requirements, structural requirements included."""
+    if specification.id not in _requirement_ids:
+        _requirement_ids[specification.id] = frozenset(_collect_requirement_ids(specification))
+    return _requirement_ids[specification.id]
+
+def _collect_requirement_ids(specification: Specification) -> FrozenSet[str]:
+    ids: set[str] = set()
+    for requirements in specification.requirements.values():
+        for requirement in requirements:
+            assert requirement.id not in ids, f"Duplicate requirement ID: {requirement.id}"
+            ids.add(requirement.id)
+    for requirement in specification.structural_requirements:
+        assert requirement.id not in ids, f"Duplicate requirement ID: {requirement.id}"
+        ids.add(requirement.id)
+    return frozenset(ids)
+
+def _read(path: Path) -> Optional[CachedSpecification]:
+    """Read a cached specification, None if it is missing or unreadable."""
+    try:
+        return CachedSpecification.model_validate_json(path.read_bytes())
+    except (OSError, ValidationError, ValueError):
+        return None
+
+def _write(path: Path, cached: CachedSpecification) -> None:
+    """Write a cached specification atomically, the cache is only an optimisation so failures are ignored."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(cached.model_dump_json())
+        os.replace(temp_name, path)
+    except OSError:
+        Path(temp_name).unlink(missing_ok=True)
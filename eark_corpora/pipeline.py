@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Single process pipeline that validates and renders in one pass.
+
+        The corpus is loaded once and the validators run on a thread pool.
+        Each result is written to the results directory as eark-runner
+        would, and is handed straight to the report rather than being read
+        back. A test case's pages are rendered as soon as every runner has
+        finished with its packages, while later packages are validated.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from eark_corpora import profiling, selection
+from eark_corpora.tester import admission
+from eark_corpora.cli import app as reporter
+from eark_corpora.loader import get_corpora, get_package_results
+from eark_corpora.selection import Selection
+
+if TYPE_CHECKING:
+    from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusTestCase
+    from eark_corpora.model.export import ResultExport
+    from eark_corpora.model.index import RuleIndex
+    from eark_corpora.model.matrix import MatrixBuilder
+    from eark_corpora.model.runners import ProcessResult, Runner
+    from eark_corpora.tester.jobs import Job
+    from eark_corpora.tester.journal import Journal
+
+# Create PARSER
+PARSER = argparse.ArgumentParser(prog='eark-pipeline',
+                                 description="""E-ARK Corpus Pipeline
+validates the corpus packages and renders the report site in a single pass.""",
+                                 epilog=reporter.defaults['epilog'])
+
+def parse_command_line():
+    """Parse command line arguments."""
+    PARSER.add_argument('--version',
+                        action='version',
+                        version=reporter.get_version())
+    PARSER.add_argument('--clear',
+                        action='store_true',
+                        dest='clear',
+                        default=False,
+                        help='Clear the results directory before running.')
+    PARSER.add_argument('--jobs',
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help='Number of validator processes to run at once, defaults to the CPU count.')
+    PARSER.add_argument('--export-matrix',
+                        type=Path,
+                        dest='matrix_path',
+                        default=None,
+                        help='Export the conformance matrix to a compressed NumPy (.npz) file.')
+    reporter.add_export_arguments(PARSER)
+    reporter.add_render_arguments(PARSER)
+    PARSER.add_argument('--watch',
+                        action='store_true',
+                        default=False,
+                        help='After the run, watch the corpus and re-validate and re-render whatever changes.')
+    PARSER.add_argument('--poll',
+                        action='store_true',
+                        default=False,
+                        help='Watch by polling file modification times rather than with inotify.')
+    PARSER.add_argument('--poll-interval',
+                        type=float,
+                        default=1.0,
+                        metavar='SECONDS',
+                        help='Seconds between polls of the corpus when watching, defaults to 1.')
+    selection.add_arguments(PARSER, runners=True)
+    admission.add_arguments(PARSER)
+    profiling.add_arguments(PARSER)
+    args = PARSER.parse_args()
+    if args.clear and not Selection.from_args(args).everything:
+        PARSER.error('--clear removes every result and cannot be used with a selection.')
+    if args.watch and not Selection.from_args(args).everything:
+        PARSER.error('--watch re-renders the summary pages and cannot be used with a selection.')
+    return args
+
+def run_pipeline(selected: Selection = Selection(), jobs: int = 1, matrix_path: Path = None,
+                 export: Optional[ResultExport] = None) -> None:
+    """Validate the selected packages and render their pages as each test case completes."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from eark_corpora.model.coverage import coverage_path
+    from eark_corpora.model.index import RuleIndex
+    from eark_corpora.model.matrix import MatrixBuilder
+    from eark_corpora.tester.jobs import Job, ingest, package_rows, report, result_name
+    from eark_corpora.tester.journal import Journal
+    from eark_corpora.tester.utils import get_runners
+
+    corpora = get_corpora(selected)
+    runners: Dict[str, Runner] = get_runners(selected)
+    # Plan the jobs for the packages with a directory, keeping the models each job's result belongs to
+    cases: Dict[Tuple[str, str], Tuple[Corpus, CorpusTestCase, List[CorpusPackage]]] = {}
+    pending: Dict[Tuple[str, str], int] = {}
+    planned: List[Tuple[Job, CorpusPackage]] = []
+    for corpus, test_case, _, package, path in package_rows(corpora.values(), selected):
+        case_key: Tuple[str, str] = (corpus.specification.id, str(test_case.id))
+        cases.setdefault(case_key, (corpus, test_case, []))[2].append(package)
+        for runner_id in runners:
+            planned.append((Job(spec_id=case_key[0], test_case_id=case_key[1], package=package.name,
+                                path=path, runner_id=runner_id), package))
+            pending[case_key] = pending.get(case_key, 0) + 1
+    if selected.everything:
+        # The results will be complete, so they are no longer a sample
+        coverage_path.unlink(missing_ok=True)
+        reporter.setup_reports()
+
+    builder: MatrixBuilder = MatrixBuilder()
+    rule_index: RuleIndex = RuleIndex()
+    # Test cases without any jobs to wait for can be rendered straight away, those whose
+    # selected packages no runner validates as well as those without packages to validate
+    for corpus in corpora.values():
+        for test_case in corpus.test_cases:
+            case_key = (corpus.specification.id, str(test_case.id))
+            if pending.get(case_key):
+                continue
+            if case_key in cases:
+                _output_case(*cases[case_key], builder, rule_index, export, selected.everything)
+            elif selected.everything:
+                _output_case(corpus, test_case, [], builder, rule_index, export)
+
+    with Journal() as journal, ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        journal.planned([job for job, _ in planned])
+        futures = { executor.submit(_run_job, journal, runners[job.runner_id], job): (job, package)
+                    for job, package in planned }
+        try:
+            for future in as_completed(futures):
+                job, package = futures.pop(future)
+                result: ProcessResult = future.result()
+                # Persist the result on the side, then use its summary directly rather than reading it back
+                package.test_results.append(ingest(job, result))
+                journal.finished(job, result_name(result.runner_details), result.retcode)
+                report(job, result.runner_details.name, result.retcode)
+                case_key = (job.spec_id, job.test_case_id)
+                pending[case_key] -= 1
+                if pending[case_key] == 0:
+                    _output_case(*cases[case_key], builder, rule_index, export, selected.everything)
+        except BaseException:
+            # Don't start the queued jobs after an interrupt or error
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    if selected.everything:
+        reporter.output_summaries(corpora, builder, rule_index, matrix_path)
+    else:
+        print(f"Rendered {len(builder.packages)} packages, the home, corpus, rules and performance pages are unchanged.")
+
+def _run_job(journal: Journal, runner: Runner, job: Job) -> ProcessResult:
+    from eark_corpora.tester.jobs import run_job
+    journal.started(job)
+    return run_job(runner, job.package_path)
+
+def _output_case(corpus: Corpus, test_case: CorpusTestCase, validated: List[CorpusPackage], builder: MatrixBuilder,
+                 rule_index: RuleIndex, export: Optional[ResultExport] = None, everything: bool = True):
+    """Render a completed test case and release its results.
+
+    The results of the packages and runners that weren't validated in this run are
+    loaded from the results directory, as eark-corpora would. A full run renders every
+    package of the test case, a selective run only the packages it validated."""
+    from eark_corpora.tester.jobs import result_name
+    try:
+        for package in test_case.packages:
+            validated_names: Set[str] = { result_name(result.details) for result in package.test_results }
+            package.test_results.extend(
+                result for result in get_package_results(package, str(test_case.id), corpus.specification.id,
+                                                         verbose=False)
+                if result_name(result.details) not in validated_names)
+            # Results arrive in completion order, list them in a stable order
+            package.test_results.sort(key=lambda result: result.details.id)
+        reporter.output_case_results(test_case, corpus, builder, rule_index,
+                                     test_case.packages if everything else validated, export)
+    finally:
+        for package in test_case.packages:
+            package.test_results = []
+
+def main():
+    """Main command line application."""
+    _exit: int = 0
+    args = parse_command_line()
+    profiling.start(args)
+    admission.configure(args)
+    reporter.configure_rendering(args)
+    from eark_corpora.tester.processrunner import install_interrupt_handler
+    install_interrupt_handler()
+    export: Optional[ResultExport] = None
+    try:
+        selected: Selection = Selection.from_args(args)
+        if args.clear:
+            from eark_corpora.tester.app import clear_results
+            clear_results()
+        export = reporter.open_export(args)
+        run_pipeline(selected, args.jobs, args.matrix_path, export)
+        if not args.watch:
+            reporter.finish_rendering(prune=selected.everything)
+        if export:
+            # Close the export before watching, the watcher doesn't add to it
+            export.close()
+        if args.watch:
+            from eark_corpora.tester.utils import get_runners
+            from eark_corpora.watch import watch
+            watch(get_corpora(selected), get_runners(selected), args.jobs, args.poll, args.poll_interval)
+    finally:
+        if export:
+            export.close()
+        reporter.finish_rendering()
+        profiling.finish(args)
+    sys.exit(_exit)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting per phase timing and profiling
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator
+
+@dataclass
+class PhaseStats:
+    """Accumulated timings for a named phase, phases may nest."""
+    wall: float = 0.0
+    cpu: float = 0.0
+    count: int = 0
+
+class Profiler:
+    """Records wall and CPU time per phase, and optionally a cProfile of the whole run."""
+    def __init__(self):
+        self.enabled: bool = False
+        self.phases: Dict[str, PhaseStats] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._profile = None
+        self._start: float = 0.0
+        self._start_cpu: float = 0.0
+
+    def start(self, cprofile: bool = False) -> None:
+        """Start recording phases, and a cProfile if requested."""
+        self.enabled = True
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if cprofile:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop recording and total the run as the 'total' phase."""
+        if self._profile is not None:
+            self._profile.disable()
+        self.add('total', time.perf_counter() - self._start, time.process_time() - self._start_cpu)
+        self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase, does nothing unless profiling is enabled."""
+        if not self.enabled:
+            yield
+            return
+        start: float = time.perf_counter()
+        # Thread CPU time so phases timed on worker threads don't count each other
+        start_cpu: float = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, time.thread_time() - start_cpu)
+
+    def add(self, name: str, wall: float, cpu: float, count: int = 1) -> None:
+        """Add a measurement to a phase, for times measured elsewhere such as child processes."""
+        with self._lock:
+            stats: PhaseStats = self.phases.setdefault(name, PhaseStats())
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.count += count
+
+    def summary(self) -> Dict[str, Dict]:
+        """Get the machine readable timing summary."""
+        return { name: asdict(stats) for name, stats in sorted(self.phases.items()) }
+
+    def report(self) -> str:
+        """Get a human readable timing table, slowest phases first."""
+        lines = [f"{'Phase':<40} {'Count':>8} {'Wall (s)':>10} {'CPU (s)':>10} {'Mean (ms)':>10}"]
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].wall):
+            mean: float = stats.wall / stats.count * 1000 if stats.count else 0.0
+            lines.append(f"{name:<40} {stats.count:>8} {stats.wall:>10.3f} {stats.cpu:>10.3f} {mean:>10.1f}")
+        return '\n'.join(lines)
+
+    def save(self, path: Path) -> None:
+        """Save the timing summary as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def dump(self, path: Path) -> None:
+        """Dump the cProfile statistics, readable by pstats, snakeviz or flameprof."""
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+
+PROFILER: Profiler = Profiler()
+
+def phase(name: str):
+    """Time a phase with the global profiler."""
+    return PROFILER.phase(name)
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the profiling options to a command line parser."""
+    parser.add_argument('--profile',
+                        action='store_true',
+                        dest='profile',
+                        default=False,
+                        help='Record and print wall time, CPU time and counts for each phase of the run.')
+    parser.add_argument('--profile-json',
+                        type=Path,
+                        dest='profile_json',
+                        default=None,
+                        help='Write the per phase timing summary to a JSON file, implies --profile.')
+    parser.add_argument('--profile-dump',
+                        type=Path,
+                        dest='profile_dump',
+                        default=None,
+                        help='Write a cProfile dump of the run for pstats, snakeviz or flameprof, implies --profile.')
+
+def start(args: argparse.Namespace) -> None:
+    """Start the global profiler if any profiling option was given."""
+    if args.profile or args.profile_json or args.profile_dump:
+        PROFILER.start(cprofile=args.profile_dump is not None)
+
+def finish(args: argparse.Namespace) -> None:
+    """Stop the global profiler and write the requested outputs."""
+    if not PROFILER.enabled:
+        return
+    PROFILER.stop()
+    print(PROFILER.report(), file=sys.stderr)
+    if args.profile_json:
+        PROFILER.save(args.profile_json)
+    if args.profile_dump:
+        PROFILER.dump(args.profile_dump)
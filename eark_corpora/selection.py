@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Selection of the specifications, test cases, packages and runners to process.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult
+
+SPECIFICATIONS: Tuple[str, ...] = ('CSIP', 'SIP', 'DIP')
+
+@dataclass(frozen=True)
+class Selection:
+    """Filters that prune a run before anything is loaded, an empty filter selects everything."""
+    specs: Tuple[str, ...] = () # Specification IDs
+    test_cases: Tuple[str, ...] = () # Test case ID glob patterns
+    packages: Tuple[str, ...] = () # Package name glob patterns
+    runners: Tuple[str, ...] = () # Runner IDs, or ID@VERSION for a single version of a runner
+    disagree: bool = False # Only packages where a last result disagrees with the expected validity
+
+    @property
+    def everything(self) -> bool:
+        """True if nothing is filtered out."""
+        return self == Selection()
+
+    def spec(self, spec_id: str) -> bool:
+        """Is a specification selected."""
+        return not self.specs or spec_id in self.specs
+
+    def test_case(self, test_case_id: str) -> bool:
+        """Is a test case selected."""
+        return not self.test_cases or any(fnmatchcase(test_case_id, pattern) for pattern in self.test_cases)
+
+    def package(self, name: str) -> bool:
+        """Is a package selected by name, see disagrees for the disagree filter."""
+        return not self.packages or any(fnmatchcase(name, pattern) for pattern in self.packages)
+
+    def runner(self, runner_id: str) -> bool:
+        """Is a runner, or a version of a runner given as ID@VERSION, selected."""
+        return not self.runners or runner_id in self.runners or runner_id.partition('@')[0] in self.runners
+
+    def runner_versions(self, runner_id: str) -> bool:
+        """Are any single versions of a runner selected."""
+        return any(name == runner_id and version
+                   for name, _, version in (selected.partition('@') for selected in self.runners))
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Selection:
+        """Create a selection from the arguments added by add_arguments."""
+        return cls(specs=tuple(args.specs or ()), test_cases=tuple(args.test_cases or ()),
+                   packages=tuple(args.packages or ()), runners=tuple(getattr(args, 'runners', None) or ()),
+                   disagree=args.disagree)
+
+def disagrees(package: CorpusPackage, results: Iterable[CorpusTestResult]) -> bool:
+    """True if any result's validity differs from the package's expected validity."""
+    return any(result.is_valid != package.is_valid for result in results)
+
+def add_arguments(parser: argparse.ArgumentParser, runners: bool = False) -> None:
+    """Add the selection options to a command line parser, with the runner filter if asked."""
+    group = parser.add_argument_group('selection', 'Limit the run, repeat an option to select several values.')
+    group.add_argument('--spec', action='append', dest='specs', choices=SPECIFICATIONS,
+                       help='Only process a specification.')
+    group.add_argument('--test-case', action='append', dest='test_cases', metavar='GLOB',
+                       help='Only process test cases with IDs matching a glob pattern, e.g. CSIP1*.')
+    group.add_argument('--package', action='append', dest='packages', metavar='GLOB',
+                       help='Only process packages with names matching a glob pattern.')
+    if runners:
+        group.add_argument('--runner', action='append', dest='runners', metavar='ID',
+                           help='Only run the runner with this ID, or ID@VERSION for one of its versions.')
+    group.add_argument('--disagree', action='store_true', default=False,
+                       help='Only process packages whose last results disagree with their expected validity.')
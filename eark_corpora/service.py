@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Local HTTP service that validates packages on demand.
+
+        The runner configuration is loaded and each runner's version probed
+        once at startup, the corpus is loaded on the first request that
+        names a test case. Every runner has its own pool of worker threads
+        so that a slow validator doesn't hold up the others. Results are
+        cached by the digest of the package contents and the runner ID and
+        version, in memory and under the results directory, so an unchanged
+        package is only ever validated once per runner version.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from eark_corpora.cli import app as reporter
+from eark_corpora.loader import corpus_root, results_root
+from eark_corpora.tester import admission
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult
+    from eark_corpora.model.runners import ProcessResult, Runner
+
+cache_root: Path = results_root / 'cache'
+
+# Create PARSER
+PARSER = argparse.ArgumentParser(prog='eark-service',
+                                 description="""E-ARK Validation Service
+validates packages on demand over HTTP, caching the results by package contents.""",
+                                 epilog=reporter.defaults['epilog'])
+
+def parse_command_line():
+    """Parse command line arguments."""
+    PARSER.add_argument('--version',
+                        action='version',
+                        version=reporter.get_version())
+    PARSER.add_argument('--address',
+                        default='127.0.0.1:7322',
+                        metavar='HOST:PORT',
+                        help='Address to listen on, defaults to 127.0.0.1:7322.')
+    PARSER.add_argument('--workers',
+                        type=int,
+                        default=max((os.cpu_count() or 1) // 2, 1),
+                        help='Number of packages each runner validates at once, defaults to half the CPU count.')
+    PARSER.add_argument('--no-disk-cache',
+                        action='store_false',
+                        dest='disk_cache',
+                        default=True,
+                        help=f'Only cache results in memory, not under {cache_root}.')
+    admission.add_arguments(PARSER)
+    return PARSER.parse_args()
+
+def package_digest(path: Path) -> str:
+    """SHA-256 digest of a package's file names and contents, a file or a directory tree."""
+    digest = hashlib.sha256()
+    files: List[Path] = [path] if path.is_file() else sorted(file for file in path.rglob('*') if file.is_file())
+    for file in files:
+        digest.update(file.relative_to(path).as_posix().encode('utf-8') if file != path else b'')
+        digest.update(b'\0')
+        with open(file, 'rb') as f:
+            digest.update(hashlib.file_digest(f, 'sha256').digest())
+    return digest.hexdigest()
+
+class ResultCache:
+    """Validation results keyed by package digest and runner, computed at most once per key."""
+    def __init__(self, root: Optional[Path] = cache_root):
+        self.root: Optional[Path] = root
+        self._results: Dict[Tuple[str, str], ProcessResult] = {}
+        self._running: Dict[Tuple[str, str], Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def submit(self, digest: str, name: str, pool: ThreadPoolExecutor, validate) -> Tuple[Future, bool]:
+        """A future for the result of a key and whether it was cached, running validate on the pool on a miss."""
+        from concurrent.futures import Future
+        key: Tuple[str, str] = (digest, name)
+        with self._lock:
+            if key not in self._results:
+                result: Optional[ProcessResult] = self._load(key)
+                if result is not None:
+                    self._results[key] = result
+            if key in self._results:
+                done: Future = Future()
+                done.set_result(self._results[key])
+                return done, True
+            # Share a validation already running for the same key
+            if key in self._running:
+                return self._running[key], True
+            future: Future = pool.submit(validate)
+            self._running[key] = future
+        future.add_done_callback(lambda future: self._completed(key, future))
+        return future, False
+
+    def _completed(self, key: Tuple[str, str], future: Future) -> None:
+        result: Optional[ProcessResult] = None if future.cancelled() or future.exception() else future.result()
+        # Failed runs may be transient, only successful ones are cached
+        if result is not None and result.retcode == 0:
+            self._save(key, result)
+            with self._lock:
+                self._results[key] = result
+        with self._lock:
+            self._running.pop(key, None)
+
+    def _path(self, key: Tuple[str, str]) -> Path:
+        return self.root / key[0][:2] / key[0] / (key[1] + '.json')
+
+    def _load(self, key: Tuple[str, str]) -> Optional[ProcessResult]:
+        if self.root is None or not self._path(key).is_file():
+            return None
+        from eark_corpora.model.runners import ProcessResult
+        try:
+            return ProcessResult.from_file(self._path(key))
+        except ValueError:
+            return None
+
+    def _save(self, key: Tuple[str, str], result: ProcessResult) -> None:
+        if self.root is None:
+            return
+        from eark_corpora.tester.jobs import atomic_write
+        self._path(key).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self._path(key), result.toJson())
+
+class ValidationService:
+    """Validates packages with every configured runner, each on its own worker pool."""
+    def __init__(self, runners: Dict[str, Runner], workers: int = 1, cache: ResultCache = None):
+        from concurrent.futures import ThreadPoolExecutor
+        self.runners: Dict[str, Runner] = runners
+        self.pools: Dict[str, ThreadPoolExecutor] = {
+            runner_id: ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix=runner_id)
+            for runner_id in runners }
+        self.cache: ResultCache = cache or ResultCache()
+
+    def validate(self, path: Path, test_case_id: str = '', runner_ids: List[str] = None) -> Dict:
+        """Validate a package, returning its digest and a result per runner."""
+        from eark_corpora.model.adapters import summarise
+        from eark_corpora.tester.jobs import result_name, run_job
+        digest: str = package_digest(path)
+        results: List[Dict] = []
+        pending: List[Tuple[Future, bool]] = []
+        for runner_id in runner_ids or self.runners:
+            runner: Runner = self.runners[runner_id]
+            pending.append(self.cache.submit(digest, result_name(runner.details), self.pools[runner_id],
+                                             lambda runner=runner: run_job(runner, path)))
+        for future, cached in pending:
+            result: ProcessResult = future.result()
+            test_result: CorpusTestResult = summarise(result, test_case_id)
+            results.append({ 'cached': cached, **test_result.model_dump(mode='json') })
+        return { 'path': str(path), 'digest': digest, 'results': results }
+
+    def close(self) -> None:
+        """Shut the worker pools down."""
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def packages(self, spec_id: str, test_case_id: str, package_name: str = None
+                 ) -> List[Tuple[CorpusPackage, Path]]:
+        """The existing packages of a corpus test case, or just the named one, with their paths."""
+        from eark_corpora.loader import get_corpora
+        corpus = next((corpus for corpus in get_corpora().values() if corpus.specification.id == spec_id), None)
+        if corpus is None:
+            raise LookupError(f"Unknown specification {spec_id}")
+        test_case = next((test_case for test_case in corpus.test_cases if str(test_case.id) == test_case_id), None)
+        if test_case is None:
+            raise LookupError(f"Unknown test case {spec_id}/{test_case_id}")
+        packages = [(package, corpus.path / test_case_id / package.path) for package in test_case.packages
+                    if package.has_directory and (package_name is None or package.name == package_name)]
+        if package_name is not None and not packages:
+            raise LookupError(f"Unknown package {package_name} in test case {spec_id}/{test_case_id}")
+        return packages
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes the service's requests."""
+    server: '_Server'
+
+    def do_GET(self): # pylint: disable=invalid-name
+        """GET /runners lists the runners, GET /validate takes its parameters from the query string."""
+        url = urlsplit(self.path)
+        if url.path == '/runners':
+            self._send(HTTPStatus.OK, [ runner.details.model_dump(mode='json')
+                                        for runner in self.server.service.runners.values() ])
+        elif url.path == '/validate':
+            self._validate({ key: values[-1] for key, values in parse_qs(url.query).items() })
+        else:
+            self._send(HTTPStatus.NOT_FOUND, { 'error': f"No such resource {url.path}" })
+
+    def do_POST(self): # pylint: disable=invalid-name
+        """POST /validate takes its parameters as a JSON object."""
+        if urlsplit(self.path).path != '/validate':
+            self._send(HTTPStatus.NOT_FOUND, { 'error': f"No such resource {self.path}" })
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except json.JSONDecodeError as excep:
+            self._send(HTTPStatus.BAD_REQUEST, { 'error': f"Invalid JSON: {excep}" })
+            return
+        if not isinstance(request, dict):
+            self._send(HTTPStatus.BAD_REQUEST, { 'error': 'Expected a JSON object' })
+            return
+        self._validate(request)
+
+    def _validate(self, request: Dict) -> None:
+        """Validate a package path, or the packages of a spec and test case."""
+        service: ValidationService = self.server.service
+        error: Optional[str] = _check_request(request)
+        if error:
+            self._send(HTTPStatus.BAD_REQUEST, { 'error': error })
+            return
+        runner_ids: Optional[List[str]] = request.get('runner')
+        if isinstance(runner_ids, str):
+            runner_ids = runner_ids.split(',')
+        unknown: List[str] = [runner_id for runner_id in runner_ids or [] if runner_id not in service.runners]
+        if unknown:
+            self._send(HTTPStatus.BAD_REQUEST, { 'error': f"Unknown runners {', '.join(unknown)}" })
+            return
+        try:
+            if 'path' in request:
+                path: Path = Path(request['path'])
+                if not path.exists():
+                    self._send(HTTPStatus.NOT_FOUND, { 'error': f"No such package {path}" })
+                    return
+                self._send(HTTPStatus.OK, [ service.validate(path, _requirement_id(path, request), runner_ids) ])
+            elif 'spec' in request and 'test_case' in request:
+                packages = service.packages(request['spec'], request['test_case'], request.get('package'))
+                self._send(HTTPStatus.OK, [ { 'package': package.name, 'is_valid': package.is_valid,
+                                              **service.validate(path, request['test_case'], runner_ids) }
+                                            for package, path in packages ])
+            else:
+                self._send(HTTPStatus.BAD_REQUEST, { 'error': 'Expected a path, or a spec and test_case' })
+        except LookupError as excep:
+            self._send(HTTPStatus.NOT_FOUND, { 'error': str(excep) })
+        except PermissionError as excep:
+            self._send(HTTPStatus.FORBIDDEN, { 'error': f"Cannot read the package: {excep}" })
+        except OSError as excep:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, { 'error': f"Cannot read the package: {excep}" })
+
+    def _send(self, status: HTTPStatus, body) -> None:
+        data: bytes = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        print(f"{self.address_string()} {format % args}", file=sys.stderr)
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    service: ValidationService
+
+def _check_request(request: Dict) -> Optional[str]:
+    """An error message for a request with badly typed parameters or an empty path, None if it is usable."""
+    for key in ('path', 'spec', 'test_case', 'package'):
+        if key in request and not isinstance(request[key], str):
+            return f"Expected {key} to be a string"
+    runner_ids = request.get('runner')
+    if runner_ids is not None and not isinstance(runner_ids, str) and not (
+            isinstance(runner_ids, list) and all(isinstance(runner_id, str) for runner_id in runner_ids)):
+        return 'Expected runner to be a string or a list of strings'
+    if 'path' in request and not request['path'].strip():
+        return 'Expected a package path, not an empty one'
+    return None
+
+def _requirement_id(path: Path, request: Dict) -> str:
+    """The test case ID of a request, given or from the path of a corpus package."""
+    if 'test_case' in request:
+        return request['test_case']
+    try:
+        parts = path.resolve().relative_to(corpus_root.resolve()).parts
+    except ValueError:
+        return ''
+    return parts[1] if len(parts) > 1 else ''
+
+def serve(address: Tuple[str, int], service: ValidationService) -> None:
+    """Serve validation requests until interrupted."""
+    server: _Server = _Server(address, _RequestHandler)
+    server.service = service
+    host, port = server.server_address[:2]
+    print(f"Validating with {', '.join(service.runners)} at http://{host}:{port}/, Ctrl-C to stop", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+def main():
+    """Main command line application."""
+    args = parse_command_line()
+    admission.configure(args)
+    from eark_corpora.tester.coordinator import parse_address
+    from eark_corpora.tester.processrunner import install_interrupt_handler
+    from eark_corpora.tester.utils import get_runners
+    install_interrupt_handler()
+    try:
+        address = parse_address(args.address)
+    except ValueError as excep:
+        PARSER.error(str(excep))
+    if isinstance(address, str):
+        PARSER.error('The service only listens on TCP addresses.')
+    serve(address, ValidationService(get_runners(), args.workers,
+                                     ResultCache(cache_root if args.disk_cache else None)))
+    sys.exit(0)
+
+if __name__ == '__main__':
+    main()
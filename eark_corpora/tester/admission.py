@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Admission control for validator processes.
+
+        Each runner declares the memory and cores its process is expected to
+        use. A job only starts once the declared use of the running jobs and
+        its own fits the memory and core budgets, so that parallel runs don't
+        start more JVMs than the machine can hold. Jobs are admitted in the
+        order they ask, a job too big for the budgets runs on its own.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Deque, Iterator
+
+if TYPE_CHECKING:
+    from eark_corpora.model.runners import RunnerResources
+
+class Admission:
+    """Admits jobs while their declared memory and threads fit the budgets."""
+    def __init__(self, memory: int = 0, cores: int = 0):
+        self.memory: int = memory or available_memory() # MiB
+        self.cores: int = cores or os.cpu_count() or 1
+        self.used_memory: int = 0
+        self.used_cores: int = 0
+        self.running: int = 0
+        self._waiting: Deque[object] = deque()
+        self._condition: threading.Condition = threading.Condition()
+
+    @contextmanager
+    def admit(self, resources: RunnerResources) -> Iterator[None]:
+        """Wait until a job with the declared resources fits, and hold them while it runs."""
+        threads: int = max(resources.threads, 1)
+        ticket: object = object()
+        with self._condition:
+            self._waiting.append(ticket)
+            self._condition.wait_for(lambda: self._waiting[0] is ticket and self._fits(resources.memory, threads))
+            self._waiting.popleft()
+            self.used_memory += resources.memory
+            self.used_cores += threads
+            self.running += 1
+            # The next job in line may fit alongside this one
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.used_memory -= resources.memory
+                self.used_cores -= threads
+                self.running -= 1
+                self._condition.notify_all()
+
+    def _fits(self, memory: int, threads: int) -> bool:
+        if self.running == 0:
+            return True
+        return self.used_memory + memory <= self.memory and self.used_cores + threads <= self.cores
+
+def available_memory() -> int:
+    """Memory available for new processes in MiB, from /proc/meminfo or the physical memory size."""
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+# The admission controller shared by every job in the process
+CONTROLLER: Admission = Admission()
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the admission control options to a command line parser."""
+    parser.add_argument('--memory-budget',
+                        type=int,
+                        metavar='MiB',
+                        default=0,
+                        help='Memory the running validators may use, defaults to the memory available at startup.')
+    parser.add_argument('--core-budget',
+                        type=int,
+                        metavar='CORES',
+                        default=0,
+                        help='Cores the running validators may use, defaults to the CPU count.')
+
+def configure(args: argparse.Namespace) -> None:
+    """Replace the admission controller with one using the budgets given on the command line."""
+    global CONTROLLER # pylint: disable=global-statement
+    CONTROLLER = Admission(args.memory_budget, args.core_budget)
@@ -26,23 +26,41 @@
 E-ARK : Corpora Reporting
         Command line corpora testing tool
 """
+from __future__ import annotations
+
 import shutil
 import sys
-import importlib.metadata
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from eark_corpora import profiling, selection
+from eark_corpora.tester import admission
+from eark_corpora.loader import get_corpora, corpus_root, results_root
+from eark_corpora.profiling import phase
+from eark_corpora.selection import Selection
+
+# The validator, models and runner utilities are only imported once a run starts
+if TYPE_CHECKING:
+    from eark_validator.specifications.specification import SpecificationType
+    from eark_corpora.model.corpora import Corpus
+    from eark_corpora.model.runners import ProcessResult
+    from eark_corpora.tester.jobs import Job
+    from eark_corpora.tester.journal import Journal
+    from eark_corpora.tester.sampling import Sampling
 
-from eark_validator.specifications.specification import SpecificationType
+@lru_cache(maxsize=1)
+def get_version() -> str:
+    """Get the installed package version, looked up on first use."""
+    import importlib.metadata
+    return importlib.metadata.version('eark_corpora')
 
-from eark_corpora.loader import get_corpora, corpus_root
-from eark_corpora.model.corpora import Corpus
-from eark_corpora.model.runners import ProcessResult
-from eark_corpora.tester.processrunner import run_process
-from eark_corpora.tester.utils import get_runners
+def __getattr__(name: str):
+    if name == '__version__':
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__version__ = importlib.metadata.version('eark_corpora')
-results_root = Path('./results')
 defaults = {
     'description': """E-ARK Corpusra Reporting Tool
 is a command-line tool to test validators against the E-ARK corpus.""",
@@ -63,17 +81,66 @@ def parse_command_line():
     """Parse command line arguments."""
     PARSER.add_argument('--version',
                         action='version',
-                        version=__version__)
+                        version=get_version())
     PARSER.add_argument('--clear',
                         action='store_true',
                         dest='clear',
                         default=False,
                         help='Clear the results directory before running tests.')
+    PARSER.add_argument('--resume',
+                        action='store_true',
+                        dest='resume',
+                        default=False,
+                        help='Skip the jobs the previous run completed, according to its journal.')
+    PARSER.add_argument('--jobs',
+                        type=int,
+                        default=1,
+                        help='Number of jobs to run at once, a package\'s runners and versions run side by side.')
+    PARSER.add_argument('--coordinator',
+                        metavar='ADDRESS',
+                        default=None,
+                        help='Serve the jobs to workers on HOST:PORT or unix:PATH, and write their results.')
+    PARSER.add_argument('--local-workers',
+                        type=int,
+                        default=0,
+                        help='Number of worker processes the coordinator starts on this machine.')
+    PARSER.add_argument('--no-steal',
+                        action='store_false',
+                        dest='steal',
+                        default=True,
+                        help='Don\'t give idle workers a copy of the jobs still running elsewhere at the end of a run.')
+    PARSER.add_argument('--worker',
+                        metavar='ADDRESS',
+                        default=None,
+                        help='Run jobs from the coordinator at HOST:PORT or unix:PATH.')
+    PARSER.add_argument('--sample',
+                        type=float,
+                        metavar='SECONDS',
+                        dest='sample_budget',
+                        default=None,
+                        help='Validate a seeded stratified sample of the packages sized to fit a time budget.')
+    PARSER.add_argument('--sample-seed',
+                        type=int,
+                        default=0,
+                        help='Seed for the sample, the same seed and corpus give the same sample.')
+    PARSER.add_argument('--sample-estimate',
+                        type=float,
+                        metavar='SECONDS',
+                        default=10.0,
+                        help='Estimated time to validate one package with one runner, used to size the sample.')
+    selection.add_arguments(PARSER, runners=True)
+    admission.add_arguments(PARSER)
+    profiling.add_arguments(PARSER)
     # Parse arguments
     args = PARSER.parse_args()
+    if args.clear and args.resume:
+        PARSER.error('--clear and --resume cannot be used together.')
+    if args.clear and not Selection.from_args(args).everything:
+        PARSER.error('--clear removes every result and cannot be used with a selection.')
     return args
 
-def _setup():
+def clear_results():
+    """Remove every result from the results root, creating it if it doesn't exist."""
     if results_root.exists():
         for filename in results_root.iterdir():
             if filename.is_file() or filename.is_symlink():
@@ -83,47 +150,85 @@ def _setup():
     else:
         results_root.mkdir(parents=True, exist_ok=True)
 
-def test_runners():
-    """Test the runners."""
-    corpora: Dict[SpecificationType, Corpus] = get_corpora()
-    for corpus in corpora.values():
-        for test_case in corpus.test_cases:
-            for rule in test_case.rules:
-                for package in rule.packages:
-                    if not package.has_directory or not package.path or package.path.name == '':
-                        continue
-                    relative_path = Path(corpus.specification.id) / str(test_case.id) / package.path
-                    package_path = corpus_root / relative_path
-                    results: Dict[str, ProcessResult] = validate_package(package_path)
-
-                    for result_id, result in results.items():
-                        output_path: Path = results_root / relative_path
-                        output_path.mkdir(parents=True, exist_ok=True)
-                        with open(output_path / (result_id + '.json'), 'w') as f:
-                            f.write(result.toJson())
-                        if result.retcode != 0:
-                            print(f"Error running { result.runner_details.name } for package {package.name} for test case {test_case.id}")
-                        else:
-                            print(f"Successfully ran { result.runner_details.name } for package {package.name} for test case {test_case.id}")
+def test_runners(resume: bool = False, selected: Selection = Selection(), sampling: Sampling = None,
+                 workers: int = 1):
+    """Test the runners, running up to workers jobs at once."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from eark_corpora.tester.jobs import ingest, report, result_name, run_job
+    from eark_corpora.tester.utils import get_runners
+    runners = get_runners(selected)
+    jobs, journal = _plan_jobs(resume, selected, sampling)
+
+    def _run(job: Job) -> ProcessResult:
+        journal.started(job)
+        return run_job(runners[job.runner_id], job.package_path)
+
+    # Jobs are planned package by package, so every runner and version of a
+    # package runs close together while its files are in the page cache
+    with journal, ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = { executor.submit(_run, job): job for job in jobs }
+        try:
+            # Results are written and journalled as each job finishes, rather than behind slower jobs
+            for future in as_completed(futures):
+                job = futures.pop(future)
+                result: ProcessResult = future.result()
+                ingest(job, result)
+                journal.finished(job, result_name(result.runner_details), result.retcode)
+                report(job, result.runner_details.name, result.retcode)
+        except BaseException:
+            # Don't start the queued jobs after an interrupt or error
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+def coordinate_runners(address: str, local_workers: int, resume: bool = False,
+                       selected: Selection = Selection(), sampling: Sampling = None, steal: bool = True) -> bool:
+    """Serve the jobs to worker processes rather than running them here."""
+    from eark_corpora.tester.coordinator import coordinate, parse_address
+    from eark_corpora.tester.utils import get_runners
+    jobs, journal = _plan_jobs(resume, selected, sampling)
+    with journal:
+        return coordinate(parse_address(address), jobs, set(get_runners(selected)), local_workers, journal, steal)
+
+def _plan_jobs(resume: bool, selected: Selection, sampling: Sampling = None) -> Tuple[List[Job], Journal]:
+    """Plan the run's jobs, sampling them if asked, and open its journal,
+    leaving out the jobs an interrupted run already completed when resuming."""
+    from eark_corpora.model.coverage import coverage_path
+    from eark_corpora.tester.jobs import plan_jobs, remove_partial_writes, result_name
+    from eark_corpora.tester.journal import Journal
+    from eark_corpora.tester.utils import get_runners
+    runners = get_runners(selected)
+    corpora = get_corpora(selected).values()
+    jobs: List[Job] = plan_jobs(corpora, runners, selected)
+    if sampling:
+        from eark_corpora.tester.sampling import sample_jobs
+        jobs, coverage = sample_jobs(corpora, jobs, len(runners), sampling, selected)
+        coverage.save()
+        print(f"Sampled {coverage.sampled} of {coverage.population} packages "
+              f"in {len(coverage.strata)} strata with seed {sampling.seed}", file=sys.stderr)
+    elif selected.everything:
+        # The results are complete once a full run finishes, so they are no longer a sample
+        coverage_path.unlink(missing_ok=True)
+    journal: Journal = Journal(resume=resume)
+    if resume and not journal.same_plan(jobs):
+        journal.close()
+        PARSER.error('--resume needs the same selection, runners and sample as the interrupted run, '
+                     'whose planned jobs differ.')
+    # The whole plan is journalled, so that a resumed run can be resumed in turn
+    journal.planned(jobs)
+    if resume:
+        remove_partial_writes()
+        planned: int = len(jobs)
+        jobs = journal.remaining(jobs, { runner_id: result_name(runner.details) for runner_id, runner in runners.items() })
+        print(f"Resuming run, {planned - len(jobs)} of {planned} jobs already complete", file=sys.stderr)
+    return jobs, journal
 
 def validate_package(package_path: Path) -> Dict[str, ProcessResult]:
+    from eark_corpora.tester.jobs import result_name, run_job
+    from eark_corpora.tester.utils import get_runners
     results: Dict[str, ProcessResult] = {}
-    for runner_id, runner in get_runners().items():
-        command: List[str] = runner.commands.get('pre', []).copy()
-        command.append(package_path)
-        command+= runner.commands.get('post', [])
-        result: ProcessResult = run_process(runner.details, command)
-        if (runner_id == 'commons-ip') and (result.retcode == 0):
-            file_name = Path(result.stdout[result.stdout.find("'")+1:-1])
-            with open(file_name, 'r', encoding='utf-8') as _f:
-                contents: str = _f.read()
-                result.stdout = contents
-            file_name.unlink()
-        elif (result.retcode == 0):
-            output = result.stdout[result.stdout.find("{"):]
-            result.stdout = output
-
-        results[runner_id + runner.details.version] = result
+    for runner in get_runners().values():
+        result: ProcessResult = run_job(runner, package_path)
+        results[result_name(result.runner_details)] = result
     return results
 
 def main():
@@ -131,9 +236,31 @@ def main():
     _exit: int = 0
     # Get input from command line
     args = parse_command_line()
-    if args.clear:
-        _setup()
-    test_runners()
+    profiling.start(args)
+    admission.configure(args)
+    from eark_corpora.tester.processrunner import install_interrupt_handler
+    install_interrupt_handler()
+    try:
+        if args.worker:
+            from eark_corpora.tester.coordinator import parse_address, work
+            count: int = work(parse_address(args.worker))
+            print(f"Worker finished after {count} jobs", file=sys.stderr)
+        else:
+            selected: Selection = Selection.from_args(args)
+            sampling: Sampling = None
+            if args.sample_budget:
+                from eark_corpora.tester.sampling import Sampling
+                sampling = Sampling(budget=args.sample_budget, seed=args.sample_seed, estimate=args.sample_estimate,
+                                    workers=max(args.local_workers, 1) if args.coordinator else args.jobs)
+            if args.clear:
+                clear_results()
+            if args.coordinator:
+                _exit = 0 if coordinate_runners(args.coordinator, args.local_workers, args.resume, selected,
+                                                sampling, args.steal) else 1
+            else:
+                test_runners(args.resume, selected, sampling, args.jobs)
+    finally:
+        profiling.finish(args)
     sys.exit(_exit)
 
 # def _test_case_schema_checks():
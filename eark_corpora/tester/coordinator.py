@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Validation
+# Copyright (C) 2019
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpora Reporting
+        Coordinator and worker processes for spreading a run across machines.
+
+        The coordinator serves the job queue over a TCP or Unix socket and
+        writes the results. Workers pull one job at a time, run it against
+        their own copy of the corpus and send back the serialised result.
+        Messages are newline delimited JSON. A worker that disconnects has
+        its jobs re-queued, and once the queue is empty idle workers steal
+        a copy of jobs still running elsewhere, the first result wins.
+        Stealing runs the tail jobs twice, it can be turned off for
+        validators too heavy to run twice over.
+"""
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import IO, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from eark_corpora.tester.jobs import Job, report, write_result
+from eark_corpora.tester.journal import Journal
+
+Address = Union[str, Tuple[str, int]]
+
+class JobQueue:
+    """Thread safe queue of jobs shared by the worker connections."""
+    def __init__(self, jobs: List[Job], steal: bool = True):
+        self.jobs: Dict[str, Job] = { job.key: job for job in jobs }
+        self.steal: bool = steal
+        self._pending: Deque[str] = deque(self.jobs)
+        # Job key to the workers running it, in the order they took it
+        self._running: Dict[str, List[str]] = {}
+        self._done: Set[str] = set()
+        # Jobs with a result being written
+        self._claimed: Set[str] = set()
+        self._condition: threading.Condition = threading.Condition()
+        self.workers: int = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once every job has a result."""
+        return len(self._done) == len(self.jobs)
+
+    def connect(self) -> None:
+        """Count a connected worker."""
+        with self._condition:
+            self.workers += 1
+
+    def take(self, worker: str) -> Optional[Job]:
+        """Take the next job for a worker, blocking while others run the last
+        jobs, or None once every job has a result."""
+        with self._condition:
+            while not self.finished:
+                if self._pending:
+                    key: str = self._pending.popleft()
+                    self._running[key] = [ worker ]
+                    return self.jobs[key]
+                # Steal the longest running job that only one worker holds
+                for key, holders in self._running.items():
+                    if self.steal and len(holders) == 1 and worker not in holders and key not in self._claimed:
+                        holders.append(worker)
+                        return self.jobs[key]
+                self._condition.wait()
+            return None
+
+    def claim(self, key: str) -> bool:
+        """Claim the writing of a job's result, returning False if another worker's result got there first."""
+        with self._condition:
+            if key in self._done or key in self._claimed:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def complete(self, key: str) -> None:
+        """Record a claimed job's result as written."""
+        with self._condition:
+            self._claimed.discard(key)
+            self._running.pop(key, None)
+            self._done.add(key)
+            self._condition.notify_all()
+
+    def retry(self, key: str) -> None:
+        """Re-queue a claimed job whose result couldn't be written."""
+        with self._condition:
+            self._claimed.discard(key)
+            self._running.pop(key, None)
+            self._pending.appendleft(key)
+            self._condition.notify_all()
+
+    def release(self, worker: str) -> None:
+        """Re-queue the jobs a disconnected worker was running alone."""
+        with self._condition:
+            self.workers -= 1
+            for key, holders in list(self._running.items()):
+                if worker not in holders:
+                    continue
+                holders.remove(worker)
+                if not holders:
+                    del self._running[key]
+                    self._pending.appendleft(key)
+            self._condition.notify_all()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait until every job has a result, returning False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.finished, timeout)
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    """Serves jobs to one connected worker."""
+    server: '_Server'
+
+    def handle(self):
+        queue: JobQueue = self.server.queue
+        hello: Optional[Dict] = _receive(self.rfile)
+        if not hello or hello.get('type') != 'hello':
+            return
+        worker: str = hello.get('worker', str(self.client_address))
+        missing: Set[str] = self.server.runner_ids - set(hello.get('runners', []))
+        if missing:
+            print(f"Rejected worker {worker}, missing runners {', '.join(sorted(missing))}", file=sys.stderr)
+            _send(self.wfile, { 'type': 'reject', 'reason': f"missing runners {', '.join(sorted(missing))}" })
+            return
+        _send(self.wfile, { 'type': 'welcome' })
+        queue.connect()
+        try:
+            while (message := _receive(self.rfile)) is not None:
+                if message['type'] == 'take':
+                    job: Optional[Job] = queue.take(worker)
+                    if job and self.server.journal:
+                        self.server.journal.started(job)
+                    _send(self.wfile, { 'type': 'job', 'job': job.model_dump() } if job else { 'type': 'done' })
+                    if job is None:
+                        break
+                elif message['type'] == 'result':
+                    job = queue.jobs[message['key']]
+                    if queue.claim(job.key):
+                        try:
+                            write_result(job, message['name'], message['result'], message.get('summary'))
+                        except BaseException:
+                            # The job is only done once its result is written
+                            queue.retry(job.key)
+                            raise
+                        queue.complete(job.key)
+                        if self.server.journal:
+                            self.server.journal.finished(job, message['name'], message['retcode'])
+                        report(job, message['runner'], message['retcode'])
+        except (ConnectionError, json.JSONDecodeError) as excep:
+            print(f"Lost worker {worker}: {excep}", file=sys.stderr)
+        finally:
+            queue.release(worker)
+
+class _Server:
+    """Mixin holding the shared queue for the socket servers."""
+    daemon_threads: bool = True
+    allow_reuse_address: bool = True
+    queue: JobQueue
+    runner_ids: Set[str]
+    journal: Optional[Journal] = None
+
+class _TCPServer(_Server, socketserver.ThreadingTCPServer):
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        super().server_bind()
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(_Server, socketserver.ThreadingUnixStreamServer):
+        pass
+
+def parse_address(text: str) -> Address:
+    """Parse unix:PATH as a Unix socket path and HOST:PORT as a TCP address."""
+    if text.startswith('unix:'):
+        return text[len('unix:'):]
+    host, _, port = text.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid address {text}, expected HOST:PORT or unix:PATH")
+    return (host or 'localhost', int(port))
+
+def format_address(address: Address) -> str:
+    """Format an address as parsed by parse_address."""
+    return f"unix:{address}" if isinstance(address, str) else f"{address[0]}:{address[1]}"
+
+def coordinate(address: Address, jobs: List[Job], runner_ids: Set[str], local_workers: int = 0,
+               journal: Optional[Journal] = None, steal: bool = True) -> bool:
+    """Serve the jobs to workers until every job has a result, optionally
+    starting local worker processes, returning False if the workers all
+    went away first."""
+    if not jobs:
+        print("No jobs to coordinate.", file=sys.stderr)
+        return True
+    queue: JobQueue = JobQueue(jobs, steal)
+    if isinstance(address, str):
+        Path(address).unlink(missing_ok=True)
+        server: _Server = _UnixServer(address, _WorkerHandler)
+    else:
+        server = _TCPServer(address, _WorkerHandler)
+    server.queue = queue
+    server.runner_ids = runner_ids
+    server.journal = journal
+    # Use the bound address, so that port 0 picks a free port
+    bound: str = format_address(server.server_address)
+    print(f"Coordinating {len(jobs)} jobs on {bound}", file=sys.stderr)
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    workers: List[subprocess.Popen] = [
+        subprocess.Popen([sys.executable, '-m', 'eark_corpora.tester.app', '--worker', bound])
+        for _ in range(local_workers)
+    ]
+    try:
+        while not queue.wait(timeout=1.0):
+            if workers and all(worker.poll() is not None for worker in workers) and queue.workers == 0:
+                print("All local workers exited before the jobs were finished.", file=sys.stderr)
+                return False
+        return True
+    finally:
+        server.shutdown()
+        server.server_close()
+        for worker in workers:
+            try:
+                worker.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+        if isinstance(address, str):
+            Path(address).unlink(missing_ok=True)
+
+def work(address: Address) -> int:
+    """Pull and run jobs from a coordinator until it has none left, returning the number run."""
+    from eark_corpora.model.adapters import dump_summary, summarise
+    from eark_corpora.tester.jobs import result_name, run_job
+    from eark_corpora.tester.utils import get_runners
+    runners = get_runners()
+    family: int = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    if not isinstance(address, str):
+        family = socket.getaddrinfo(*address, type=socket.SOCK_STREAM)[0][0]
+    count: int = 0
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        if family != socket.AF_UNIX:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        stream: IO[bytes] = sock.makefile('rwb')
+        _send(stream, { 'type': 'hello', 'worker': f"{socket.gethostname()}:{os.getpid()}",
+                        'runners': list(runners) })
+        message: Optional[Dict] = _receive(stream)
+        if message is None or message['type'] != 'welcome':
+            raise RuntimeError(f"Coordinator rejected worker: {(message or {}).get('reason', 'disconnected')}")
+        while True:
+            _send(stream, { 'type': 'take' })
+            message = _receive(stream)
+            if message is None or message['type'] != 'job':
+                return count
+            job: Job = Job(**message['job'])
+            result = run_job(runners[job.runner_id], job.package_path)
+            _send(stream, { 'type': 'result', 'key': job.key, 'name': result_name(result.runner_details),
+                            'runner': result.runner_details.name, 'retcode': result.retcode,
+                            'result': result.toJson(),
+                            'summary': dump_summary(summarise(result, job.test_case_id)) })
+            count += 1
+
+def _send(stream: IO[bytes], message: Dict) -> None:
+    stream.write(json.dumps(message).encode('utf-8') + b'\n')
+    stream.flush()
+
+def _receive(stream: IO[bytes]) -> Optional[Dict]:
+    line: bytes = stream.readline()
+    return json.loads(line) if line else None
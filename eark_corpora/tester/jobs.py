@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Validation
+# Copyright (C) 2019
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpora Reporting
+        Validation jobs, one per package and runner.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from eark_corpora.loader import SUMMARY_SUFFIX, corpus_root, get_package_results, results_root
+from eark_corpora.model.adapters import dump_summary, summarise
+from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusRule, CorpusTestCase, CorpusTestResult
+from eark_corpora.model.runners import ProcessResult, Runner, RunnerDetails
+from eark_corpora.profiling import phase
+from eark_corpora.selection import Selection, disagrees
+from eark_corpora.tester import admission
+from eark_corpora.tester.processrunner import run_process
+
+class Job(BaseModel):
+    """A single package to validate with a single runner."""
+    spec_id: str # Specification ID, e.g. CSIP
+    test_case_id: str # Test case ID, e.g. CSIP1
+    package: str # Package name
+    path: str # Package path relative to the corpus and results roots
+    runner_id: str # ID of the runner to validate with
+
+    @property
+    def key(self) -> str:
+        """A unique key for the job."""
+        return f"{self.path}:{self.runner_id}"
+
+    @property
+    def package_path(self) -> Path:
+        """The package path in the corpus."""
+        return corpus_root / self.path
+
+    @property
+    def results_path(self) -> Path:
+        """The directory the package results are written to."""
+        return results_root / self.path
+
+def package_rows(corpora: Iterable[Corpus], selection: Selection = Selection()
+                 ) -> Iterator[Tuple[Corpus, CorpusTestCase, CorpusRule, CorpusPackage, str]]:
+    """Iterate the selected packages that exist in the corpora, with their relative paths."""
+    for corpus in corpora:
+        for test_case in corpus.test_cases:
+            for rule in test_case.rules:
+                for package in rule.packages:
+                    if not package.has_directory or not package.path or package.path.name == '':
+                        continue
+                    if not selection.package(package.name):
+                        continue
+                    if selection.disagree and not disagrees(
+                            package, get_package_results(package, str(test_case.id), corpus.specification.id)):
+                        continue
+                    relative_path = Path(corpus.specification.id) / str(test_case.id) / package.path
+                    yield corpus, test_case, rule, package, relative_path.as_posix()
+
+def plan_jobs(corpora: Iterable[Corpus], runner_ids: Iterable[str], selection: Selection = Selection()) -> List[Job]:
+    """List the jobs for every selected package in the corpora, for every runner."""
+    runner_ids = list(runner_ids)
+    jobs: List[Job] = []
+    for corpus, test_case, _, package, path in package_rows(corpora, selection):
+        jobs.extend(Job(spec_id=corpus.specification.id, test_case_id=str(test_case.id),
+                        package=package.name, path=path, runner_id=runner_id)
+                    for runner_id in runner_ids)
+    return jobs
+
+def run_job(runner: Runner, package_path: Path) -> ProcessResult:
+    """Validate a package with a runner, reading the report for runners that write it to a file."""
+    command: List[str] = runner.commands.get('pre', []).copy()
+    command.append(package_path)
+    command+= runner.commands.get('post', [])
+    with admission.CONTROLLER.admit(runner.resources), phase(f'validation {runner.details.id}'):
+        result: ProcessResult = run_process(runner.details, command, runner.timeout,
+                                             runner.resources.memory_limit)
+    if (runner.details.report_kind == 'commons-ip') and (result.retcode == 0):
+        file_name = Path(result.stdout[result.stdout.find("'")+1:-1])
+        with open(file_name, 'r', encoding='utf-8') as _f:
+            contents: str = _f.read()
+            result.stdout = contents
+        file_name.unlink()
+    elif (result.retcode == 0):
+        output = result.stdout[result.stdout.find("{"):]
+        result.stdout = output
+    return result
+
+def result_name(details: RunnerDetails) -> str:
+    """The results file name for a runner's results, the runner ID and version."""
+    return details.id + details.version
+
+def summary_name(name: str) -> str:
+    """The file name of the normalised summary stored next to a raw result."""
+    return name + SUMMARY_SUFFIX
+
+def write_result(job: Job, name: str, contents: str, summary: Optional[str] = None) -> Path:
+    """Write a serialised result for a job and its serialised summary, returning the result path."""
+    output_path: Path = job.results_path
+    output_path.mkdir(parents=True, exist_ok=True)
+    with phase('result write'):
+        atomic_write(output_path / (name + '.json'), contents)
+        # The summary is written last, so that it is never older than its result
+        if summary is not None:
+            atomic_write(output_path / summary_name(name), summary)
+    return output_path / (name + '.json')
+
+def ingest(job: Job, result: ProcessResult) -> CorpusTestResult:
+    """Normalise a job's result and write it with its summary, returning the summary."""
+    with phase('result summary'):
+        test_result: CorpusTestResult = summarise(result, job.test_case_id)
+    write_result(job, result_name(result.runner_details), result.toJson(), dump_summary(test_result))
+    return test_result
+
+def report(job: Job, runner_name: str, retcode: int) -> None:
+    """Print the outcome of a job."""
+    if retcode != 0:
+        print(f"Error running { runner_name } for package {job.package} for test case {job.test_case_id}")
+    else:
+        print(f"Successfully ran { runner_name } for package {job.package} for test case {job.test_case_id}")
+
+def atomic_write(path: Path, contents: str) -> None:
+    """Write a file so that readers only ever see the old or the complete new
+    contents, by writing a temporary file alongside it and renaming it."""
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+def remove_partial_writes(root: Path = results_root) -> int:
+    """Delete temporary files left by writes interrupted by a crash, returning the number removed."""
+    partial: Set[Path] = set(root.rglob('.*.tmp')) if root.exists() else set()
+    for path in partial:
+        path.unlink(missing_ok=True)
+    return len(partial)
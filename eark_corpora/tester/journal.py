@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Validation
+# Copyright (C) 2019
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpora Reporting
+        Append only journal of the jobs in a run, so an interrupted run can resume.
+
+        Each line is a JSON record: a plan record when a run starts, with a
+        digest of the planned job keys, then a start record before each job
+        runs and a done record once its result file is in place. A crash mid
+        write can only tear the last line, which is ignored when the journal
+        is read back.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, IO, Iterator, List, Optional
+
+from eark_corpora.loader import results_root
+from eark_corpora.tester.jobs import Job
+
+journal_path: Path = results_root / 'journal.jsonl'
+
+class Journal:
+    """Write ahead journal of planned, started and completed jobs."""
+    def __init__(self, path: Path = journal_path, resume: bool = False):
+        self.path: Path = path
+        records: List[Dict] = list(self._read_records()) if resume else []
+        # Job key to the result file name of its completed result
+        self.completed: Dict[str, str] = { record['key']: record['name'] for record in records
+                                           if record.get('event') == 'done' }
+        # Digest of the jobs the journalled run planned, None if it didn't record one
+        self.plan: Optional[str] = next((record.get('digest') for record in reversed(records)
+                                         if record.get('event') == 'plan'), None)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._lock: threading.Lock = threading.Lock()
+        if resume and self._file.tell() > 0:
+            # Terminate any torn final line so the next record starts a line of its own
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._append_line('')
+
+    def remaining(self, jobs: List[Job], result_names: Dict[str, str]) -> List[Job]:
+        """Filter out the jobs completed by an earlier run with the same runner
+        version, whose result file is still in place."""
+        return [ job for job in jobs
+                 if self.completed.get(job.key) != result_names[job.runner_id]
+                 or not (job.results_path / (result_names[job.runner_id] + '.json')).is_file() ]
+
+    def same_plan(self, jobs: List[Job]) -> bool:
+        """Whether the jobs are those the journalled run planned, True if it didn't record them."""
+        return self.plan is None or self.plan == plan_digest(jobs)
+
+    def planned(self, jobs: List[Job]) -> None:
+        """Record the jobs planned for this run."""
+        self._append({ 'event': 'plan', 'jobs': len(jobs), 'digest': plan_digest(jobs) })
+
+    def started(self, job: Job) -> None:
+        """Record that a job is about to run."""
+        self._append({ 'event': 'start', 'key': job.key })
+
+    def finished(self, job: Job, name: str, retcode: int) -> None:
+        """Record that a job's result file has been committed."""
+        self._append({ 'event': 'done', 'key': job.key, 'name': name, 'retcode': retcode }, sync=True)
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append(self, record: Dict, sync: bool = False) -> None:
+        self._append_line(json.dumps(record), sync)
+
+    def _append_line(self, line: str, sync: bool = False) -> None:
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def _read_records(self) -> Iterator[Dict]:
+        if not self.path.is_file():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid write
+                    continue
+
+def plan_digest(jobs: List[Job]) -> str:
+    """SHA-256 digest of the planned job keys, in any order."""
+    return hashlib.sha256('\n'.join(sorted(job.key for job in jobs)).encode('utf-8')).hexdigest()
@@ -22,24 +22,158 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import os
+import signal
+import sys
+import threading
 import time
-from typing import List
+from typing import IO, List, Optional, Set, Tuple
 import subprocess
 
-from eark_corpora.model.runners import ProcessResult, RunnerDetails
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
 
-def run_process(runner_details: RunnerDetails, command: List[str]) -> ProcessResult:
-    start = time.time()
+from eark_corpora.model.runners import ProcessResult, ResourceUsage, RunnerDetails
+
+# Start validators in a new session on POSIX, and a new process group on Windows
+_NEW_GROUP: dict = ({ 'start_new_session': True } if os.name == 'posix'
+                    else { 'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP })
+# The validators currently running, killed on an interrupt
+_running: Set[subprocess.Popen] = set()
+_lock: threading.Lock = threading.Lock()
+_interrupted: threading.Event = threading.Event()
+# ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+_RSS_DIVISOR: int = 1024 if sys.platform == 'darwin' else 1
+
+# Seconds a timed out validator's process group has to exit after SIGTERM before it is sent SIGKILL
+KILL_GRACE: float = 5.0
+# Lowers the address space limit and then replaces itself with the validator, so that the limit
+# is in place before the validator starts, e.g. before a JVM reserves its heap
+_LIMIT_MEMORY: str = ("import os, resource, sys\n"
+                      "_, hard = resource.getrlimit(resource.RLIMIT_AS)\n"
+                      "limit = int(sys.argv[1]) if hard == resource.RLIM_INFINITY else min(int(sys.argv[1]), hard)\n"
+                      "resource.setrlimit(resource.RLIMIT_AS, (limit, limit))\n"
+                      "os.execvp(sys.argv[2], sys.argv[2:])\n")
+
+def run_process(runner_details: RunnerDetails, command: List[str], timeout: float = 60,
+                memory_limit: Optional[int] = None) -> ProcessResult:
+    start = time.monotonic()
+    if memory_limit:
+        command = _limit_memory(command, memory_limit)
+    try:
+        # A session of its own puts the validator and any helpers it starts in one process group
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   **_NEW_GROUP)
+    except OSError as excep:
+        return ProcessResult(runner_details, -1, '', str(excep).replace('"', "'"), time.monotonic() - start,
+                             exception=excep)
+    with _lock:
+        _running.add(process)
+        interrupted: bool = _interrupted.is_set()
+    if interrupted:
+        # Started as the run was interrupted, after the running validators were killed
+        _kill_group(process, signal.SIGKILL)
+    stdout: List[str] = []
+    stderr: List[str] = []
+    readers: List[threading.Thread] = [
+        threading.Thread(target=_drain, args=(process.stdout, stdout), daemon=True),
+        threading.Thread(target=_drain, args=(process.stderr, stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    # Stop the process group if it outlives the timeout, the wait below then returns
+    timed_out = threading.Event()
+    timer = threading.Timer(timeout, _expire, (process, timed_out))
+    timer.daemon = True
+    timer.start()
     try:
-        proc_results = subprocess.run(command, capture_output=True, timeout=60, text=True)
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-        return ProcessResult(e.returncode,
-                             e.stdout.strip(),
-                             e.stderr.strip().replace('"', "'"),
-                             time.time() - start,
-                             exception=e)
+        retcode, resources = _wait(process)
+    finally:
+        timer.cancel()
+        # Helpers left behind by the validator would hold its pipes open and keep using cores
+        _kill_group(process, signal.SIGKILL)
+        with _lock:
+            _running.discard(process)
+    for reader in readers:
+        reader.join(KILL_GRACE)
+    exception = subprocess.TimeoutExpired([str(part) for part in command], timeout) if timed_out.is_set() else None
     return ProcessResult(runner_details,
-                         proc_results.returncode,
-                         proc_results.stdout.strip(),
-                         proc_results.stderr.strip().replace('"', "'"),
-                         time.time() - start)
+                         retcode,
+                         ''.join(stdout).strip(),
+                         ''.join(stderr).strip().replace('"', "'"),
+                         time.monotonic() - start,
+                         exception=exception,
+                         resources=resources,
+                         timed_out=timed_out.is_set())
+
+def install_interrupt_handler() -> None:
+    """Kill the running validators on an interrupt, called by the command line applications.
+
+    Signal handlers can only be installed from the main thread, and an ignored or
+    custom interrupt handler is left alone."""
+    if (threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGINT) is signal.default_int_handler):
+        signal.signal(signal.SIGINT, _interrupt)
+
+def _interrupt(signum, frame) -> None:
+    """Kill the running validators before handling an interrupt, as their own
+    sessions no longer receive the terminal's SIGINT."""
+    with _lock:
+        _interrupted.set()
+        running: List[subprocess.Popen] = list(_running)
+    for process in running:
+        _kill_group(process, signal.SIGKILL)
+    signal.default_int_handler(signum, frame)
+
+def _limit_memory(command: List[str], memory_limit: int) -> List[str]:
+    """Wrap a command so that its address space is capped at memory_limit MiB, where
+    resource limits are available.
+
+    The limit is set by a small interpreter that execs the command, rather than in a
+    preexec_fn, which isn't safe with the reader threads of parallel runs."""
+    if resource is None:
+        return command
+    return [sys.executable, '-I', '-S', '-c', _LIMIT_MEMORY, str(memory_limit * 1024 * 1024),
+            *(str(part) for part in command)]
+
+def _expire(process: subprocess.Popen, timed_out: threading.Event) -> None:
+    """Ask the process group to stop, then kill it if it hasn't after the grace period."""
+    timed_out.set()
+    _kill_group(process, signal.SIGTERM)
+    deadline: float = time.monotonic() + KILL_GRACE
+    while process.returncode is None and time.monotonic() < deadline:
+        time.sleep(0.1)
+    _kill_group(process, signal.SIGKILL)
+
+def _kill_group(process: subprocess.Popen, sig: int) -> None:
+    """Signal the process group, or just the process where there are no process groups."""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, sig)
+        elif process.returncode is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        # Every process in the group has already exited
+        pass
+
+def _drain(stream: IO[str], sink: List[str]) -> None:
+    with stream:
+        sink.append(stream.read())
+
+def _wait(process: subprocess.Popen) -> Tuple[int, ResourceUsage]:
+    """Reap the child with wait4 so its own rusage is captured, rather than
+    the accumulated rusage of every child."""
+    if not hasattr(os, 'wait4'):
+        return process.wait(), ResourceUsage()
+    _, status, rusage = os.wait4(process.pid, 0)
+    # Record the exit code on the Popen so it doesn't try to reap the child again
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, ResourceUsage(
+        user_time=rusage.ru_utime,
+        system_time=rusage.ru_stime,
+        max_rss=rusage.ru_maxrss // _RSS_DIVISOR,
+        read_blocks=rusage.ru_inblock,
+        write_blocks=rusage.ru_oublock,
+    )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Validation
+# Copyright (C) 2019
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpora Reporting
+        Seeded stratified sampling of the packages to validate within a time budget.
+
+        Packages are stratified by specification, test case testable state,
+        expected validity and rule level. Every stratum gets one package if
+        the budget allows, the rest of the sample is shared out in proportion
+        to the stratum sizes.
+"""
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+from eark_corpora.model.corpora import Corpus
+from eark_corpora.model.coverage import Coverage, Stratum
+from eark_corpora.selection import Selection
+from eark_corpora.tester.jobs import Job, package_rows
+
+StratumKey = Tuple[str, str, bool, str]
+
+@dataclass(frozen=True)
+class Sampling:
+    """Options for a sampled run."""
+    budget: float # Time budget in seconds
+    seed: int = 0
+    estimate: float = 10.0 # Estimated seconds to validate a package with one runner
+    workers: int = 1 # Number of jobs run at once
+
+    def sample_size(self, runner_count: int) -> int:
+        """The number of packages that can be validated with every runner within the budget."""
+        return int(self.budget * self.workers / (self.estimate * max(runner_count, 1)))
+
+def sample_jobs(corpora: Iterable[Corpus], jobs: List[Job], runner_count: int, sampling: Sampling,
+                selection: Selection = Selection()) -> Tuple[List[Job], Coverage]:
+    """Sample the packages of the planned jobs, returning their jobs and the coverage of the sample."""
+    planned: Set[str] = { job.path for job in jobs }
+    strata: Dict[StratumKey, List[str]] = {}
+    seen: Set[str] = set()
+    for corpus, test_case, rule, package, path in package_rows(corpora, selection):
+        if path not in planned or path in seen:
+            continue
+        seen.add(path)
+        key: StratumKey = (corpus.specification.id, test_case.testable.value, package.is_valid, rule.level.name)
+        strata.setdefault(key, []).append(path)
+    rnd: random.Random = random.Random(sampling.seed)
+    allocation: Dict[StratumKey, int] = allocate({ key: len(paths) for key, paths in strata.items() },
+                                                 sampling.sample_size(runner_count), rnd)
+    sampled: List[str] = []
+    for key in sorted(strata):
+        sampled.extend(sorted(rnd.sample(strata[key], allocation[key])))
+    coverage: Coverage = Coverage(
+        seed=sampling.seed,
+        budget=sampling.budget,
+        estimate=sampling.estimate,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        population=len(seen),
+        packages=sampled,
+        strata=[Stratum(spec=key[0], testable=key[1], valid=key[2], level=key[3],
+                        population=len(strata[key]), sampled=allocation[key]) for key in sorted(strata)],
+    )
+    chosen: Set[str] = set(sampled)
+    return [job for job in jobs if job.path in chosen], coverage
+
+def allocate(populations: Dict[StratumKey, int], size: int, rnd: random.Random) -> Dict[StratumKey, int]:
+    """Share a sample size out across strata, at least one each while the size
+    allows, the remainder in proportion to the strata sizes."""
+    keys: List[StratumKey] = sorted(populations)
+    total: int = sum(populations.values())
+    if size >= total:
+        return dict(populations)
+    if size < len(keys):
+        chosen: Set[StratumKey] = set(rnd.sample(keys, max(size, 0)))
+        return { key: int(key in chosen) for key in keys }
+    spare: Dict[StratumKey, int] = { key: populations[key] - 1 for key in keys }
+    remaining: int = size - len(keys)
+    quotas: Dict[StratumKey, float] = { key: remaining * spare[key] / (total - len(keys)) for key in keys }
+    allocation: Dict[StratumKey, int] = { key: 1 + math.floor(quotas[key]) for key in keys }
+    # Hand the places lost to rounding down to the largest remainders
+    leftover: int = size - sum(allocation.values())
+    for key in sorted(keys, key=lambda key: quotas[key] - math.floor(quotas[key]), reverse=True)[:leftover]:
+        allocation[key] += 1
+    return allocation
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Validation
+# Copyright (C) 2019
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpora Reporting
+        Deterministic stub validator, for measuring the tester's own overhead.
+
+        Emits commons-ip or eark-validator style reports with configurable
+        latency, output size and failure and timeout rates. The outcome for a
+        package is seeded from the package path, so reruns are repeatable.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+STYLES: List[str] = [ 'commons-ip', 'eark-validator' ]
+
+def parse_command_line(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog='eark-stub-validator',
+                                     description='Deterministic stub validator for throughput testing.')
+    parser.add_argument('package', nargs='?', default=None, help='Package path to "validate".')
+    parser.add_argument('--version', action='store_true', help='Print the stub version and exit.')
+    parser.add_argument('--stub-version', default='0.0.1', help='Version reported by --version.')
+    parser.add_argument('--style', choices=STYLES, default='eark-validator', help='Report format to emit.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean run time in seconds.')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Run time varies uniformly by this fraction of the latency.')
+    parser.add_argument('--messages', type=int, default=5, help='Maximum number of messages per report.')
+    parser.add_argument('--size', type=int, default=0, help='Pad each message text to this many bytes.')
+    parser.add_argument('--invalid-rate', type=float, default=0.5, help='Probability a package is reported invalid.')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Probability the run fails with a non-zero exit code.')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='Probability the run hangs.')
+    parser.add_argument('--hang', type=float, default=3600.0, help='Seconds a hanging run sleeps for.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed combined with the package path.')
+    return parser.parse_args(argv)
+
+def package_random(package: str, seed: int) -> random.Random:
+    """Get a random generator seeded from the package path and seed."""
+    digest: bytes = hashlib.sha256(f"{seed}:{package}".encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+def report(package: str, args: argparse.Namespace, rnd: random.Random) -> Dict:
+    """Build a validation report in the requested style."""
+    commons_ip: bool = args.style == 'commons-ip'
+    status_name: str = 'status' if commons_ip else 'level'
+    rule_name: str = 'ruleId' if commons_ip else 'rule_id'
+    is_valid: bool = rnd.random() >= args.invalid_rate
+    messages: List[Dict] = []
+    for _ in range(rnd.randint(0 if is_valid else 1, max(args.messages, 1))):
+        rule_id: str = f"{rnd.choice(['CSIP', 'SIP', 'DIP'])}{rnd.randint(1, 120)}"
+        # The level values eark-validator reports, and model.corpora.Level holds
+        level: str = 'ERROR' if not is_valid and not messages else rnd.choice(['WARN', 'INFO'])
+        messages.append({ rule_name: rule_id, 'level': level,
+                          'message': f"Stub {level.lower()} for {rule_id}".ljust(args.size, '.') })
+    return {
+        'package': os.path.basename(package.rstrip('/')),
+        'structuralResults': { 'level': 'WellFormed', 'messages': [] },
+        'metadata': {
+            ('schemaResults' if commons_ip else 'schema_results'): { status_name: 'Valid', 'messages': [] },
+            ('schematronResults' if commons_ip else 'schematron_results'): {
+                status_name: 'Valid' if is_valid else 'NotValid', 'messages': messages },
+        },
+    }
+
+def main(argv: List[str] = None) -> int:
+    """Main command line application."""
+    args = parse_command_line(argv)
+    if args.version:
+        print(f"E-ARK stub validator {args.stub_version}")
+        return 0
+    if not args.package:
+        print("No package path given.", file=sys.stderr)
+        return 2
+    rnd: random.Random = package_random(args.package, args.seed)
+    roll: float = rnd.random()
+    latency: float = max(args.latency * (1 + rnd.uniform(-args.jitter, args.jitter)), 0.0)
+    if roll < args.timeout_rate:
+        time.sleep(args.hang)
+    time.sleep(latency)
+    if roll < args.timeout_rate + args.failure_rate:
+        print(f"Stub failure validating {args.package}", file=sys.stderr)
+        return 1
+    output: str = json.dumps(report(args.package, args, rnd))
+    if args.style == 'commons-ip':
+        # commons-ip writes its report to a file and ends its output with the quoted file path
+        handle, path = tempfile.mkstemp(prefix='stub-report-', suffix='.json')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Validation report written to '{path}'", end='')
+    else:
+        # eark-validator logs before its JSON report
+        print(f"Validating {args.package}")
+        print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
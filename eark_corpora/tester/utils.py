@@ -24,13 +24,17 @@
 #
 
 from functools import lru_cache
+import copy
 import json
+from typing import Iterator
 from eark_corpora.loader import get_config
 from eark_corpora.model.runners import Runner, RunnerDetails
+from eark_corpora.profiling import phase
+from eark_corpora.selection import Selection
 from eark_corpora.tester.processrunner import ProcessResult, run_process
 
 @lru_cache(maxsize=1)
-def get_runners() -> dict[str, Runner]:
+def get_runners(selection: Selection = Selection()) -> dict[str, Runner]:
     runners: dict[str, Runner] = {}
     with open(get_config().testing_config, 'r') as f:
         data = json.load(f)
@@ -39,19 +43,55 @@ def get_runners() -> dict[str, Runner]:
         for runner_dict in data['runners']:
             if not isinstance(runner_dict, dict) or 'commands' not in runner_dict:
                 raise ValueError("Invalid runner configuration format.")
-            version = get_version(runner_dict)
-            runner_dict['details'].update({'version': version})
-            runner = Runner(**runner_dict)
-            runners[runner.details.id] = runner
+            # Skip unselected runners before probing their versions
+            runner_id: str = runner_dict.get('details', {}).get('id', '')
+            if not selection.runner(runner_id) and not selection.runner_versions(runner_id):
+                continue
+            for variant in _versions(runner_dict):
+                version = get_version(variant)
+                variant['details'].update({'version': version})
+                runner = Runner(**variant)
+                # Several versions of a runner are told apart by their version
+                key: str = f"{runner.details.id}@{version}" if 'versions' in runner_dict else runner.details.id
+                if not selection.runner(key):
+                    continue
+                if key in runners:
+                    raise ValueError(f"Runner {key} is configured more than once.")
+                runners[key] = runner
     return runners
 
+def _versions(runner_dict: dict) -> Iterator[dict]:
+    """Expand a runner configuration into one configuration per listed version.
+
+    Each entry of an optional versions list is either a string, substituted
+    for {version} in the runner's commands, or an object whose commands
+    replace the runner's commands.
+    """
+    versions = runner_dict.get('versions')
+    if versions is None:
+        yield runner_dict
+        return
+    if not isinstance(versions, list) or not versions:
+        raise ValueError("Invalid versions in runner configuration, expected a non-empty list.")
+    for version in versions:
+        variant: dict = { key: copy.deepcopy(value) for key, value in runner_dict.items() if key != 'versions' }
+        if isinstance(version, str):
+            variant['commands'] = { name: [arg.replace('{version}', version) for arg in command]
+                                    for name, command in variant['commands'].items() }
+        elif isinstance(version, dict) and isinstance(version.get('commands'), dict):
+            variant['commands'] = { **variant['commands'], **copy.deepcopy(version['commands']) }
+        else:
+            raise ValueError("Invalid version in runner configuration, expected a string or commands.")
+        yield variant
+
 def get_version(runner_dict: dict) -> str:
     """Get the version of a specific runner."""
     runner_details: RunnerDetails = RunnerDetails(**runner_dict.get('details', {}))
     commands = runner_dict.get('commands', {})
     if not isinstance(commands, dict) or 'version' not in commands:
         raise ValueError("Invalid commands format in runner configuration.")
-    result: ProcessResult = run_process(runner_details, commands['version'])
+    with phase('runner version probe'):
+        result: ProcessResult = run_process(runner_details, commands['version'])
     if result.retcode != 0:
-        raise RuntimeError(f"Error running version command: {result.stderr.decode('utf-8')}")
+        raise RuntimeError(f"Error running version command: {result.stderr}")
     return result.stdout.strip().split(' ')[-1]  # Assuming version is the first part of the output
\ No newline at end of file
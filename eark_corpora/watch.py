@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting
+        Watch the corpus, re-validating and re-rendering only what changes.
+
+        Changes are picked up with inotify on Linux, and by polling file
+        modification times elsewhere or when inotify is unavailable. An
+        edited testCase.xml reloads that test case against its existing
+        results, an edited package re-runs that package's jobs. Only the
+        affected case, package, corpus and home pages are re-rendered.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import shutil
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from eark_corpora.cli import app as reporter
+from eark_corpora.loader import corpus_root, get_package_results
+from eark_corpora.model.corpora import Corpus, CorpusPackage, CorpusTestCase, CorpusTestResult
+from eark_corpora.model.index import RuleIndex
+from eark_corpora.model.matrix import ConformanceMatrix, MatrixBuilder
+from eark_corpora.model.runners import ProcessResult, Runner
+from eark_corpora.tester.jobs import Job, ingest, report, run_job
+
+# inotify(7) event masks
+IN_ATTRIB: int = 0x00000004
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_Q_OVERFLOW: int = 0x00004000
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+WATCH_MASK: int = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT: struct.Struct = struct.Struct('iIII')
+# Seconds to keep collecting the burst of events from a single save or copy
+DEBOUNCE: float = 0.2
+
+CaseKey = Tuple[str, str]
+PackageKey = Tuple[str, str, str]
+
+class PollingWatcher:
+    """Detects changes by comparing file modification times and sizes."""
+    def __init__(self, root: Path, interval: float = 1.0):
+        self.root: Path = root
+        self.interval: float = interval
+        self._snapshot: Dict[Path, Tuple[int, int]] = self._scan()
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """Yield the set of paths changed since the last scan, forever."""
+        while True:
+            time.sleep(self.interval)
+            snapshot: Dict[Path, Tuple[int, int]] = self._scan()
+            changed: Set[Path] = { path for path in snapshot.keys() | self._snapshot.keys()
+                                   if snapshot.get(path) != self._snapshot.get(path) }
+            self._snapshot = snapshot
+            if changed:
+                yield changed
+
+    def close(self) -> None:
+        """Nothing to release for polling."""
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        for directory, _, file_names in os.walk(self.root):
+            for name in file_names:
+                path: Path = Path(directory) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+class InotifyWatcher:
+    """Detects changes with inotify, watching every directory under the root."""
+    def __init__(self, root: Path):
+        self.root: Path = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise _errno_error('inotify_init1')
+        self._directories: Dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """Yield each burst of changed paths, forever."""
+        while True:
+            changed: Set[Path] = self._read(None)
+            while more := self._read(DEBOUNCE):
+                changed |= more
+            if changed:
+                yield changed
+
+    def close(self) -> None:
+        """Close the inotify descriptor, dropping every watch."""
+        os.close(self._fd)
+
+    def _add_tree(self, root: Path) -> None:
+        for directory, _, _ in os.walk(root):
+            descriptor: int = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if descriptor < 0:
+                error: OSError = _errno_error('inotify_add_watch', directory)
+                # The directory went again before it could be watched
+                if error.errno == errno.ENOENT:
+                    continue
+                raise error
+            self._directories[descriptor] = Path(directory)
+
+    def _read(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data: bytes = os.read(self._fd, 64 * 1024)
+        changed: Set[Path] = set()
+        offset: int = 0
+        while offset + _EVENT.size <= len(data):
+            descriptor, mask, _, length = _EVENT.unpack_from(data, offset)
+            name: bytes = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so treat the whole tree as changed
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(descriptor, None)
+                continue
+            directory: Optional[Path] = self._directories.get(descriptor)
+            if directory is None:
+                continue
+            path: Path = directory / os.fsdecode(name) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+                # Files can land in a new directory before it is watched
+                changed.update(Path(directory) / file_name for directory, _, file_names in os.walk(path)
+                               for file_name in file_names)
+        return changed
+
+def _errno_error(call: str, path: str = None) -> OSError:
+    error: int = ctypes.get_errno()
+    return OSError(error, f"{call}: {os.strerror(error)}", path)
+
+def open_watcher(root: Path, polling: bool = False, interval: float = 1.0):
+    """Open an inotify watcher for the root, or a polling watcher if asked or if inotify is unavailable."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as excep:
+            print(f"inotify unavailable ({excep}), polling every {interval}s instead", file=sys.stderr)
+    return PollingWatcher(root, interval)
+
+class WatchSession:
+    """Keeps every package's results in memory so that summaries can be re-rendered after a change."""
+    def __init__(self, corpora: Dict, runners: Dict[str, Runner], jobs: int = 1):
+        self.corpora: Dict = corpora
+        self.by_spec: Dict[str, Corpus] = { corpus.specification.id: corpus for corpus in corpora.values() }
+        self.runners: Dict[str, Runner] = runners
+        self.jobs: int = jobs
+        self.results: Dict[PackageKey, List[CorpusTestResult]] = {}
+        for corpus in self.by_spec.values():
+            for test_case in corpus.test_cases:
+                self._load_results(corpus, test_case)
+
+    def affected(self, paths: Set[Path]) -> Tuple[Set[CaseKey], Set[PackageKey]]:
+        """Map changed paths to the test cases to reload and the packages to re-validate."""
+        root: Path = corpus_root.resolve()
+        cases: Set[CaseKey] = set()
+        packages: Set[PackageKey] = set()
+        for path in paths:
+            try:
+                parts: Tuple[str, ...] = path.resolve().relative_to(root).parts
+            except ValueError:
+                continue
+            if len(parts) == 0:
+                cases.update((spec_id, str(test_case.id)) for spec_id, corpus in self.by_spec.items()
+                             for test_case in corpus.test_cases)
+                continue
+            if len(parts) < 2 or parts[0] not in self.by_spec:
+                continue
+            case_key: CaseKey = (parts[0], parts[1])
+            test_case: Optional[CorpusTestCase] = self._test_case(*case_key)
+            if len(parts) == 2 or parts[2].startswith('testCase.') or test_case is None:
+                cases.add(case_key)
+                continue
+            for package in test_case.packages:
+                if package.path.parts and parts[2:2 + len(package.path.parts)] == package.path.parts:
+                    packages.add((*case_key, package.name))
+        return cases, packages
+
+    def update(self, paths: Set[Path]) -> None:
+        """Reload, re-validate and re-render whatever the changed paths affect."""
+        start: float = time.monotonic()
+        cases, packages = self.affected(paths)
+        if not cases and not packages:
+            return
+        rendered: Dict[CaseKey, Optional[Set[str]]] = {}
+        for case_key in sorted(cases):
+            if self._reload_case(*case_key):
+                # Every package page shows the test case, so re-render them all
+                rendered[case_key] = None
+        self._revalidate(packages)
+        for spec_id, test_case_id, package_name in packages:
+            if rendered.get((spec_id, test_case_id), set()) is not None:
+                rendered.setdefault((spec_id, test_case_id), set()).add(package_name)
+        for (spec_id, test_case_id), names in sorted(rendered.items(), key=lambda item: item[0]):
+            test_case: Optional[CorpusTestCase] = self._test_case(spec_id, test_case_id)
+            if test_case is not None:
+                self._output_case(self.by_spec[spec_id], test_case, names)
+        matrix: ConformanceMatrix = self._matrix()
+        for spec_id in sorted({ spec_id for spec_id, _ in cases } | { spec_id for spec_id, _, _ in packages }):
+            reporter.output_corpus(self.by_spec[spec_id], matrix)
+        reporter.output_home(self.corpora, matrix)
+        print(f"Updated {len(cases)} test cases and {len(packages)} packages in {time.monotonic() - start:.2f}s",
+              file=sys.stderr)
+
+    def _test_case(self, spec_id: str, test_case_id: str) -> Optional[CorpusTestCase]:
+        return next((test_case for test_case in self.by_spec[spec_id].test_cases
+                     if str(test_case.id) == test_case_id), None)
+
+    def _reload_case(self, spec_id: str, test_case_id: str) -> bool:
+        """Reload a test case from its directory, returning False if it is gone or can't be parsed."""
+        corpus: Corpus = self.by_spec[spec_id]
+        path: Path = corpus.path / test_case_id
+        old: Optional[CorpusTestCase] = self._test_case(spec_id, test_case_id)
+        if old is not None:
+            for package in old.packages:
+                self.results.pop((spec_id, test_case_id, package.name), None)
+        if not (path / 'testCase.xml').is_file():
+            if old is not None:
+                corpus.test_cases.remove(old)
+                shutil.rmtree(reporter.reports_root / spec_id / test_case_id, ignore_errors=True)
+                print(f"Removed test case {spec_id}/{test_case_id}", file=sys.stderr)
+            return False
+        try:
+            test_case: CorpusTestCase = CorpusTestCase.from_test_case(path)
+        except Exception as excep: # pylint: disable=broad-except
+            # Usually an editor's partial save, the next save triggers another reload
+            print(f"Could not reload test case {spec_id}/{test_case_id}: {excep}", file=sys.stderr)
+            if old is not None:
+                self._load_results(corpus, old)
+            return False
+        if old is not None:
+            corpus.test_cases[corpus.test_cases.index(old)] = test_case
+        else:
+            corpus.test_cases.append(test_case)
+        self._load_results(corpus, test_case)
+        return True
+
+    def _revalidate(self, packages: Set[PackageKey]) -> None:
+        """Re-run every runner for the changed packages, writing and keeping their results."""
+        planned: List[Tuple[Job, PackageKey]] = []
+        for spec_id, test_case_id, name in sorted(packages):
+            test_case: Optional[CorpusTestCase] = self._test_case(spec_id, test_case_id)
+            package: Optional[CorpusPackage] = next((package for package in test_case.packages
+                                                     if package.name == name), None) if test_case else None
+            if package is None:
+                continue
+            package_root: Path = self.by_spec[spec_id].path / test_case_id / package.path
+            package.has_directory = package_root.is_dir()
+            package.has_mets = (package_root / 'METS.xml').is_file()
+            self.results[(spec_id, test_case_id, name)] = []
+            if not package.has_directory:
+                continue
+            path: str = (Path(spec_id) / test_case_id / package.path).as_posix()
+            planned.extend((Job(spec_id=spec_id, test_case_id=test_case_id, package=name, path=path,
+                                runner_id=runner_id), (spec_id, test_case_id, name)) for runner_id in self.runners)
+        with ThreadPoolExecutor(max_workers=max(self.jobs, 1)) as executor:
+            futures = { executor.submit(run_job, self.runners[job.runner_id], job.package_path): (job, key)
+                        for job, key in planned }
+            try:
+                # Write each result as soon as its job finishes, rather than behind slower jobs
+                for future in as_completed(futures):
+                    job, key = futures.pop(future)
+                    result: ProcessResult = future.result()
+                    self.results[key].append(ingest(job, result))
+                    report(job, result.runner_details.name, result.retcode)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        for _, key in planned:
+            # Results arrive in completion order, list them in a stable order
+            self.results[key].sort(key=lambda result: result.details.id)
+
+    def _output_case(self, corpus: Corpus, test_case: CorpusTestCase, names: Optional[Set[str]]) -> None:
+        """Render a test case page and its package pages, all of them if names is None."""
+        spec_id: str = corpus.specification.id
+        try:
+            for package in test_case.packages:
+                package.test_results = self.results.get((spec_id, str(test_case.id), package.name), [])
+            packages: List[CorpusPackage] = [package for package in test_case.packages
+                                             if names is None or package.name in names]
+            reporter.output_case_results(test_case, corpus, MatrixBuilder(), RuleIndex(), packages)
+        finally:
+            for package in test_case.packages:
+                package.test_results = []
+
+    def _load_results(self, corpus: Corpus, test_case: CorpusTestCase) -> None:
+        for package in test_case.packages:
+            self.results[(corpus.specification.id, str(test_case.id), package.name)] = get_package_results(
+                package, test_case.id, corpus.specification.id, verbose=False)
+
+    def _matrix(self) -> ConformanceMatrix:
+        builder: MatrixBuilder = MatrixBuilder()
+        for spec_id, corpus in self.by_spec.items():
+            for test_case in corpus.test_cases:
+                for package in test_case.packages:
+                    builder.add(spec_id, test_case.id, package,
+                                self.results.get((spec_id, str(test_case.id), package.name), []))
+        return builder.build()
+
+def watch(corpora: Dict, runners: Dict[str, Runner], jobs: int = 1, polling: bool = False,
+          interval: float = 1.0) -> None:
+    """Watch the corpus until interrupted, updating the site after each change."""
+    session: WatchSession = WatchSession(corpora, runners, jobs)
+    watcher = open_watcher(corpus_root, polling, interval)
+    print(f"Watching {corpus_root} with {type(watcher).__name__}, Ctrl-C to stop", file=sys.stderr)
+    try:
+        for changed in watcher.changes():
+            session.update(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
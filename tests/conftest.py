@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting shared test fixtures
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from eark_corpora import loader
+from eark_corpora.cli import app as reporter
+from eark_corpora.tester import utils
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+# Accepts any test case, the tools only need a schema to validate the test case against
+TEST_CASE_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified">
+  <xs:element name="testCase"><xs:complexType><xs:sequence>
+    <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+  </xs:sequence><xs:anyAttribute processContents="skip"/></xs:complexType></xs:element>
+</xs:schema>
+'''
+# (specification, test case, package names, with a directory)
+CASES = [
+    ('CSIP', 'CSIP1', ['CSIP1-valid', 'CSIP1-invalid'], True),
+    ('CSIP', 'CSIP2', ['CSIP2-missing'], False),
+    ('SIP', 'SIP1', ['SIP1-valid'], True),
+    ('DIP', 'DIP1', ['DIP1-invalid'], True),
+]
+
+def _test_case_xml(spec_id: str, case_id: str, names, has_directory: bool) -> str:
+    packages: str = ''.join(
+        f'<package name="{name}" isValid="{"FALSE" if "invalid" in name else "TRUE"}" '
+        f'isImplemented="{"TRUE" if has_directory else "FALSE"}"><path>{name}</path><description>d</description></package>'
+        for name in names)
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n<testCase testable="TRUE">'
+            f'<id requirementId="{case_id}" specification="E-ARK-{spec_id}" version="2.1.0"/>'
+            f'<references><reference requirementId="{case_id}" URL="http://x">ref</reference></references>'
+            f'<requirementText>text</requirementText><description>{case_id}</description><dependencies/>'
+            f'<rules><rule id="1"><description>rule 1</description><error level="ERROR"><message>m</message></error>'
+            f'<corpusPackages>{packages}</corpusPackages></rule></rules></testCase>')
+
+def _runner(style: str) -> dict:
+    command = [sys.executable, '-m', 'eark_corpora.tester.stub']
+    return {
+        'details': { 'id': f"stub-{style}", 'name': f"Stub {style}", 'URL': 'http://x', 'kind': style, 'version': '' },
+        'commands': { 'version': command + ['--version'], 'pre': command + ['--style', style], 'post': [] },
+    }
+
+def _clear_caches() -> None:
+    loader.get_config.cache_clear()
+    loader.get_corpora.cache_clear()
+    utils.get_runners.cache_clear()
+    reporter.get_environment.cache_clear()
+
+@pytest.fixture(name='corpus')
+def fixture_corpus(tmp_path, monkeypatch) -> Path:
+    """A tiny corpus validated by the stub runners, in a working directory laid out as the tools expect."""
+    for spec_id, case_id, names, has_directory in CASES:
+        case_dir: Path = tmp_path / 'eark-ip-test-corpus' / 'corpus' / spec_id / case_id
+        case_dir.mkdir(parents=True)
+        (case_dir / 'testCase.xsd').write_text(TEST_CASE_XSD, encoding='utf-8')
+        (case_dir / 'testCase.xml').write_text(_test_case_xml(spec_id, case_id, names, has_directory), encoding='utf-8')
+        for name in names if has_directory else []:
+            (case_dir / name).mkdir()
+            (case_dir / name / 'METS.xml').write_text('<mets/>', encoding='utf-8')
+    (tmp_path / 'templates').symlink_to(REPO_ROOT / 'templates')
+    (tmp_path / 'runners.json').write_text(
+        json.dumps({ 'runners': [_runner('commons-ip'), _runner('eark-validator')] }), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('EARK_TESTING_CONFIG', 'runners.json')
+    monkeypatch.setenv('EARK_SPECIFICATION_CACHE', str(tmp_path / 'specifications'))
+    _clear_caches()
+    yield tmp_path
+    _clear_caches()
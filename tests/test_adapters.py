@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting result adapter tests
+"""
+import json
+import os
+from pathlib import Path
+
+from eark_corpora import loader
+from eark_corpora.model import adapters
+from eark_corpora.model.adapters import (ADAPTERS, CommonsIpAdapter, ResultAdapter, adapter_for, dump_summary,
+                                         load_summary, summarise)
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult, Level
+from eark_corpora.model.runners import ProcessResult, RunnerDetails
+
+EARK_VALIDATOR_REPORT = {
+    'structuralResults': { 'level': 'NotWellFormed', 'messages': [{ 'rule_id': 'CSIPSTR1', 'level': 'ERROR' }] },
+    'metadata': {
+        'schema_results': { 'level': 'Valid', 'messages': [] },
+        'schematron_results': { 'level': 'NotValid', 'messages': [
+            { 'rule_id': 'CSIP1', 'level': 'ERROR' },
+            { 'rule_id': 'CSIP2', 'level': 'Warn' },
+            { 'rule_id': 'CSIP3', 'level': 'INFO' },
+        ] },
+    },
+}
+
+COMMONS_IP_REPORT = {
+    'structuralResults': { 'level': 'WellFormed', 'messages': [] },
+    'metadata': {
+        'schemaResults': { 'status': 'Valid', 'messages': [] },
+        'schematronResults': { 'status': 'NotValid', 'messages': [
+            { 'ruleId': 'CSIP1', 'level': 'ERROR' },
+            { 'ruleId': 'CSIP4', 'level': 'WARN' },
+        ] },
+    },
+}
+
+def _details(kind: str = None) -> RunnerDetails:
+    return RunnerDetails(id='runner', name='Runner', version='1.0', URL='http://x', kind=kind)
+
+def _result(stdout, kind: str = None, retcode: int = 0, stderr: str = '', timed_out: bool = False) -> ProcessResult:
+    return ProcessResult(_details(kind), retcode, stdout, stderr, 2.5, timed_out=timed_out)
+
+def test_eark_validator_report():
+    summary = summarise(_result(json.dumps(EARK_VALIDATOR_REPORT)), 'CSIP1')
+    assert summary.struct_status == 'NotWellFormed'
+    assert summary.schema_status == 'Valid'
+    assert summary.schematron_status == 'NotValid'
+    assert summary.error_ids == { 'CSIPSTR1': Level.ERROR, 'CSIP1': Level.ERROR, 'CSIP2': Level.WARNING,
+                                  'CSIP3': Level.INFO }
+    assert summary.contains_code and not summary.is_valid
+    assert summary.duration == 2.5 and summary.requirement_id == 'CSIP1'
+
+def test_commons_ip_report():
+    summary = summarise(_result(COMMONS_IP_REPORT, kind='commons-ip'), 'CSIP4')
+    assert (summary.struct_status, summary.schema_status, summary.schematron_status) == ('WellFormed', 'Valid',
+                                                                                          'NotValid')
+    assert summary.error_ids == { 'CSIP1': Level.ERROR, 'CSIP4': Level.WARNING }
+    assert summary.contains_code
+
+def test_valid_report():
+    report = { 'structuralResults': { 'level': 'WellFormed', 'messages': [] },
+               'metadata': { 'schema_results': { 'level': 'Valid' }, 'schematron_results': { 'level': 'Valid' } } }
+    summary = summarise(_result(json.dumps(report)), 'CSIP1')
+    assert summary.is_valid and not summary.error_ids
+
+def test_structural_results_without_metadata():
+    report = { 'structuralResults': { 'level': 'NotWellFormed', 'messages': [{ 'rule_id': 'CSIPSTR4' }] } }
+    summary = summarise(_result(json.dumps(report)), 'CSIPSTR4')
+    assert summary.struct_status == 'NotWellFormed'
+    assert (summary.schema_status, summary.schematron_status) == ('Unknown', 'Unknown')
+    assert summary.error_ids == { 'CSIPSTR4': Level.ERROR }
+
+def test_failed_result():
+    summary = summarise(_result('Exception in thread "main"', retcode=1, stderr='stack trace'), 'CSIP1')
+    assert summary.ret_code == 1 and summary.error_msg == 'stack trace'
+    assert summary.struct_status == 'Unknown' and not summary.error_ids and not summary.is_valid
+
+def test_output_that_is_not_json():
+    summary = summarise(_result('Validating package'), 'CSIP1')
+    assert summary.error_msg == 'Validating package'
+    assert not summary.is_valid
+
+def test_timed_out_result():
+    summary = summarise(_result('{"structuralResults": {', retcode=-15, timed_out=True), 'CSIP1')
+    assert summary.timed_out and summary.ret_code == -15 and not summary.is_valid
+    assert summary.error_msg == '{"structuralResults": {'
+
+def test_unknown_kind_uses_the_default_adapter():
+    assert type(adapter_for('unknown')) is ResultAdapter
+    assert type(adapter_for('commons-ip')) is CommonsIpAdapter
+    summary = summarise(_result(json.dumps(EARK_VALIDATOR_REPORT), kind='unknown'), 'CSIP1')
+    assert summary.schematron_status == 'NotValid' and Level.WARNING in summary.error_ids.values()
+
+def test_registered_adapter_is_used():
+    @adapters.register('test-kind')
+    class _Adapter(ResultAdapter):
+        rule_key: str = 'id'
+    try:
+        report = { 'metadata': { 'schematron_results': { 'level': 'NotValid', 'messages': [{ 'id': 'SIP1' }] } } }
+        assert summarise(_result(json.dumps(report), kind='test-kind'), 'SIP1').error_ids == { 'SIP1': Level.ERROR }
+    finally:
+        del ADAPTERS['test-kind']
+
+def test_summary_round_trip():
+    summary = summarise(_result(json.dumps(EARK_VALIDATOR_REPORT)), 'CSIP1')
+    assert load_summary(dump_summary(summary).encode('utf-8')) == summary
+
+def test_other_summary_versions_are_ignored(monkeypatch):
+    summary = summarise(_result(json.dumps(EARK_VALIDATOR_REPORT)), 'CSIP1')
+    data = dump_summary(summary).encode('utf-8')
+    monkeypatch.setattr(adapters, 'SUMMARY_VERSION', adapters.SUMMARY_VERSION + 1)
+    assert load_summary(data) is None
+    # Summaries written before they were versioned, and torn ones
+    assert load_summary(summary.model_dump_json().encode('utf-8')) is None
+    assert load_summary(b'{"version": ') is None
+
+def test_loader_reads_current_summaries_and_reparses_others(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, 'results_root', tmp_path)
+    package = CorpusPackage(name='package', description='d', path=Path('package'), is_implemented=True,
+                            is_valid=False, has_directory=True, has_mets=True)
+    results_dir = tmp_path / 'CSIP' / 'CSIP1' / 'package'
+    results_dir.mkdir(parents=True)
+    (results_dir / 'runner1.0.json').write_text(_result(json.dumps(EARK_VALIDATOR_REPORT)).toJson(), encoding='utf-8')
+    # A summary that disagrees with the raw report, to tell which of the two was read
+    stale = CorpusTestResult(details=_details(), requirement_id='CSIP1', struct_status='Stale')
+    (results_dir / 'runner1.0.summary.json').write_text(dump_summary(stale), encoding='utf-8')
+    assert [result.struct_status for result in loader.get_package_results(package, 'CSIP1', 'CSIP', False)] == ['Stale']
+    monkeypatch.setattr(adapters, 'SUMMARY_VERSION', adapters.SUMMARY_VERSION + 1)
+    assert [result.struct_status for result in loader.get_package_results(package, 'CSIP1', 'CSIP', False)] == [
+        'NotWellFormed']
+    monkeypatch.undo()
+    monkeypatch.setattr(loader, 'results_root', tmp_path)
+    # A raw report rewritten after its summary
+    raw = results_dir / 'runner1.0.json'
+    stat = (results_dir / 'runner1.0.summary.json').stat()
+    os.utime(raw, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert [result.struct_status for result in loader.get_package_results(package, 'CSIP1', 'CSIP', False)] == [
+        'NotWellFormed']
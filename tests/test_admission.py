@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting admission control tests
+"""
+import threading
+import time
+
+from eark_corpora.model.runners import RunnerResources
+from eark_corpora.tester.admission import Admission
+
+def _admit_in_thread(admission: Admission, resources: RunnerResources, admitted: list, name: str,
+                     release: threading.Event) -> threading.Thread:
+    def _run():
+        with admission.admit(resources):
+            admitted.append(name)
+            release.wait(10)
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    return thread
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_fits_within_budgets():
+    admission = Admission(memory=100, cores=4)
+    # A job on its own always runs, even if it is larger than the budgets
+    assert admission._fits(500, 8)
+    admission.running, admission.used_memory, admission.used_cores = 1, 60, 2
+    assert admission._fits(40, 2)
+    assert not admission._fits(41, 2)
+    assert not admission._fits(40, 3)
+
+def test_jobs_are_admitted_in_order():
+    admission = Admission(memory=100, cores=8)
+    admitted: list = []
+    releases = { name: threading.Event() for name in 'abc' }
+    _admit_in_thread(admission, RunnerResources(memory=60), admitted, 'a', releases['a'])
+    assert _wait_for(lambda: admitted == ['a'])
+    _admit_in_thread(admission, RunnerResources(memory=60), admitted, 'b', releases['b'])
+    assert _wait_for(lambda: len(admission._waiting) == 1)
+    # c would fit alongside a, but waits behind b rather than overtaking it
+    _admit_in_thread(admission, RunnerResources(memory=10), admitted, 'c', releases['c'])
+    assert _wait_for(lambda: len(admission._waiting) == 2)
+    assert admitted == ['a']
+    releases['a'].set()
+    assert _wait_for(lambda: admitted == ['a', 'b', 'c'])
+    assert admission.used_memory == 70
+    releases['b'].set()
+    releases['c'].set()
+    assert _wait_for(lambda: admission.running == 0)
+    assert admission.used_memory == 0 and admission.used_cores == 0
+
+def test_oversized_job_runs_alone():
+    admission = Admission(memory=100, cores=2)
+    admitted: list = []
+    release = threading.Event()
+    _admit_in_thread(admission, RunnerResources(memory=400, threads=4), admitted, 'big', release)
+    assert _wait_for(lambda: admitted == ['big'])
+    _admit_in_thread(admission, RunnerResources(memory=1), admitted, 'small', release)
+    assert _wait_for(lambda: len(admission._waiting) == 1)
+    assert admitted == ['big']
+    release.set()
+    assert _wait_for(lambda: admitted == ['big', 'small'])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting page minification and compression tests
+"""
+import gzip
+
+import pytest
+
+from eark_corpora.cli import compress
+from eark_corpora.cli.compress import Compressor, formats, minify
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+def test_minify_keeps_preformatted_text():
+    html = ('<html>\n  <!-- comment -->\n  <body>\n\n    <p>text</p>\n'
+            '    <pre>  keep\n    this  </pre>\n  </body>\n</html>\n')
+    assert minify(html) == '<html>\n<body>\n<p>text</p>\n<pre>  keep\n    this  </pre>\n</body>\n</html>'
+
+def test_siblings_are_written(tmp_path):
+    page = _write(tmp_path / 'site' / 'index.html', b'<p>page</p>')
+    compressor = Compressor(tmp_path / 'store', workers=2)
+    compressor.submit(page, page.read_bytes())
+    compressor.close()
+    assert gzip.decompress((tmp_path / 'site' / 'index.html.gz').read_bytes()) == b'<p>page</p>'
+    assert compressor.compressed == len(formats()) and compressor.reused == 0
+
+def test_unchanged_content_is_reused(tmp_path):
+    first = _write(tmp_path / 'site' / 'a' / 'index.html', b'same')
+    second = _write(tmp_path / 'site' / 'b' / 'index.html', b'same')
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(first, b'same')
+    compressor.close()
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(first, b'same')
+    compressor.submit(second, b'same')
+    compressor.close()
+    assert compressor.compressed == 0 and compressor.reused == 2 * len(formats())
+    assert (tmp_path / 'site' / 'b' / 'index.html.gz').read_bytes() == (tmp_path / 'site' / 'a' / 'index.html.gz').read_bytes()
+
+def test_prune_removes_unused_content(tmp_path):
+    page = _write(tmp_path / 'site' / 'index.html', b'old')
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(page, b'old')
+    compressor.close()
+    old = set((tmp_path / 'store').glob('*/*'))
+    page.write_bytes(b'new')
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(page, b'new')
+    compressor.close(prune=True)
+    stored = set((tmp_path / 'store').glob('*/*'))
+    assert len(stored) == len(formats()) and not stored & old
+    assert gzip.decompress((tmp_path / 'site' / 'index.html.gz').read_bytes()) == b'new'
+    # Without pruning, the store keeps content from earlier runs
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(page, b'old')
+    compressor.close()
+    assert len(set((tmp_path / 'store').glob('*/*'))) == 2 * len(formats())
+
+def test_errors_are_raised_on_close(tmp_path, monkeypatch):
+    def _fail(data: bytes) -> bytes:
+        raise OSError('disk full')
+    monkeypatch.setattr(compress, 'formats', lambda: [('.gz', _fail)])
+    page = _write(tmp_path / 'site' / 'index.html', b'page')
+    compressor = Compressor(tmp_path / 'store')
+    compressor.submit(page, b'page')
+    with pytest.raises(OSError):
+        compressor.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting coordinator job queue tests
+"""
+import threading
+
+import pytest
+
+from eark_corpora.tester.coordinator import JobQueue, format_address, parse_address
+from eark_corpora.tester.jobs import Job
+
+def _jobs(count: int):
+    return [Job(spec_id='CSIP', test_case_id='CSIP1', package=f"package{index}", path=f"CSIP/CSIP1/package{index}",
+                runner_id='stub') for index in range(count)]
+
+def test_jobs_are_taken_in_order():
+    jobs = _jobs(2)
+    queue = JobQueue(jobs)
+    assert queue.take('a') == jobs[0]
+    assert queue.take('b') == jobs[1]
+
+def test_idle_worker_steals_a_running_job_once():
+    jobs = _jobs(1)
+    queue = JobQueue(jobs)
+    assert queue.take('a') == jobs[0]
+    assert queue.take('b') == jobs[0]
+    # The first result wins, the stolen copy's result is dropped
+    assert queue.claim(jobs[0].key)
+    queue.complete(jobs[0].key)
+    assert not queue.claim(jobs[0].key)
+    assert queue.finished
+    assert queue.take('c') is None
+
+def _take_in_thread(queue: JobQueue, worker: str):
+    taken = []
+    thread = threading.Thread(target=lambda: taken.append(queue.take(worker)), daemon=True)
+    thread.start()
+    thread.join(0.2)
+    return thread, taken
+
+def test_no_steal_waits_for_the_running_job():
+    jobs = _jobs(1)
+    queue = JobQueue(jobs, steal=False)
+    assert queue.take('a') == jobs[0]
+    thread, taken = _take_in_thread(queue, 'b')
+    assert thread.is_alive()
+    assert queue.claim(jobs[0].key)
+    queue.complete(jobs[0].key)
+    thread.join(5)
+    assert taken == [None]
+
+def test_a_job_being_written_is_not_stolen():
+    jobs = _jobs(1)
+    queue = JobQueue(jobs)
+    queue.take('a')
+    assert queue.claim(jobs[0].key)
+    thread, taken = _take_in_thread(queue, 'b')
+    assert thread.is_alive()
+    queue.complete(jobs[0].key)
+    thread.join(5)
+    assert taken == [None]
+
+def test_failed_write_requeues_the_job():
+    jobs = _jobs(2)
+    queue = JobQueue(jobs)
+    queue.take('a')
+    assert queue.claim(jobs[0].key)
+    queue.retry(jobs[0].key)
+    assert not queue.finished
+    assert queue.take('b') == jobs[0]
+    assert queue.claim(jobs[0].key)
+
+def test_disconnected_worker_jobs_are_requeued():
+    jobs = _jobs(2)
+    queue = JobQueue(jobs)
+    queue.connect()
+    queue.take('a')
+    queue.release('a')
+    assert queue.workers == 0
+    assert queue.take('b') == jobs[0]
+
+def test_stolen_job_stays_with_the_other_worker():
+    jobs = _jobs(1)
+    queue = JobQueue(jobs)
+    queue.take('a')
+    queue.take('b')
+    queue.release('a')
+    # Still held by b, so not re-queued for a new worker but open to stealing
+    assert queue.take('c') == jobs[0]
+
+@pytest.mark.parametrize('text, address', [
+    ('unix:/tmp/eark.sock', '/tmp/eark.sock'),
+    ('example.org:7321', ('example.org', 7321)),
+    (':7321', ('localhost', 7321)),
+])
+def test_addresses_round_trip(text: str, address):
+    assert parse_address(text) == address
+    assert parse_address(format_address(address)) == address
+
+def test_invalid_address():
+    with pytest.raises(ValueError):
+        parse_address('example.org')
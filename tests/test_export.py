@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting result export tests
+"""
+import csv
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusRule, CorpusTestCase, CorpusTestResult, Level
+from eark_corpora.model.export import ResultExport, load_columns
+from eark_corpora.model.runners import ResourceUsage, RunnerDetails
+
+def _result(runner: str, version: str, error_ids: dict, ret_code: int = 0) -> CorpusTestResult:
+    status = 'Valid' if not error_ids else 'NotValid'
+    return CorpusTestResult(details=RunnerDetails(id=runner, name=runner.title(), version=version, URL='http://x'),
+                            requirement_id='CSIP1', ret_code=ret_code, duration=1.25, struct_status='WellFormed',
+                            schema_status='Valid', schematron_status=status, error_ids=error_ids,
+                            resources=ResourceUsage(user_time=0.5, system_time=0.25, max_rss=2048))
+
+def _package(name: str, is_valid: bool, results: list) -> CorpusPackage:
+    return CorpusPackage(name=name, description='d', path=Path(name), is_implemented=True, is_valid=is_valid,
+                         has_directory=True, has_mets=True, test_results=results)
+
+def _test_case() -> CorpusTestCase:
+    valid = _package('CSIP1-r1-valid', True, [_result('eark', '1.0', {}), _result('commons', '2.0', {})])
+    invalid = _package('CSIP1-r1-invalid', False, [
+        _result('eark', '1.0', { 'CSIP1': Level.ERROR, 'CSIP9': Level.WARNING }),
+        _result('commons', '2.0', {}, ret_code=1),
+    ])
+    unlisted = _package('CSIP1-r2-valid', True, [_result('eark', '1.0', { 'CSIP2': Level.INFO })])
+    return CorpusTestCase(id='CSIP1', description='d', is_xml_valid=True, xml_validation_error=None,
+                          testable='TRUE', rules=[
+                              CorpusRule(id=1, description='d', level=Level.ERROR, packages=[valid, invalid]),
+                              CorpusRule(id=2, description='d', level=Level.WARNING, packages=[unlisted]),
+                          ])
+
+@pytest.mark.parametrize('export_format', ['csv', 'jsonl'])
+def test_columns_round_trip(tmp_path, export_format: str):
+    test_case = _test_case()
+    with ResultExport(tmp_path, export_format) as export:
+        # Only the listed packages are exported
+        export.add('CSIP', test_case, test_case.rules[0].packages)
+    columns, schema = load_columns(tmp_path)
+    assert schema['rows'] == 4
+    packages = schema['columns']['package']['categories']
+    assert [packages[code] for code in columns['package']] == ['CSIP1-r1-valid'] * 2 + ['CSIP1-r1-invalid'] * 2
+    runners = schema['columns']['runner']['categories']
+    assert [runners[code] for code in columns['runner']] == ['eark', 'commons', 'eark', 'commons']
+    assert columns['valid'].tolist() == [True, True, False, False]
+    assert columns['expected_valid'].tolist() == [True, True, False, False]
+    assert columns['contains_code'].tolist() == [False, False, True, False]
+    assert columns['ret_code'].tolist() == [0, 0, 0, 1]
+    assert columns['max_rss'].dtype == np.int64 and columns['max_rss'].tolist() == [2048] * 4
+    assert columns['duration'].tolist() == [1.25] * 4
+    # The reported rule IDs of row 2, from the ragged column
+    offsets = columns['reported_offsets']
+    assert offsets.tolist() == [0, 0, 0, 2, 2]
+    rule_ids = schema['columns']['reported_rule_ids']['categories']
+    levels = schema['columns']['reported_levels']['categories']
+    reported = { rule_ids[rule]: levels[level] for rule, level in
+                 zip(columns['reported_rule_ids'][offsets[2]:offsets[3]], columns['reported_levels'][offsets[2]:offsets[3]]) }
+    assert reported == { 'CSIP1': 'ERROR', 'CSIP9': 'WARN' }
+
+def test_csv_rows(tmp_path):
+    test_case = _test_case()
+    with ResultExport(tmp_path, 'csv') as export:
+        export.add('CSIP', test_case, test_case.packages)
+    with gzip.open(tmp_path / 'results.csv.gz', 'rt', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 5
+    assert rows[2]['package'] == 'CSIP1-r1-invalid' and rows[2]['reported'] == 'CSIP1:ERROR CSIP9:WARN'
+    assert rows[4]['rule'] == '2'
+
+def test_jsonl_rows(tmp_path):
+    test_case = _test_case()
+    with ResultExport(tmp_path, 'jsonl') as export:
+        export.add('CSIP', test_case, test_case.packages)
+    with gzip.open(tmp_path / 'results.jsonl.gz', 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 5
+    assert rows[4]['reported'] == { 'CSIP2': 'INFO' }
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ResultExport(tmp_path, 'parquet')
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting template fragment cache tests
+"""
+from jinja2 import DictLoader, Environment
+
+from eark_corpora.cli import fragments
+from eark_corpora.cli.fragments import FragmentCache
+
+def _environment(templates: dict) -> Environment:
+    return Environment(loader=DictLoader(templates), extensions=[FragmentCache])
+
+def test_tags_on_one_line_are_kept_apart():
+    environment = _environment({ 'page': '{% cache x %}A{{ x }}{% endcache %}|{% cache x %}B{{ x }}{% endcache %}' })
+    assert environment.get_template('page').render(x=1) == 'A1|B1'
+    assert environment.get_template('page').render(x=1) == 'A1|B1'
+    assert environment.get_template('page').render(x=2) == 'A2|B2'
+
+def test_templates_are_kept_apart():
+    environment = _environment({ 'one': '{% cache %}one{% endcache %}', 'two': '{% cache %}two{% endcache %}' })
+    assert environment.get_template('one').render() == 'one'
+    assert environment.get_template('two').render() == 'two'
+
+def test_body_is_rendered_once_per_arguments():
+    calls = []
+    def count(value):
+        calls.append(value)
+        return value
+    environment = _environment({ 'page': '{% for x in xs %}{% cache x %}[{{ count(x) }}]{% endcache %}{% endfor %}' })
+    assert environment.get_template('page').render(xs=[1, 2, 1, 2, 1], count=count) == '[1][2][1][2][1]'
+    assert calls == [1, 2]
+
+def test_nested_tags():
+    environment = _environment({ 'page': '{% cache x %}<{% cache %}in{% endcache %}{{ x }}>{% endcache %}' })
+    assert environment.get_template('page').render(x=1) == '<in1>'
+    assert environment.get_template('page').render(x=2) == '<in2>'
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(fragments, 'MAX_FRAGMENTS', 2)
+    environment = _environment({ 'page': '{% for x in xs %}{% cache x %}{{ x }}{% endcache %}{% endfor %}' })
+    assert environment.get_template('page').render(xs=range(5)) == '01234'
+    assert len(environment.extensions['eark_corpora.cli.fragments.FragmentCache'].fragments) == 2
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting rule index tests
+"""
+from pathlib import Path
+
+import pytest
+
+from eark_corpora.cli import app as reporter
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult, Level
+from eark_corpora.model.index import RuleHit, RuleIndex
+from eark_corpora.model.runners import RunnerDetails
+
+def _package(name: str) -> CorpusPackage:
+    return CorpusPackage(name=name, description='d', path=Path(name), is_implemented=True, is_valid=False,
+                         has_directory=True, has_mets=True)
+
+def _result(runner: str, error_ids: dict) -> CorpusTestResult:
+    return CorpusTestResult(details=RunnerDetails(id=runner, name=runner, version='1.0', URL='http://x'),
+                            requirement_id='CSIP1', ret_code=0, duration=1.0, struct_status='WellFormed',
+                            schema_status='Valid', schematron_status='NotValid', error_ids=error_ids)
+
+@pytest.fixture(name='index')
+def fixture_index() -> RuleIndex:
+    index = RuleIndex()
+    index.add('CSIP', 'CSIP1', _package('p1'), [
+        _result('a', { 'CSIP1': Level.ERROR, 'CSIP10': Level.WARNING }),
+        _result('b', { 'CSIP1': Level.INFO }),
+    ])
+    index.add('SIP', 'SIP1', _package('p2'), [_result('a', { 'SIP1': Level.ERROR, 'CSIP1': Level.ERROR })])
+    return index
+
+def test_lookup_by_id(index: RuleIndex):
+    assert index.lookup('CSIP1') == {
+        'CSIP1': {
+            Level.ERROR: [RuleHit('CSIP', 'CSIP1', 'p1', 'a', '1.0'), RuleHit('SIP', 'SIP1', 'p2', 'a', '1.0')],
+            Level.INFO: [RuleHit('CSIP', 'CSIP1', 'p1', 'b', '1.0')],
+        }
+    }
+    assert index.lookup('CSIP2') == {}
+
+def test_lookup_by_pattern(index: RuleIndex):
+    assert list(index.lookup('CSIP1*')) == ['CSIP1', 'CSIP10']
+    assert list(index.lookup('*')) == ['CSIP1', 'CSIP10', 'SIP1']
+    assert list(index.lookup('CSIP?')) == ['CSIP1']
+
+def test_lookup_by_level(index: RuleIndex):
+    assert index.lookup('CSIP1', Level.INFO) == { 'CSIP1': { Level.INFO: [RuleHit('CSIP', 'CSIP1', 'p1', 'b', '1.0')] } }
+    assert index.lookup('CSIP*', Level.WARNING) == {
+        'CSIP10': { Level.WARNING: [RuleHit('CSIP', 'CSIP1', 'p1', 'a', '1.0')] }
+    }
+    # Rules without hits at the level are left out
+    assert index.lookup('SIP1', Level.INFO) == {}
+
+def test_summary(index: RuleIndex):
+    assert index.summary()[0] == {
+        'id': 'CSIP1',
+        'levels': { 'ERROR': 2, 'INFO': 1 },
+        'packages': 2,
+        'runners': ['a v1.0', 'b v1.0'],
+    }
+
+def test_save_and_load(index: RuleIndex, tmp_path):
+    path: Path = tmp_path / 'rules' / 'index.json'
+    index.save(path)
+    loaded: RuleIndex = RuleIndex.load(path)
+    assert loaded.rules == index.rules
+    assert loaded.lookup('CSIP*', Level.WARNING) == index.lookup('CSIP*', Level.WARNING)
+    assert all(isinstance(hit, RuleHit) for levels in loaded.rules.values() for hits in levels.values() for hit in hits)
+
+def test_query_rules(index: RuleIndex, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(reporter, 'rules_index_path', tmp_path / 'index.json')
+    assert reporter._query_rules('CSIP1') == 1
+    assert 'No rule index found' in capsys.readouterr().out
+    index.save(tmp_path / 'index.json')
+    assert reporter._query_rules('CSIP1*', 'WARNING') == 0
+    assert capsys.readouterr().out == 'CSIP10\tWARNING\tCSIP/CSIP1/p1\ta v1.0\n'
+    assert reporter._query_rules('SIP1', 'INFO') == 1
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting run journal tests
+"""
+import pytest
+
+from eark_corpora.tester.jobs import Job
+from eark_corpora.tester.journal import Journal
+
+NAMES = { 'stub': 'stub1.0' }
+
+@pytest.fixture(name='jobs')
+def fixture_jobs(tmp_path, monkeypatch):
+    # Job result paths are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return [Job(spec_id='CSIP', test_case_id='CSIP1', package=f"package{index}", path=f"CSIP/CSIP1/package{index}",
+                runner_id='stub') for index in range(3)]
+
+def _commit(job: Job, name: str = 'stub1.0') -> None:
+    job.results_path.mkdir(parents=True, exist_ok=True)
+    (job.results_path / (name + '.json')).write_text('{}', encoding='utf-8')
+
+def _interrupted_run(path, jobs, finished):
+    with Journal(path) as journal:
+        journal.planned(jobs)
+        for job in jobs:
+            journal.started(job)
+        for job in finished:
+            _commit(job)
+            journal.finished(job, NAMES[job.runner_id], 0)
+
+def test_resume_skips_completed_jobs(tmp_path, jobs):
+    _interrupted_run(tmp_path / 'journal.jsonl', jobs, jobs[:2])
+    with Journal(tmp_path / 'journal.jsonl', resume=True) as journal:
+        assert journal.same_plan(jobs)
+        assert journal.remaining(jobs, NAMES) == jobs[2:]
+
+def test_resume_reruns_other_versions_and_missing_results(tmp_path, jobs):
+    _interrupted_run(tmp_path / 'journal.jsonl', jobs, jobs[:2])
+    (jobs[0].results_path / 'stub1.0.json').unlink()
+    with Journal(tmp_path / 'journal.jsonl', resume=True) as journal:
+        assert journal.remaining(jobs, NAMES) == [jobs[0], jobs[2]]
+        assert journal.remaining(jobs, { 'stub': 'stub2.0' }) == jobs
+
+def test_torn_final_line_is_ignored(tmp_path, jobs):
+    path = tmp_path / 'journal.jsonl'
+    _interrupted_run(path, jobs, jobs[:1])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "done", "key": "CSIP/CS')
+    with Journal(path, resume=True) as journal:
+        assert journal.remaining(jobs, NAMES) == jobs[1:]
+        journal.finished(jobs[1], 'stub1.0', 0)
+    _commit(jobs[1])
+    with Journal(path, resume=True) as journal:
+        assert journal.remaining(jobs, NAMES) == jobs[2:]
+
+def test_changed_plan_is_detected(tmp_path, jobs):
+    _interrupted_run(tmp_path / 'journal.jsonl', jobs, [])
+    with Journal(tmp_path / 'journal.jsonl', resume=True) as journal:
+        assert journal.same_plan(list(reversed(jobs)))
+        assert not journal.same_plan(jobs[:2])
+
+def test_journal_without_a_plan_digest_is_trusted(tmp_path, jobs):
+    (tmp_path / 'journal.jsonl').write_text('{"event": "plan", "jobs": 3}\n', encoding='utf-8')
+    with Journal(tmp_path / 'journal.jsonl', resume=True) as journal:
+        assert journal.same_plan(jobs[:1])
+
+def test_new_run_starts_a_new_journal(tmp_path, jobs):
+    _interrupted_run(tmp_path / 'journal.jsonl', jobs, jobs)
+    with Journal(tmp_path / 'journal.jsonl') as journal:
+        assert journal.remaining(jobs, NAMES) == jobs
+    with Journal(tmp_path / 'journal.jsonl', resume=True) as journal:
+        assert journal.remaining(jobs, NAMES) == jobs
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting conformance matrix tests
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult, Level
+from eark_corpora.model.matrix import ConformanceMatrix, MatrixBuilder, split_runner_label, version_key
+from eark_corpora.model.runners import ResourceUsage, RunnerDetails
+
+def _package(name: str, is_valid: bool) -> CorpusPackage:
+    return CorpusPackage(name=name, description='d', path=Path(name), is_implemented=True, is_valid=is_valid,
+                         has_directory=True, has_mets=True)
+
+def _result(runner: str, requirement_id: str, valid: bool, error_ids: dict = None, ret_code: int = 0,
+            timed_out: bool = False, duration: float = 1.0, version: str = '1.0') -> CorpusTestResult:
+    status = 'Valid' if valid else 'NotValid'
+    return CorpusTestResult(details=RunnerDetails(id=runner.lower(), name=runner, version=version, URL='http://x'),
+                            requirement_id=requirement_id, ret_code=ret_code, duration=duration,
+                            struct_status='WellFormed', schema_status='Valid', schematron_status=status,
+                            error_ids=error_ids or {}, timed_out=timed_out,
+                            resources=ResourceUsage(user_time=duration / 2, max_rss=int(duration * 1000)))
+
+@pytest.fixture(name='matrix')
+def fixture_matrix() -> ConformanceMatrix:
+    builder = MatrixBuilder()
+    builder.add('CSIP', 'CSIP1', _package('p1', True), [
+        _result('A', 'CSIP1', True, duration=1.0),
+        _result('B', 'CSIP1', True, duration=2.0),
+    ])
+    builder.add('CSIP', 'CSIP2', _package('p2', False), [
+        _result('A', 'CSIP2', False, { 'CSIP2': Level.ERROR }, duration=3.0),
+        # A false negative, reporting a warning for another rule
+        _result('B', 'CSIP2', True, { 'CSIP9': Level.WARNING }, duration=4.0),
+    ])
+    # B has no result for p3, A failed on it, a false positive
+    builder.add('CSIP', 'CSIP3', _package('p3', True), [_result('A', 'CSIP3', False, ret_code=1, duration=5.0)])
+    builder.add('SIP', 'SIP1', _package('p4', False), [
+        _result('A', 'SIP1', False, { 'SIP1': Level.INFO }, ret_code=-15, timed_out=True, duration=6.0),
+        _result('B', 'SIP1', False, { 'SIP1': Level.ERROR }, duration=7.0),
+    ])
+    # No runner has a result for p5
+    builder.add('SIP', 'SIP2', _package('p5', True), [])
+    return builder.build()
+
+def test_shape(matrix: ConformanceMatrix):
+    assert matrix.packages.tolist() == ['CSIP/CSIP1/p1', 'CSIP/CSIP2/p2', 'CSIP/CSIP3/p3', 'SIP/SIP1/p4', 'SIP/SIP2/p5']
+    assert matrix.runners.tolist() == ['A v1.0', 'B v1.0']
+    assert matrix.outcomes.shape == (5, 2, 5)
+    assert np.isnan(matrix.metrics[2, 1]).all() and np.isnan(matrix.metrics[4]).all()
+
+def test_counts(matrix: ConformanceMatrix):
+    counts = matrix.counts()
+    assert (counts.packages, counts.tested_packages) == (5, 4)
+    assert (counts.results, counts.valid, counts.agreed) == (7, 3, 5)
+    assert (counts.false_positives, counts.false_negatives) == (1, 1)
+    assert (counts.contains_code, counts.timed_out) == (3, 1)
+    assert counts.duration == pytest.approx(28.0)
+    assert counts.cpu_time == pytest.approx(14.0)
+    assert counts.max_rss == 7000
+    runner_a, runner_b = counts.runners['A v1.0'], counts.runners['B v1.0']
+    assert (runner_a.results, runner_a.valid, runner_a.agreed, runner_a.false_positives,
+            runner_a.false_negatives, runner_a.contains_code, runner_a.timed_out) == (4, 1, 3, 1, 0, 2, 1)
+    assert (runner_b.results, runner_b.valid, runner_b.agreed, runner_b.false_positives,
+            runner_b.false_negatives, runner_b.contains_code, runner_b.timed_out) == (3, 2, 2, 0, 1, 1, 0)
+    assert (runner_a.packages, runner_a.tested_packages, runner_b.tested_packages) == (5, 4, 3)
+    assert runner_a.duration == pytest.approx(15.0) and runner_b.max_rss == 7000
+
+def test_counts_by_specification(matrix: ConformanceMatrix):
+    csip = matrix.counts('CSIP')
+    assert (csip.packages, csip.tested_packages, csip.results, csip.agreed) == (3, 3, 5, 3)
+    sip = matrix.counts('SIP')
+    assert (sip.packages, sip.tested_packages, sip.results, sip.timed_out) == (2, 1, 2, 1)
+    assert matrix.counts('DIP').packages == 0 and not matrix.counts('DIP').runners
+
+def test_rule_hits(matrix: ConformanceMatrix):
+    # SIP1 was reported by both runners for one package
+    assert matrix.rule_hits() == { 'CSIP2': 1, 'CSIP9': 1, 'SIP1': 1 }
+    assert matrix.rule_hits('SIP') == { 'SIP1': 1 }
+
+def test_hit_matrix(matrix: ConformanceMatrix):
+    hits = matrix.hit_matrix()
+    rules = matrix.rule_ids.tolist()
+    assert hits.shape == (5, 3)
+    assert hits[1, rules.index('CSIP2')] == 1
+    assert hits[1, rules.index('CSIP9')] == 2
+    # The ERROR from B outranks the INFO from A
+    assert hits[3, rules.index('SIP1')] == 1
+    assert hits.sum() == 4
+
+def test_save_and_load(matrix: ConformanceMatrix, tmp_path):
+    matrix.save(tmp_path / 'matrix.npz')
+    loaded = ConformanceMatrix.load(tmp_path / 'matrix.npz')
+    for name, values in matrix.__dict__.items():
+        np.testing.assert_array_equal(getattr(loaded, name), values)
+    assert loaded.counts() == matrix.counts()
+    assert loaded.rule_hits() == matrix.rule_hits()
+
+def test_version_differences():
+    builder = MatrixBuilder()
+    # The newer version is seen first
+    builder.add('CSIP', 'CSIP1', _package('p1', True), [
+        _result('A', 'CSIP1', False, version='2.10.0'),
+        _result('A', 'CSIP1', True, version='2.9.0'),
+        _result('B', 'CSIP1', True),
+    ])
+    builder.add('CSIP', 'CSIP1', _package('p2', False), [
+        _result('A', 'CSIP1', False, version='2.9.0'),
+        _result('A', 'CSIP1', False, version='2.10.0'),
+    ])
+    builder.add('CSIP', 'CSIP1', _package('p3', False), [_result('A', 'CSIP1', True, version='2.9.0')])
+    differences = builder.build().version_differences()
+    assert len(differences) == 1
+    assert differences[0].name == 'A'
+    assert differences[0].versions == ['2.9.0', '2.10.0']
+    assert [counts.results for counts in differences[0].counts] == [3, 2]
+    assert differences[0].packages == [('CSIP/CSIP1/p1', True, [True, False])]
+
+def test_version_key():
+    versions = ['2.10.0', '1.1.3', '2.9.1', '2.10.0-rc1', '10.0', '2.9']
+    assert sorted(versions, key=version_key) == ['1.1.3', '2.9', '2.9.1', '2.10.0', '2.10.0-rc1', '10.0']
+
+def test_split_runner_label():
+    assert split_runner_label('Commons IP v2.10.0') == ('Commons IP', '2.10.0')
+    assert split_runner_label('Validator') == ('Validator', '')
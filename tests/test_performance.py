@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting validator performance tests
+"""
+from pathlib import Path
+
+import pytest
+
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult
+from eark_corpora.model.matrix import MatrixBuilder
+from eark_corpora.model.performance import runner_performance, version_comparisons
+from eark_corpora.model.runners import ResourceUsage, RunnerDetails
+
+def _package(name: str) -> CorpusPackage:
+    return CorpusPackage(name=name, description='d', path=Path(name), is_implemented=True, is_valid=True,
+                         has_directory=True, has_mets=True)
+
+def _result(version: str, duration: float) -> CorpusTestResult:
+    return CorpusTestResult(details=RunnerDetails(id='a', name='A', version=version, URL='http://x'),
+                            requirement_id='CSIP1', ret_code=0, duration=duration,
+                            struct_status='WellFormed', schema_status='Valid', schematron_status='Valid',
+                            resources=ResourceUsage(user_time=duration))
+
+def test_version_comparisons_use_the_oldest_version():
+    builder = MatrixBuilder()
+    # The newer version is seen first, so it has the first matrix column
+    builder.add('CSIP', 'CSIP1', _package('p1'), [_result('2.10.0', 4.0), _result('2.9.0', 2.0)])
+    builder.add('CSIP', 'CSIP1', _package('p2'), [_result('2.10.0', 9.0), _result('2.9.0', 3.0)])
+    builder.add('CSIP', 'CSIP1', _package('p3'), [_result('2.10.0', 1.0)])
+    matrix = builder.build()
+    assert matrix.runners.tolist() == ['A v2.10.0', 'A v2.9.0']
+    comparisons = version_comparisons(matrix, runner_performance(matrix))
+    assert len(comparisons) == 1
+    assert [version.version for version in comparisons[0].versions] == ['2.9.0', '2.10.0']
+    assert comparisons[0].ratios['2.9.0'] == pytest.approx(1.0)
+    # Median of 4 / 2 and 9 / 3, package p3 was only tested by the newer version
+    assert comparisons[0].ratios['2.10.0'] == pytest.approx(2.5)
+
+def test_runner_performance():
+    builder = MatrixBuilder()
+    builder.add('CSIP', 'CSIP1', _package('p1'), [_result('1.0', 1.0)])
+    builder.add('SIP', 'SIP1', _package('p2'), [_result('1.0', 3.0)])
+    builder.add('SIP', 'SIP1', _package('p3'), [])
+    performance = runner_performance(builder.build())
+    assert len(performance) == 1
+    runner = performance[0]
+    assert (runner.name, runner.version) == ('A', '1.0')
+    assert (runner.overall.count, runner.overall.total, runner.overall.max) == (2, 4.0, 3.0)
+    assert runner.specifications['SIP'].count == 1
+    assert sum(bin.count for bin in runner.histogram) == 2
+    assert runner.slowest == [('SIP/SIP1/p2', 3.0), ('CSIP/CSIP1/p1', 1.0)]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting single pass pipeline tests
+"""
+from pathlib import Path
+
+from eark_corpora.pipeline import run_pipeline
+from eark_corpora.selection import Selection
+
+PACKAGES = ['CSIP/CSIP1/CSIP1-valid', 'CSIP/CSIP1/CSIP1-invalid', 'SIP/SIP1/SIP1-valid', 'DIP/DIP1/DIP1-invalid']
+
+def test_every_page_is_rendered(corpus: Path):
+    run_pipeline(Selection(), jobs=2)
+    for package in PACKAGES:
+        assert len(list((corpus / 'results' / package).glob('*.json'))) == 4
+        assert (corpus / 'site' / package / 'index.html').is_file()
+    # CSIP2 has no package directories, so its page doesn't wait on any jobs
+    for page in ['CSIP/CSIP1', 'CSIP/CSIP2', 'SIP/SIP1', 'DIP/DIP1', 'CSIP', 'SIP', 'DIP', 'rules', 'performance', '.']:
+        assert (corpus / 'site' / page / 'index.html').is_file(), page
+
+def test_cases_without_jobs_are_rendered(corpus: Path):
+    # No runner is selected, so the selected packages have no jobs but their pages are still rendered
+    run_pipeline(Selection(specs=('CSIP',), runners=('unknown',)))
+    assert not list((corpus / 'results').rglob('*.json'))
+    assert (corpus / 'site' / 'CSIP' / 'CSIP1' / 'index.html').is_file()
+    assert (corpus / 'site' / 'CSIP' / 'CSIP1' / 'CSIP1-valid' / 'index.html').is_file()
+    assert not (corpus / 'site' / 'SIP').exists()
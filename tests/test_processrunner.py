@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting validator process and result persistence tests
+"""
+import json
+import signal
+import sys
+import time
+
+import pytest
+
+from eark_corpora.model.adapters import summarise
+from eark_corpora.model.runners import ProcessResult, RunnerDetails
+from eark_corpora.tester import processrunner
+
+DETAILS = RunnerDetails(id='stub', name='Stub Validator', version='1.0', URL='http://example.com')
+
+@pytest.mark.parametrize('stdout', [
+    '{"a": 1, "b": [',
+    'Validating foo\n{"a": "x"}',
+    'He said "stop" and {left} \\ then "}"',
+    '',
+])
+def test_partial_output_round_trips(tmp_path, stdout: str):
+    path = tmp_path / 'result.json'
+    path.write_text(ProcessResult(DETAILS, -15, stdout, 'killed', 1.5, timed_out=True).toJson(), encoding='utf-8')
+    loaded = ProcessResult.from_file(path)
+    assert loaded.stdout == stdout
+    assert loaded.timed_out
+    summary = summarise(loaded, 'CSIP1')
+    assert summary.timed_out and not summary.is_valid
+
+def test_report_is_embedded_as_an_object(tmp_path):
+    report = { 'structuralResults': { 'level': 'WellFormed', 'messages': [] } }
+    path = tmp_path / 'result.json'
+    path.write_text(ProcessResult(DETAILS, 0, json.dumps(report), '', 0.5).toJson(), encoding='utf-8')
+    assert json.loads(path.read_text(encoding='utf-8'))['stdout'] == report
+    assert ProcessResult.from_file(path).stdout == report
+
+def test_timeout_kills_the_process_group_and_keeps_partial_output():
+    # The helper inherits the validator's stdout, so the output is only complete once the whole group is killed
+    code = ("import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "sys.stdout.write('Validating\\n{\"a\": [')\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(60)\n")
+    start = time.monotonic()
+    result = processrunner.run_process(DETAILS, [sys.executable, '-c', code], timeout=1)
+    assert time.monotonic() - start < processrunner.KILL_GRACE
+    assert result.timed_out
+    assert result.retcode != 0
+    assert result.stdout == 'Validating\n{"a": ['
+
+@pytest.mark.skipif(processrunner.resource is None, reason='Needs resource limits')
+def test_memory_limit_is_set_before_the_validator_starts():
+    code = "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"
+    result = processrunner.run_process(DETAILS, [sys.executable, '-c', code], memory_limit=512)
+    assert result.retcode == 0, result.stderr
+    assert int(result.stdout) == 512 * 1024 * 1024
+
+@pytest.mark.skipif(processrunner.resource is None, reason='Needs resource limits')
+def test_memory_limit_stops_larger_allocations():
+    result = processrunner.run_process(DETAILS, [sys.executable, '-c', "bytearray(1024 * 1024 * 1024)"],
+                                       memory_limit=256)
+    assert result.retcode != 0
+    assert 'MemoryError' in result.stderr
+
+def test_import_leaves_the_interrupt_handler_alone():
+    assert signal.getsignal(signal.SIGINT) is not processrunner._interrupt
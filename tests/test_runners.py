@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting runner configuration tests
+"""
+import json
+import sys
+
+import pytest
+
+from eark_corpora import loader
+from eark_corpora.model.matrix import split_runner_label, version_key
+from eark_corpora.selection import Selection
+from eark_corpora.tester import utils
+
+STUB = [sys.executable, '-m', 'eark_corpora.tester.stub']
+
+def _runner(runner_id: str, versions=None) -> dict:
+    runner: dict = {
+        'details': { 'id': runner_id, 'name': f"Runner {runner_id}", 'URL': 'http://x', 'version': '' },
+        'commands': {
+            'version': STUB + ['--version', '--stub-version', '{version}' if versions else '1.0'],
+            'pre': STUB + ['--seed', '{version}'],
+            'post': [],
+        },
+    }
+    if versions is not None:
+        runner['versions'] = versions
+    return runner
+
+@pytest.fixture(name='configure')
+def fixture_configure(tmp_path, monkeypatch):
+    """Write a runner configuration and point the tools at it."""
+    monkeypatch.setenv('EARK_TESTING_CONFIG', str(tmp_path / 'runners.json'))
+    def configure(*runners):
+        (tmp_path / 'runners.json').write_text(json.dumps({ 'runners': list(runners) }), encoding='utf-8')
+        loader.get_config.cache_clear()
+        utils.get_runners.cache_clear()
+    yield configure
+    loader.get_config.cache_clear()
+    utils.get_runners.cache_clear()
+
+def test_runner_without_versions_is_unchanged():
+    runner: dict = _runner('plain')
+    assert list(utils._versions(runner)) == [runner]
+
+def test_version_strings_are_substituted():
+    runner: dict = _runner('stub', ['1.0', '2.0'])
+    variants = list(utils._versions(runner))
+    assert [variant['commands']['pre'][-1] for variant in variants] == ['1.0', '2.0']
+    assert [variant['commands']['version'][-1] for variant in variants] == ['1.0', '2.0']
+    assert all('versions' not in variant for variant in variants)
+    # The configuration itself is left as it was
+    assert runner['commands']['pre'][-1] == '{version}'
+
+def test_version_commands_replace_the_runner_commands():
+    runner: dict = _runner('stub', [{ 'commands': { 'pre': ['old-validator'] } }])
+    variant, = utils._versions(runner)
+    assert variant['commands']['pre'] == ['old-validator']
+    assert variant['commands']['version'] == runner['commands']['version']
+
+@pytest.mark.parametrize('versions', [[], '1.0', [1], [{ 'commands': ['validator'] }]])
+def test_invalid_versions_are_rejected(versions):
+    with pytest.raises(ValueError):
+        list(utils._versions(_runner('stub', versions)))
+
+def test_versions_are_keyed_by_id_and_version(configure):
+    configure(_runner('stub', ['1.0', '2.0']), _runner('plain'))
+    runners = utils.get_runners()
+    assert list(runners) == ['stub@1.0', 'stub@2.0', 'plain']
+    assert [runner.details.version for runner in runners.values()] == ['1.0', '2.0', '1.0']
+    assert runners['stub@2.0'].commands['pre'][-1] == '2.0'
+
+def test_versions_are_selected(configure):
+    configure(_runner('stub', ['1.0', '2.0']), _runner('plain'))
+    assert list(utils.get_runners(Selection(runners=('stub',)))) == ['stub@1.0', 'stub@2.0']
+    assert list(utils.get_runners(Selection(runners=('stub@2.0',)))) == ['stub@2.0']
+    assert list(utils.get_runners(Selection(runners=('stub@2.0', 'plain')))) == ['stub@2.0', 'plain']
+
+def test_repeated_version_is_rejected(configure):
+    configure(_runner('stub', ['1.0', '1.0']))
+    with pytest.raises(ValueError, match='configured more than once'):
+        utils.get_runners()
+
+def test_versions_are_ordered_numerically(configure):
+    configure(_runner('stub', ['2.10.0', '2.9.0', '10.0']))
+    versions = [split_runner_label(f"{runner.details.name} v{runner.details.version}")[1]
+                for runner in utils.get_runners().values()]
+    assert sorted(versions, key=version_key) == ['2.9.0', '2.10.0', '10.0']
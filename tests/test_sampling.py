@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting stratified sampling tests
+"""
+import random
+
+import pytest
+
+from eark_corpora.tester.sampling import Sampling, allocate
+
+POPULATIONS = {
+    ('CSIP', 'TRUE', True, 'ERROR'): 40,
+    ('CSIP', 'TRUE', False, 'ERROR'): 25,
+    ('CSIP', 'FALSE', True, 'WARNING'): 3,
+    ('SIP', 'TRUE', False, 'INFO'): 1,
+}
+
+def test_whole_population_fits():
+    assert allocate(POPULATIONS, 100, random.Random(0)) == POPULATIONS
+
+def test_fewer_places_than_strata():
+    allocation = allocate(POPULATIONS, 2, random.Random(0))
+    assert sorted(allocation.values()) == [0, 0, 1, 1]
+    assert allocate(POPULATIONS, 0, random.Random(0)) == { key: 0 for key in POPULATIONS }
+
+@pytest.mark.parametrize('size', [4, 5, 17, 50, 68])
+def test_every_stratum_gets_a_place_and_the_rest_are_proportional(size: int):
+    allocation = allocate(POPULATIONS, size, random.Random(0))
+    assert sum(allocation.values()) == size
+    assert all(1 <= allocation[key] <= POPULATIONS[key] for key in POPULATIONS)
+    # Larger strata never get fewer places than smaller ones
+    by_size = sorted(POPULATIONS, key=POPULATIONS.get)
+    assert [allocation[key] for key in by_size] == sorted(allocation[key] for key in by_size)
+
+def test_same_seed_same_allocation():
+    assert allocate(POPULATIONS, 2, random.Random(7)) == allocate(POPULATIONS, 2, random.Random(7))
+
+def test_sample_size():
+    assert Sampling(budget=100, estimate=10, workers=2).sample_size(2) == 10
+    assert Sampling(budget=100, estimate=10).sample_size(0) == 10
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting selection tests
+"""
+import argparse
+from pathlib import Path
+
+from eark_corpora import selection
+from eark_corpora.cli import app as reporter
+from eark_corpora.loader import get_corpora
+from eark_corpora.model.corpora import CorpusPackage, CorpusTestResult
+from eark_corpora.model.runners import RunnerDetails
+from eark_corpora.pipeline import run_pipeline
+from eark_corpora.selection import Selection
+from eark_corpora.tester.jobs import package_rows
+
+def _result(valid: bool) -> CorpusTestResult:
+    return CorpusTestResult(details=RunnerDetails(id='stub', name='Stub', version='1.0', URL='http://x'),
+                            requirement_id='CSIP1', ret_code=0, duration=1.0, struct_status='WellFormed',
+                            schema_status='Valid', schematron_status='Valid' if valid else 'NotValid')
+
+def test_everything():
+    assert Selection().everything
+    assert not Selection(disagree=True).everything
+    assert not Selection(specs=('CSIP',)).everything
+
+def test_spec():
+    assert Selection().spec('DIP')
+    assert Selection(specs=('CSIP', 'SIP')).spec('SIP')
+    assert not Selection(specs=('CSIP',)).spec('DIP')
+
+def test_test_case_globs():
+    selected = Selection(test_cases=('CSIP1*', 'SIP2'))
+    assert selected.test_case('CSIP1') and selected.test_case('CSIP12') and selected.test_case('SIP2')
+    assert not selected.test_case('CSIP2') and not selected.test_case('SIP21')
+
+def test_package_globs():
+    selected = Selection(packages=('*-invalid',))
+    assert selected.package('CSIP1-invalid')
+    assert not selected.package('CSIP1-valid')
+    assert Selection().package('anything')
+
+def test_runner_ids_and_versions():
+    assert Selection().runner('stub@1.0')
+    by_id = Selection(runners=('stub',))
+    assert by_id.runner('stub') and by_id.runner('stub@1.0') and by_id.runner('stub@2.0')
+    assert not by_id.runner('other') and not by_id.runner_versions('stub')
+    by_version = Selection(runners=('stub@2.0',))
+    assert by_version.runner('stub@2.0')
+    assert not by_version.runner('stub@1.0') and not by_version.runner('stub')
+    assert by_version.runner_versions('stub') and not by_version.runner_versions('other')
+
+def test_disagrees():
+    package = CorpusPackage(name='p', description='d', path=Path('p'), is_implemented=True, is_valid=True,
+                            has_directory=True, has_mets=True)
+    assert not selection.disagrees(package, [])
+    assert not selection.disagrees(package, [_result(True)])
+    assert selection.disagrees(package, [_result(True), _result(False)])
+
+def test_from_args():
+    parser = argparse.ArgumentParser()
+    selection.add_arguments(parser, runners=True)
+    args = parser.parse_args(['--spec', 'CSIP', '--spec', 'SIP', '--test-case', 'CSIP1*', '--package', '*-valid',
+                              '--runner', 'stub@2.0', '--disagree'])
+    assert Selection.from_args(args) == Selection(specs=('CSIP', 'SIP'), test_cases=('CSIP1*',),
+                                                  packages=('*-valid',), runners=('stub@2.0',), disagree=True)
+    assert Selection.from_args(parser.parse_args([])).everything
+
+def test_combined_selection(corpus: Path):
+    selected = Selection(specs=('CSIP', 'SIP'), test_cases=('CSIP*',), packages=('*-invalid',))
+    corpora = get_corpora(selected)
+    assert [corpus.specification.id for corpus in corpora.values()] == ['CSIP', 'SIP']
+    assert [str(test_case.id) for corpus in corpora.values() for test_case in corpus.test_cases] == ['CSIP1', 'CSIP2']
+    assert [(str(test_case.id), package.name) for _, test_case, _, package, _ in package_rows(corpora.values(), selected)
+            ] == [('CSIP1', 'CSIP1-invalid')]
+
+def test_unselected_packages_are_not_read(corpus: Path, monkeypatch):
+    run_pipeline(Selection())
+    read = []
+    def get_package_results(package, test_case_id, corpus_id, verbose=True):
+        read.append(package.name)
+        return []
+    monkeypatch.setattr(reporter, 'get_package_results', get_package_results)
+    selected = Selection(packages=('SIP1-*',))
+    reporter._output_selected(get_corpora(selected), selected)
+    # Only the test case with a selected package is rendered, and its case page lists every package
+    assert read == ['SIP1-valid']
+    assert (corpus / 'site' / 'SIP' / 'SIP1' / 'SIP1-valid' / 'index.html').is_file()
+
+def test_disagree_reads_only_the_named_packages(corpus: Path, monkeypatch):
+    read = []
+    def get_package_results(package, test_case_id, corpus_id, verbose=True):
+        read.append(package.name)
+        return [_result(not package.is_valid)] if package.name == 'CSIP1-invalid' else []
+    monkeypatch.setattr(reporter, 'get_package_results', get_package_results)
+    selected = Selection(packages=('*-invalid',), disagree=True)
+    reporter._output_selected(get_corpora(selected), selected)
+    # DIP1-invalid agrees so its case isn't rendered, the CSIP1 case page reads the package that wasn't selected
+    assert sorted(read) == ['CSIP1-invalid', 'CSIP1-valid', 'DIP1-invalid']
+    assert (corpus / 'site' / 'CSIP' / 'CSIP1' / 'CSIP1-invalid' / 'index.html').is_file()
+    assert not (corpus / 'site' / 'CSIP' / 'CSIP1' / 'CSIP1-valid').exists()
+    assert not (corpus / 'site' / 'DIP').exists()
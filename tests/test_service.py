@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting validation service request tests
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from eark_corpora import service
+
+@pytest.fixture(name='base_url')
+def fixture_base_url():
+    server = service._Server(('127.0.0.1', 0), service._RequestHandler)
+    server.service = service.ValidationService({}, cache=service.ResultCache(None))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+def _post(base_url: str, body) -> tuple:
+    request = urllib.request.Request(f"{base_url}/validate", data=json.dumps(body).encode('utf-8'),
+                                     headers={ 'Content-Type': 'application/json' })
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as excep:
+        return excep.code, json.load(excep)
+
+@pytest.mark.parametrize('body', [
+    { 'runner': 5, 'path': '.' },
+    { 'runner': ['stub', 5], 'path': '.' },
+    { 'path': 5 },
+    { 'path': None },
+    { 'spec': 1, 'test_case': 'CSIP1' },
+    { 'spec': 'CSIP', 'test_case': ['CSIP1'] },
+    { 'path': '' },
+    { 'path': '  ' },
+])
+def test_bad_requests_are_rejected(base_url: str, body):
+    status, reply = _post(base_url, body)
+    assert status == 400
+    assert reply['error']
+
+def test_unknown_runner_is_rejected(base_url: str, tmp_path):
+    status, reply = _post(base_url, { 'runner': 'missing', 'path': str(tmp_path) })
+    assert status == 400
+    assert 'missing' in reply['error']
+
+def test_package_is_validated(base_url: str, tmp_path):
+    (tmp_path / 'METS.xml').write_text('<mets/>', encoding='utf-8')
+    status, reply = _post(base_url, { 'path': str(tmp_path) })
+    assert status == 200
+    assert reply[0]['digest'] == service.package_digest(tmp_path)
+
+@pytest.mark.parametrize('error, expected', [(PermissionError('denied'), 403), (OSError('broken'), 500)])
+def test_unreadable_package_is_reported(base_url: str, tmp_path, monkeypatch, error, expected):
+    def _fail(path):
+        raise error
+    monkeypatch.setattr(service, 'package_digest', _fail)
+    status, reply = _post(base_url, { 'path': str(tmp_path) })
+    assert status == expected
+    assert reply['error']
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting specification cache tests
+"""
+from pathlib import Path
+
+import pytest
+from eark_validator.specifications.specification import EarkSpecification, SpecificationType, SpecificationVersion
+
+from eark_corpora import loader
+from eark_corpora.model import specifications
+from eark_corpora.model.specifications import CachedSpecification, load_specification, requirement_ids
+
+@pytest.fixture(name='parsed')
+def fixture_parsed(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory, counting the specifications parsed."""
+    monkeypatch.setenv('EARK_SPECIFICATION_CACHE', str(tmp_path / 'cache'))
+    loader.get_config.cache_clear()
+    load_specification.cache_clear()
+    parsed = []
+    def parse(spec_type, version):
+        parsed.append(spec_type)
+        return EarkSpecification(spec_type, version)
+    monkeypatch.setattr(specifications, 'EarkSpecification', parse)
+    yield parsed
+    loader.get_config.cache_clear()
+    load_specification.cache_clear()
+
+def _load():
+    return load_specification(SpecificationType.CSIP, SpecificationVersion.V2_1_0)
+
+def _cache_files(tmp_path: Path):
+    return list((tmp_path / 'cache').glob('CSIP-*.json'))
+
+def test_cached_specification_round_trips(parsed, tmp_path):
+    specification = _load()
+    cache_file, = _cache_files(tmp_path)
+    load_specification.cache_clear()
+    assert _load() == specification
+    assert parsed == [SpecificationType.CSIP]
+    cached = CachedSpecification.model_validate_json(cache_file.read_bytes())
+    assert cached.specification == specification
+    assert frozenset(cached.requirement_ids) == requirement_ids(specification)
+
+def test_corrupt_cache_is_parsed_again(parsed, tmp_path):
+    specification = _load()
+    cache_file, = _cache_files(tmp_path)
+    cache_file.write_text('{"validator_version": "1', encoding='utf-8')
+    load_specification.cache_clear()
+    assert _load() == specification
+    assert len(parsed) == 2
+    # The parsed specification replaced the corrupt cache file
+    assert CachedSpecification.model_validate_json(cache_file.read_bytes()).specification == specification
+
+def test_cache_with_another_digest_is_parsed_again(parsed, tmp_path):
+    specification = _load()
+    cache_file, = _cache_files(tmp_path)
+    cached = CachedSpecification.model_validate_json(cache_file.read_bytes())
+    cache_file.write_text(cached.model_copy(update={ 'digest': '0' * 64 }).model_dump_json(), encoding='utf-8')
+    load_specification.cache_clear()
+    assert _load() == specification
+    assert len(parsed) == 2
+    assert CachedSpecification.model_validate_json(cache_file.read_bytes()).digest == cached.digest
+
+def test_unwritable_cache_is_skipped(parsed, tmp_path):
+    # A file where the cache directory should be can't be written to, even by root
+    (tmp_path / 'cache').write_text('', encoding='utf-8')
+    specification = _load()
+    assert specification.id == 'CSIP'
+    assert (tmp_path / 'cache').is_file()
+    load_specification.cache_clear()
+    assert _load() == specification
+    assert len(parsed) == 2
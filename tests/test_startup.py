@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting start up time tests
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ENTRY_POINTS = [ 'eark_corpora.cli.app', 'eark_corpora.tester.app', 'eark_corpora.pipeline', 'eark_corpora.service' ]
+HEAVY_MODULES = [ 'jinja2', 'eark_validator', 'pydantic', 'pydantic_settings', 'lxml', 'xsdata', 'numpy' ]
+# Cumulative import time budget for an entry point module in microseconds, e.g. 100000. Wall clock
+# timings are noisy on shared machines, so the budget is only checked when it is set
+IMPORT_BUDGET_US = int(os.environ.get('EARK_IMPORT_BUDGET_US', '0'))
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=False)
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_import_avoids_heavy_modules(module: str):
+    result = _run(f"import sys, {module}; print(','.join(sorted(sys.modules)))")
+    assert result.returncode == 0, result.stderr
+    loaded = set(result.stdout.strip().split(','))
+    assert not [heavy for heavy in HEAVY_MODULES if heavy in loaded]
+
+@pytest.mark.skipif(not IMPORT_BUDGET_US, reason='Set EARK_IMPORT_BUDGET_US to check import times')
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_import_time_budget(module: str):
+    result = _run(f"import {module}")
+    assert result.returncode == 0, result.stderr
+    cumulative = [int(line.split('|')[1]) for line in result.stderr.splitlines()
+                  if line.startswith('import time:') and line.split('|')[2].strip() == module]
+    assert cumulative and cumulative[0] < IMPORT_BUDGET_US
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_version_avoids_heavy_modules(module: str):
+    code = (f"import sys; sys.argv = ['app', '--version']; import {module} as app\n"
+            "try:\n    app.main()\nexcept SystemExit:\n    pass\n"
+            "print(','.join(sorted(sys.modules)))")
+    result = _run(code)
+    loaded = set(result.stdout.strip().splitlines()[-1].split(','))
+    assert not [heavy for heavy in HEAVY_MODULES if heavy in loaded]
+
+def test_level_choices_match_the_model():
+    from eark_corpora.cli.app import LEVELS
+    from eark_corpora.model.corpora import Level
+    assert LEVELS == [level.name for level in Level]
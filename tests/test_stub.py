@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting stub validator tests
+"""
+import json
+
+import pytest
+
+from eark_corpora.model.corpora import CorpusTestResult, Level
+from eark_corpora.model.runners import ProcessResult, RunnerDetails
+from eark_corpora.tester import stub
+
+@pytest.mark.parametrize('style', stub.STYLES)
+def test_report_levels_map_to_the_model(style: str):
+    args = stub.parse_command_line(['--style', style, '--messages', '10', '--invalid-rate', '0.5'])
+    details = RunnerDetails(id=f"stub-{style}", name='Stub', version='0.0.1', URL='http://x', kind=style)
+    levels = set()
+    for index in range(20):
+        package = f"CSIP/CSIP1/package{index}"
+        report = stub.report(package, args, stub.package_random(package, 0))
+        result = CorpusTestResult.from_process_result(ProcessResult(details, 0, json.dumps(report), '', 0.1), 'CSIP1')
+        levels.update(result.error_ids.values())
+    assert levels == { Level.ERROR, Level.WARNING, Level.INFO }
+
+def test_reports_are_repeatable():
+    args = stub.parse_command_line(['--messages', '10'])
+    assert (stub.report('CSIP/CSIP1/package', args, stub.package_random('CSIP/CSIP1/package', 3)) ==
+            stub.report('CSIP/CSIP1/package', args, stub.package_random('CSIP/CSIP1/package', 3)))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# E-ARK Corpus Reporting
+# Copyright (C) 2025
+# All rights reserved.
+#
+# Licensed to the E-ARK project under one
+# or more contributor license agreements. See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership. The E-ARK project licenses
+# this file to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License. You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+"""
+E-ARK : Corpus Reporting corpus watch tests
+"""
+from pathlib import Path
+
+import pytest
+
+from eark_corpora.loader import corpus_root, get_corpora
+from eark_corpora.pipeline import run_pipeline
+from eark_corpora.selection import Selection
+from eark_corpora.tester.utils import get_runners
+from eark_corpora.watch import PollingWatcher, WatchSession
+
+@pytest.fixture(name='session')
+def fixture_session(corpus: Path) -> WatchSession:
+    run_pipeline(Selection())
+    return WatchSession(get_corpora(), get_runners())
+
+def _page(corpus: Path, page: str) -> Path:
+    return corpus / 'site' / page / 'index.html'
+
+def test_affected(session: WatchSession, corpus: Path):
+    root: Path = corpus / 'eark-ip-test-corpus' / 'corpus'
+    assert session.affected({ root / 'CSIP' / 'CSIP1' / 'CSIP1-valid' / 'METS.xml' }) == (
+        set(), { ('CSIP', 'CSIP1', 'CSIP1-valid') })
+    assert session.affected({ root / 'SIP' / 'SIP1' / 'testCase.xml' }) == ({ ('SIP', 'SIP1') }, set())
+    assert session.affected({ corpus / 'results' / 'CSIP' / 'CSIP1' / 'CSIP1-valid' / 'stub.json' }) == (set(), set())
+
+def test_changed_package_is_rendered_again(session: WatchSession, corpus: Path):
+    for page in ['CSIP/CSIP1', 'CSIP/CSIP1/CSIP1-valid', 'CSIP/CSIP1/CSIP1-invalid', 'CSIP', 'SIP', '.']:
+        _page(corpus, page).unlink()
+    results: Path = corpus / 'results' / 'CSIP' / 'CSIP1' / 'CSIP1-valid'
+    previous = { path: path.stat().st_mtime_ns for path in results.glob('*.json') }
+    watcher: PollingWatcher = PollingWatcher(corpus_root, interval=0.05)
+    mets: Path = corpus_root / 'CSIP' / 'CSIP1' / 'CSIP1-valid' / 'METS.xml'
+    mets.write_text('<mets>changed</mets>', encoding='utf-8')
+    changed = next(watcher.changes())
+    assert mets.resolve() in { path.resolve() for path in changed }
+    session.update(changed)
+    # The package is validated again and only the pages that show it are rendered
+    assert all(path.stat().st_mtime_ns > mtime for path, mtime in previous.items())
+    for page in ['CSIP/CSIP1', 'CSIP/CSIP1/CSIP1-valid', 'CSIP', '.']:
+        assert _page(corpus, page).is_file(), page
+    assert not _page(corpus, 'CSIP/CSIP1/CSIP1-invalid').exists()
+    assert not _page(corpus, 'SIP').exists()
+
+def test_removed_test_case_is_removed_from_the_site(session: WatchSession, corpus: Path):
+    (corpus_root / 'SIP' / 'SIP1' / 'testCase.xml').unlink()
+    session.update({ corpus_root / 'SIP' / 'SIP1' / 'testCase.xml' })
+    assert not (corpus / 'site' / 'SIP' / 'SIP1').exists()
+    assert _page(corpus, 'SIP').is_file()